@@ -11,6 +11,12 @@ from .constants import (  # NOQA F401
     RProjType,
 )
 
+from .extensions import (  # NOQA F401
+    compile_selection,
+    release_com,
+    selection_text,
+)
+
 from .nodes import (  # NOQA F401
     distance,
 )
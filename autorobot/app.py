@@ -1,5 +1,12 @@
+import asyncio
+import ctypes
+import logging
+import os
 import sys
+import tempfile
 import time
+import warnings
+from concurrent.futures import Future
 
 from .bars import ExtendedBarServer
 from .cases import ExtendedCaseServer
@@ -8,14 +15,19 @@ from .nodes import ExtendedNodeServer
 from .sections import ExtendedSectionServer
 from .supports import ExtendedSupportServer
 from .releases import ExtendedReleaseServer
+from .results import ExtendedResultServer
+from .executor import ComExecutor
+from .extensions import release_com
 
 from .constants import (
     RLicense,
     RLicenseStatus,
+    ROType,
     RQuitOpt,
 )
 
 from .synonyms import synonyms
+from .decorators import on_com_thread, recycling
 
 from .errors import (
     AutoRobotLicenseError,
@@ -26,10 +38,17 @@ from .robotom import RobotOM  # NOQA F401
 from RobotOM import (
     RobotApplication,
 )
+from System.Diagnostics import Process
 
 # Get a reference to the module instance
 _this = sys.modules[__name__]
 
+logger = logging.getLogger(__name__)
+
+# The COM errors of a call rejected by a busy server
+# (RPC_E_CALL_REJECTED and RPC_E_SERVERCALL_RETRYLATER)
+_BUSY_HRESULTS = {0x80010001, 0x8001010A}
+
 #: A reference to the current ``RobotApplication`` instance
 app = None
 
@@ -44,10 +63,49 @@ class ExtendedRobotApp:
        Whether the new ``RobotApplication`` is visible (default: ``True``)
     :param bool interactive:
        Whether the new ``RobotApplication`` is interactive (default: ``True``)
+    :param bool threaded:
+       Whether the ``RobotApplication`` is owned by a dedicated STA thread
+       (see :py:class:`.ComExecutor`) instead of the calling thread
+       (default: ``False``)
+
+    .. note:: When threaded, the application must only be used through
+      :py:meth:`call`, :py:meth:`submit`, :py:meth:`run_async` and the
+      ``*_async`` methods of the servers, e.g.
+      ``await rb.nodes.table_async('all')``. The servers and COM objects
+      returned to another thread are proxies running each operation on the
+      application thread (see :py:meth:`wrap`).
+    """
+    timeout = 10.
     """
-    def __init__(self, visible=True, interactive=True):
+    The maximum time in seconds to wait for Robot to accept a new or
+    opened project, or to exit and unlock the project file when quitting.
+    """
+
+    def __init__(self, visible=True, interactive=True, threaded=False):
         """Constructor method."""
-        self.app = RobotApplication()
+        #: A dictionary of data cached for the current project
+        self.cache = {}
+        #: A list of dictionaries recording the calculations
+        self.calc_history = []
+        #: The number of operations since the ``RobotApplication`` started
+        self.operations = 0
+        #: A :py:class:`.RecyclePolicy` restarting the application (optional)
+        self.recycle_policy = None
+        self._start(visible, interactive, threaded)
+
+    def _start(self, visible, interactive, threaded):
+        """Starts a ``RobotApplication``."""
+        #: The executor owning the ``RobotApplication`` (``None`` if the
+        #: application isn't threaded)
+        self.executor = ComExecutor() if threaded else None
+        running = _robot_processes()
+        self.app = self.call(RobotApplication)
+        #: The id of the Robot process (``None`` if unknown)
+        self.process_id = self.call(_window_process, self.app)
+        if self.process_id is None:
+            # Only reliable if no other Robot started meanwhile
+            started = _robot_processes() - running
+            self.process_id = started.pop() if len(started) == 1 else None
         if not self.has_license:
             self.quit(save=False)
             raise AutoRobotLicenseError()
@@ -57,6 +115,7 @@ class ExtendedRobotApp:
             self.hide()
 
     @property
+    @on_com_thread
     def bars(self):
         """
         Gets the current project's bar server as an instance of
@@ -65,6 +124,7 @@ class ExtendedRobotApp:
         return ExtendedBarServer(self.app.Project.Structure.Bars, self)
 
     @property
+    @on_com_thread
     def cases(self):
         """
         Gets the current project's case server as an instance of
@@ -73,6 +133,7 @@ class ExtendedRobotApp:
         return ExtendedCaseServer(self.app.Project.Structure.Cases, self)
 
     @property
+    @on_com_thread
     def materials(self):
         """
         Gets the material label server as an instance of
@@ -81,6 +142,7 @@ class ExtendedRobotApp:
         return ExtendedMaterialServer(self.app.Project.Structure.Labels, self)
 
     @property
+    @on_com_thread
     def sections(self):
         """
         Gets the section label server as an instance of
@@ -89,6 +151,7 @@ class ExtendedRobotApp:
         return ExtendedSectionServer(self.app.Project.Structure.Labels, self)
 
     @property
+    @on_com_thread
     def supports(self):
         """
         Gets the supports label server as an instance of
@@ -97,6 +160,7 @@ class ExtendedRobotApp:
         return ExtendedSupportServer(self.app.Project.Structure.Labels, self)
 
     @property
+    @on_com_thread
     def releases(self):
         """
         Gets the releases label server as an instance of
@@ -105,6 +169,7 @@ class ExtendedRobotApp:
         return ExtendedReleaseServer(self.app.Project.Structure.Labels, self)
 
     @property
+    @on_com_thread
     def nodes(self):
         """
         Gets the current project's node server as an instance of
@@ -113,6 +178,16 @@ class ExtendedRobotApp:
         return ExtendedNodeServer(self.app.Project.Structure.Nodes, self)
 
     @property
+    @on_com_thread
+    def results(self):
+        """
+        Gets the current project's result server as an instance of
+        :py:class:`.ExtendedResultServer`.
+        """
+        return ExtendedResultServer(self.app.Project.Structure.Results, self)
+
+    @property
+    @on_com_thread
     def selections(self):
         """
         Gets the project's selection factory as an instance of
@@ -121,6 +196,7 @@ class ExtendedRobotApp:
         return self.app.Project.Structure.Selections
 
     @property
+    @on_com_thread
     def structure(self):
         """
         Gets the current structure as an instance of ``IRobotStructure``.
@@ -128,6 +204,7 @@ class ExtendedRobotApp:
         return self.app.Project.Structure
 
     @property
+    @on_com_thread
     def has_license(self):
         """
         Returns *True* if the license was activated, *False* otherwise.
@@ -135,10 +212,205 @@ class ExtendedRobotApp:
         return any((self.LicenseCheckEntitlement(lic) == RLicenseStatus.OK
                     for lic in RLicense))
 
+    @property
+    def memory(self):
+        """
+        Returns the working set of the Robot process in bytes (``None`` if
+        the process is unknown).
+        """
+        if self.process_id is None:
+            return None
+        try:
+            return Process.GetProcessById(self.process_id).WorkingSet64
+        except Exception:
+            return None
+
+    @recycling(reopen=True)
+    def calculate(self, wait=False):
+        """Calculates the project.
+
+        The model size (numbers of nodes, bars and cases) is read and the
+        project is calculated on the thread owning the application (see
+        :py:meth:`submit`). The statistics of the calculation are logged and
+        appended to :py:attr:`calc_history`.
+
+        :param bool wait:
+           Whether the caller waits for the calculation anyway (default:
+           ``False``). If not and the application isn't threaded, a
+           ``RuntimeWarning`` is issued as the call blocks.
+        :return:
+           A ``concurrent.futures.Future`` whose result is a dictionary
+           with the keys ``nodes``, ``bars``, ``cases``, ``status`` (the
+           value returned by Robot), ``elapsed`` (in seconds) and ``time``
+           (the epoch time at which the calculation ended)
+
+        .. warning:: If the application isn't threaded, the calculation
+          runs on the calling thread: the call blocks until the solve ends
+          and the returned future is already done. Only a threaded
+          application (``initialize(threaded=True)``) calculates in the
+          background.
+
+        .. tip:: If the application is threaded, the caller isn't blocked
+          and the future can be awaited with ``asyncio.wrap_future`` or
+          polled while the solve runs: ::
+
+                calc = rb.calculate()
+                while not calc.done():
+                    time.sleep(1.)
+                print(calc.result()['elapsed'])
+
+        .. note:: The model must not be modified before the future is done.
+        """
+        if self.executor is None and not wait:
+            warnings.warn(
+                "The application isn't threaded: calculate() blocks until "
+                "the solve ends. Initialize with threaded=True to calculate "
+                "in the background, or pass wait=True.",
+                RuntimeWarning, stacklevel=3)
+        return self.submit(self._calculate)
+
+    def _model_size(self):
+        """Returns the numbers of nodes, bars and cases in a dictionary."""
+        return {
+            'nodes': self.selections.CreateFull(ROType.NODE).Count,
+            'bars': self.selections.CreateFull(ROType.BAR).Count,
+            'cases': self.selections.CreateFull(ROType.CASE).Count,
+        }
+
+    def _calculate(self):
+        """Runs a calculation and records its statistics."""
+        stats = self._model_size()
+        start = time.perf_counter()
+        stats['status'] = self.app.Project.CalcEngine.Calculate()
+        stats['elapsed'] = time.perf_counter() - start
+        stats['time'] = time.time()
+        self.calc_history.append(stats)
+        logger.info(
+            "Calculated %(nodes)d nodes, %(bars)d bars and %(cases)d cases "
+            "in %(elapsed).2fs", stats)
+        return stats
+
+    def call(self, func, *args, **kwargs):
+        """Calls a function on the thread owning the ``RobotApplication``.
+
+        :param func: The callable to run
+        :return: The result of the call
+        """
+        self.operations += 1
+        if self.executor is None:
+            return func(*args, **kwargs)
+        return self.executor.call(func, *args, **kwargs)
+
+    def wrap(self, value):
+        """Returns a value which can be used on the calling thread.
+
+        If the application is threaded and the caller isn't the thread
+        owning the ``RobotApplication``, the COM objects are wrapped in
+        proxies running their operations on that thread (see
+        :py:meth:`.ComExecutor.wrap`).
+
+        :param value: A value returned by :py:meth:`call`
+        """
+        if self.executor is None:
+            return value
+        return self.executor.wrap(value)
+
+    def submit(self, func, *args, **kwargs):
+        """Schedules a call on the thread owning the ``RobotApplication``.
+
+        If the application isn't threaded, the function is called at once.
+
+        :param func: The callable to run
+        :return: A ``concurrent.futures.Future`` of the call
+        """
+        if self.executor is not None:
+            return self.executor.submit(func, *args, **kwargs)
+        future = Future()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+    async def run_async(self, func, *args, **kwargs):
+        """Awaits a call on the thread owning the ``RobotApplication``.
+
+        The event loop keeps running while Robot works, so that the calls
+        to Robot can overlap with other tasks, e.g. post-processing results
+        or writing files.
+
+        :param func: The callable to run
+        :return: The result of the call
+
+        .. tip:: The methods of the servers can be awaited directly by
+          adding the ``_async`` suffix to their name: ::
+
+                rb = initialize(False, False, threaded=True)
+                table = await rb.nodes.table_async('all')
+        """
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def checkpoint(self, reopen=True):
+        """Restarts the application if its recycle policy is due.
+
+        :param bool reopen: Whether to save and reopen the project
+        :return: ``True`` if the application was restarted
+        """
+        policy = self.recycle_policy
+        if policy is None or (self.executor and self.executor.on_thread):
+            return False
+        if policy.due(self):
+            self.recycle(reopen)
+            return True
+        return False
+
+    def recycle(self, reopen=True):
+        """Restarts the ``RobotApplication`` and reopens the project.
+
+        The project is saved first, in a temporary file if it has no file
+        name, and reopened in the new ``RobotApplication`` with the same
+        cache, so that the work resumes on the same model.
+
+        :param bool reopen: Whether to save and reopen the project
+
+        .. note:: The servers and objects obtained before the restart must
+          not be used afterwards.
+        """
+        path = None
+        if reopen:
+            path = self.call(lambda: str(self.Project.FileName or ''))
+            if path:
+                self.save()
+            else:
+                policy = self.recycle_policy
+                directory = (policy and policy.directory
+                             or tempfile.gettempdir())
+                path = os.path.join(
+                    directory, f'autorobot-{os.getpid()}-{id(self)}.rtd')
+                self.save_as(path)
+        visible, interactive = self.call(
+            lambda: (bool(self.app.Visible), bool(self.app.Interactive)))
+        threaded = self.executor is not None
+        cache = dict(self.cache)
+        self.quit(save=False)
+        self._start(visible, interactive, threaded)
+        _this.app = self
+        self.operations = 0
+        if self.recycle_policy is not None:
+            self.recycle_policy.reset()
+        if path:
+            self.open(path)
+            self.cache.update(cache)
+        logger.info("Restarted Robot (process %s)", self.process_id)
+
+    @on_com_thread
     def close(self):
         """Closes the project."""
+        self.cache.clear()
         self.Project.Close()
 
+    @recycling(reopen=False)
+    @on_com_thread
     def new(self, proj_type):
         """Creates a new project.
 
@@ -151,16 +423,22 @@ class ExtendedRobotApp:
 
                 app.new('SHELL')
         """
+        self.cache.clear()
         try:
-            self.app.Project.New(synonyms[proj_type])
+            value = synonyms[proj_type]
+            # Robot may refuse calls for a while after it started
+            _retry(lambda: self.app.Project.New(value), self.timeout)
         except Exception:
             raise AutoRobotProjError(
                 f"Couldn't create new project with '{proj_type}'."
             )
 
+    @recycling(reopen=False)
+    @on_com_thread
     def open(self, path):
         """Opens a file with given path (assuming rtd format)."""
-        self.app.Project.Open(str(path))
+        self.cache.clear()
+        _retry(lambda: self.app.Project.Open(str(path)), self.timeout)
 
     def quit(self, save=None):
         """Quits the RobotApplication.
@@ -170,19 +448,32 @@ class ExtendedRobotApp:
            * save the opened file (``True``)
            * discard changes (``False``)
            * prompt the user (``None``)
+        :return:
+           ``True`` if the Robot process exited and released the project
+           file within :py:attr:`timeout`, ``False`` otherwise
         """
+        path = self.call(lambda: str(self.Project.FileName or ''))
         if save is None:
-            self.Quit(RQuitOpt.PROMPT)
+            self.call(self.Quit, RQuitOpt.PROMPT)
         elif save:
-            self.Quit(RQuitOpt.SAVE)
+            self.call(self.Quit, RQuitOpt.SAVE)
         else:
-            self.Quit(RQuitOpt.DISCARD)
+            self.call(self.Quit, RQuitOpt.DISCARD)
+        self.call(release_com, self.app)
 
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
         del self.app
         _this.app = None
-        # Now wait a second to avoid file permission issues
-        time.sleep(1)
-
+        # Wait for Robot to exit and unlock the file to avoid permission
+        # issues when the file is reopened
+        return _poll(
+            lambda: _exited(self.process_id) and _unlocked(path),
+            self.timeout
+        )
+
+    @on_com_thread
     def save(self):
         """Saves the project if the file name is known.
 
@@ -193,10 +484,12 @@ class ExtendedRobotApp:
             return self.Project.Save() or True
         return False
 
+    @on_com_thread
     def save_as(self, path):
         """Saves the project to path. The file format is rtd."""
         self.Project.SaveAs(str(path))
 
+    @on_com_thread
     def show(self, interactive=True):
         """Makes the ``RobotApplication`` visible.
 
@@ -206,28 +499,119 @@ class ExtendedRobotApp:
         self.app.Visible = True
         self.app.Interactive = interactive
 
+    @on_com_thread
     def hide(self):
         """Hides the ``RobotApplication``."""
         self.app.Visible = False
         self.app.Interactive = False
 
     def __getattr__(self, name):
-        if hasattr(self.app, name):
-            return getattr(self.app, name)
+        if self.call(hasattr, self.app, name):
+            return self.wrap(self.call(getattr, self.app, name))
         raise AttributeError(
             f"{self.__class__.__name__} has not attribute '{name}'.")
 
 
-def initialize(visible=True, interactive=True):
+def _poll(predicate, timeout, delay=.01, max_delay=.25):
+    """Polls a predicate with an exponential backoff until it is true.
+
+    :return: ``True`` if the predicate was true before the timeout
+    """
+    end = time.monotonic() + timeout
+    while not predicate():
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(2 * delay, max_delay)
+    return True
+
+
+def _busy(error):
+    """Checks whether an error means that Robot rejected a call for now."""
+    hresult = getattr(error, 'HResult', None)
+    return hresult is not None and (hresult & 0xFFFFFFFF) in _BUSY_HRESULTS
+
+
+def _retry(func, timeout):
+    """Calls a function until Robot accepts it.
+
+    Only the calls rejected because Robot is busy (see :py:func:`_busy`) are
+    tried again, the last of these errors being raised on timeout. Other
+    errors are raised at once.
+    """
+    errors = []
+
+    def attempt():
+        try:
+            func()
+        except Exception as e:
+            if not _busy(e):
+                raise
+            errors[:] = [e]
+            return False
+        return True
+
+    if not _poll(attempt, timeout):
+        raise errors[0]
+
+
+def _exited(process_id):
+    """Checks whether a process exited (``True`` if it is unknown)."""
+    if process_id is None:
+        return True
+    try:
+        return Process.GetProcessById(process_id).HasExited
+    except Exception:
+        # The process isn't running anymore
+        return True
+
+
+def _unlocked(path):
+    """Checks whether a file can be opened for writing."""
+    if not path:
+        return True
+    try:
+        with open(path, 'r+b'):
+            return True
+    except FileNotFoundError:
+        return True
+    except OSError:
+        return False
+
+
+def _window_process(app):
+    """Returns the id of the process owning the window of an application.
+
+    :return: The process id, ``None`` if it can't be read
+    """
+    try:
+        process_id = ctypes.c_ulong()
+        ctypes.windll.user32.GetWindowThreadProcessId(
+            ctypes.c_void_p(int(app.Window)), ctypes.byref(process_id))
+    except Exception:
+        return None
+    return process_id.value or None
+
+
+def _robot_processes():
+    """Returns the ids of the running Robot processes."""
+    return {p.Id for p in Process.GetProcessesByName('robot')}
+
+
+def initialize(visible=True, interactive=True, threaded=False):
     """Initialize a ``RobotApplication`` object.
 
     :param bool visible: Whether the application window is displayed
     :param bool interactive: Whether the application window is displayed
+    :param bool threaded:
+       Whether the application is owned by a dedicated STA thread (see
+       :py:class:`.ExtendedRobotApp`)
 
     .. note::
 
        A reference to the ``RobotApplication`` is stored in
        :py:data:`autorobot.app.app`.
     """
-    _this.app = ExtendedRobotApp(visible, interactive)
+    _this.app = ExtendedRobotApp(visible, interactive, threaded)
     return _this.app
@@ -1,5 +1,6 @@
 import numpy as np
 
+import autorobot.app as app
 from .materials import ExtendedMaterialLabel
 from .sections import ExtendedSectionLabel
 from .releases import ExtendedReleaseLabel
@@ -14,6 +15,8 @@ from .decorators import defaults_to_none
 from .extensions import (
     Capsule,
     ExtendedServer,
+    compile_selection,
+    label_name,
 )
 
 from .errors import (
@@ -50,6 +53,8 @@ class ExtendedBar(Capsule):
         # Characteristics of this material are mostly set to zero.
         # For consistency, we return None in this case. To get the no-name
         # material label, use the ``IRobotBar.GetLabel`` method
+        if not self.HasLabel(RLabelType.MAT):
+            return None
         label = ExtendedMaterialLabel(
             IRobotLabel(self.GetLabel(RLabelType.MAT)))
         return label if label.Name else None
@@ -57,28 +62,38 @@ class ExtendedBar(Capsule):
     @material.setter
     def material(self, name):
         self.SetLabel(RLabelType.MAT, name)
+        if app.app:
+            app.app.materials.update_usage([self.Number], name)
 
     @property
     @defaults_to_none
     def section(self):
         """Section of the bar."""
+        if not self.HasLabel(RLabelType.BAR_SECT):
+            return None
         return ExtendedSectionLabel(
             IRobotLabel(self.GetLabel(RLabelType.BAR_SECT)))
 
     @section.setter
     def section(self, name):
         self.SetLabel(RLabelType.BAR_SECT, name)
+        if app.app:
+            app.app.sections.update_usage([self.Number], name)
 
     @property
     @defaults_to_none
     def release(self):
         """Release of the bar."""
+        if not self.HasLabel(RLabelType.RELEASE):
+            return None
         return ExtendedReleaseLabel(
             IRobotLabel(self.GetLabel(RLabelType.RELEASE)))
 
     @release.setter
     def release(self, name):
         self.SetLabel(RLabelType.RELEASE, name)
+        if app.app:
+            app.app.releases.update_usage([self.Number], name)
 
 
 class ExtendedBarServer(ExtendedServer):
@@ -92,6 +107,16 @@ class ExtendedBarServer(ExtendedServer):
     _dtype = ROType.BAR
     _rtype = ExtendedBar
 
+    label_types = {
+        'section': RLabelType.BAR_SECT,
+        'material': RLabelType.MAT,
+        'release': RLabelType.RELEASE,
+    }
+    """
+    The label types read by :py:meth:`label_table`, with the names of the
+    corresponding fields.
+    """
+
     def create(self, start, end, num=None, obj=True, overwrite=False):
         """Creates a new bar between ``start`` and ``end`` nodes.
 
@@ -121,6 +146,7 @@ class ExtendedBarServer(ExtendedServer):
         num = int(num)
         if self.Exist(num):
             if overwrite:
+                self.forget_numbers([num])
                 self.Delete(num)
             else:
                 raise AutoRobotIdError(f"Bar with id {num} already exists.")
@@ -136,8 +162,92 @@ class ExtendedBarServer(ExtendedServer):
         """
         return np.stack([
             np.array([b.Number, b.StartNode, b.EndNode])
-            for b in self.select(s)
+            for b in self.select(s, release=True)
+        ])
+
+    def lengths(self, s):
+        """Returns the lengths of bars.
+
+        The coordinates of the end nodes are read in a single node table.
+
+        :param str s: A valid selection string
+        :return: A 1d array of lengths in the order of :py:meth:`table`
+        """
+        bars = self.table(s)
+        nodes = self.app.nodes.table(compile_selection(bars[:, 1:]))
+        nodes = nodes[np.argsort(nodes[:, 0])]
+        start, end = (
+            nodes[np.searchsorted(nodes[:, 0], bars[:, i]), 1:]
+            for i in (1, 2)
+        )
+        return np.linalg.norm(end - start, axis=1)
+
+    def label_table(self, s):
+        """Returns the section, material and release names of bars.
+
+        The label names are read with ``HasLabel`` prechecks, so bars
+        without a label don't raise exceptions. The names are stored as
+        categorical codes: the returned table is a structured array with the
+        fields ``bar``, ``section``, ``material`` and ``release``, and each
+        code indexes an array of names where index 0 is ``''`` (no label).
+        For example: ::
+
+            table, names = rb.bars.label_table('all')
+            sections = names['section'][table['section']]
+
+        :param str s: A valid selection string
+        :return: A tuple ``(table, names)`` of the structured array and the
+           dictionary of name arrays
+        """
+        rows = [
+            (b.Number, *(label_name(b, t) for t in self.label_types.values()))
+            for b in self.select(s, release=True)
+        ]
+        names, codes = {}, {}
+        for i, field in enumerate(self.label_types, 1):
+            names[field], inverse = np.unique(
+                np.array([''] + [r[i] for r in rows], dtype=str),
+                return_inverse=True
+            )
+            codes[field] = inverse.ravel()[1:]
+
+        table = np.empty(len(rows), dtype=[('bar', int)] + [
+            (field, np.min_scalar_type(names[field].size - 1))
+            for field in self.label_types
+        ])
+        table['bar'] = [r[0] for r in rows]
+        for field in self.label_types:
+            table[field] = codes[field]
+        return table, names
+
+    def property_table(self, s):
+        """Returns the section and material properties of bars.
+
+        The bars are joined with the properties of their section label (see
+        :py:meth:`.ExtendedSectionServer.properties`) and the yield strength
+        of their material label through the codes of :py:meth:`label_table`,
+        so that each label is read only once.
+
+        :param str s: A valid selection string
+        :return:
+           A structured array with the fields ``bar``, the section fields
+           (see :py:attr:`.ExtendedSectionServer.property_fields`) and
+           ``fy``. The properties of bars without a label are ``NaN``.
+        """
+        table, names = self.label_table(s)
+        fields = list(self.app.sections.property_fields)
+        sections = self.app.sections.properties(names['section'][1:])
+        fy = np.array([np.nan] + [
+            self.app.materials.get(name).RE
+            for name in names['material'][1:]
         ])
+        props = np.empty(len(table), dtype=[('bar', int)] + [
+            (field, float) for field in fields + ['fy']])
+        props['bar'] = table['bar']
+        for field in fields:
+            props[field] = np.r_[np.nan, sections[field]][table['section']]
+        props['fy'] = fy[table['material']]
+        return props
 
     def set_section(self, s, name):
         """Sets the section label for the given bars.
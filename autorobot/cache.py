@@ -0,0 +1,195 @@
+import hashlib
+import os
+from pathlib import Path
+import numpy as np
+
+from .cases import ExtendedSimpleCase
+
+
+def _digest(h, *items):
+    """Updates a hash object with arrays, strings or other objects."""
+    for item in items:
+        if isinstance(item, np.ndarray) and item.dtype != object:
+            h.update(str((item.dtype.descr, item.shape)).encode())
+            h.update(np.ascontiguousarray(item).tobytes())
+        elif isinstance(item, np.ndarray):
+            h.update(repr(item.tolist()).encode())
+        else:
+            h.update(repr(item).encode())
+
+
+def _token(arg):
+    """Returns a hashable representation of a method argument."""
+    if isinstance(arg, np.ndarray):
+        return arg.tolist()
+    if isinstance(arg, (list, tuple)):
+        return [_token(a) for a in arg]
+    if isinstance(arg, dict):
+        return sorted((repr(k), _token(v)) for k, v in arg.items())
+    return arg
+
+
+def _table(func, s='all'):
+    """Returns a table from a server or an empty array if there's no object.
+    """
+    try:
+        return func(s)
+    except ValueError:
+        # np.stack raises a ValueError for an empty selection
+        return np.empty((0,))
+
+
+class ResultCache:
+    """
+    A cache of extracted results stored in compressed ``.npz`` files beside
+    the project.
+
+    The entries are keyed by a fingerprint of the structure, the calculation
+    state, the name of the extraction method and its arguments, so that an
+    entry is only found if the model is unchanged. The cache is disabled
+    until the project is saved and while no results are available.
+
+    :param obj app: The application instance
+    :param directory:
+       The cache directory (optional). By default, the directory is the
+       project path with a ``.results`` extension.
+    """
+
+    def __init__(self, app, directory=None):
+        """Constructor method."""
+        self.app = app
+        self.directory = directory
+        #: A dictionary counting the ``'hits'``, ``'misses'`` and ``'stores'``
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0}
+
+    @property
+    def path(self):
+        """
+        The path of the cache directory or ``None`` if the project has not
+        been saved yet.
+        """
+        if self.directory is not None:
+            return Path(self.directory)
+        name = self.app.Project.FileName
+        return Path(str(name)).with_suffix('.results') if name else None
+
+    @property
+    def stamp(self):
+        """
+        The calculation state: ``None`` if no results are available,
+        otherwise the end time of the last calculation run with
+        :py:meth:`.ExtendedRobotApp.calculate` (see
+        :py:attr:`.ExtendedRobotApp.calc_history`), or ``0`` if the results
+        were calculated before the application started.
+        """
+        if not self.app.structure.Results.Available:
+            return None
+        history = self.app.calc_history
+        return history[-1]['time'] if history else 0
+
+    def fingerprint(self):
+        """Returns a fingerprint of the structure.
+
+        The fingerprint is a hash of the node and bar tables, the labels
+        assigned to bars and nodes, the definitions of the section,
+        material, support and release labels, the loads of simple cases and
+        the factors of combinations.
+
+        :return: A hexadecimal string
+
+        .. note:: The definitions of section and material labels are read
+           from the structure on each call, so that editing a label without
+           renaming it changes the fingerprint.
+        """
+        app = self.app
+        h = hashlib.sha1()
+        _digest(h, _table(app.nodes.table), _table(app.bars.table))
+        table, names = app.bars.label_table('all')
+        _digest(h, table, *(names[k] for k in sorted(names)))
+        for server in (app.sections, app.materials):
+            _digest(h, *(
+                (name, server.definition(server.get(name)))
+                for name in sorted(server.get_names())
+            ))
+        for server in (app.supports, app.releases):
+            _digest(h, sorted(server.registry.items()))
+        _digest(h, sorted(
+            (k, v.tolist()) for k, v in app.supports.usage.items()))
+        for case in app.cases.select('all'):
+            if isinstance(case, ExtendedSimpleCase):
+                loads = case.loads_table()
+                _digest(h, case.Number, sorted(int(k) for k in loads),
+                        *(loads[k] for k in sorted(loads, key=int)))
+        _digest(h, *app.cases.combination_matrix())
+        return h.hexdigest()
+
+    def key(self, name, args, kwargs, fingerprint=None, stamp=None):
+        """Returns the key of a cache entry.
+
+        :param str name: The name of the extraction method
+        :param tuple args: The positional arguments of the method
+        :param dict kwargs: The keyword arguments of the method
+        :param str fingerprint:
+           A fingerprint of the structure (computed if omitted)
+        :param stamp: The calculation state (read if omitted, see
+           :py:attr:`stamp`)
+        :return: A hexadecimal string
+        """
+        if fingerprint is None:
+            fingerprint = self.fingerprint()
+        if stamp is None:
+            stamp = self.stamp
+        h = hashlib.sha1()
+        _digest(h, fingerprint, stamp, name,
+                _token(list(args)), _token(kwargs))
+        return h.hexdigest()
+
+    def get(self, name, func, *args, fingerprint=None, **kwargs):
+        """Returns the cached result of an extraction.
+
+        The function is only called on a miss, its result (an array or a
+        tuple of arrays) is then stored in the cache. Nothing is stored if
+        the project is not saved or has no results.
+
+        :param str name: The name of the extraction, part of the key
+        :param func: The extraction function
+        :param args, kwargs: The arguments of the function
+        :param str fingerprint:
+           A fingerprint of the structure, to avoid computing it again for
+           several lookups (see :py:meth:`fingerprint`)
+        :return: The result of the function
+        """
+        path = self.path
+        stamp = None if path is None else self.stamp
+        if stamp is None:
+            self.stats['misses'] += 1
+            return func(*args, **kwargs)
+
+        key = self.key(name, args, kwargs, fingerprint, stamp)
+        file = path / f'{key}.npz'
+        if file.exists():
+            self.stats['hits'] += 1
+            with np.load(file, allow_pickle=False) as data:
+                result = tuple(
+                    data[f'arr_{i}'] for i in range(len(data.files))
+                )
+            return result if len(result) > 1 else result[0]
+
+        self.stats['misses'] += 1
+        result = func(*args, **kwargs)
+        path.mkdir(parents=True, exist_ok=True)
+        temp = file.with_suffix('.tmp')
+        with open(temp, 'wb') as f:
+            np.savez_compressed(
+                f, *(result if isinstance(result, tuple) else (result,)))
+        os.replace(temp, file)
+        self.stats['stores'] += 1
+        return result
+
+    def clear(self):
+        """Deletes the cache files and resets the statistics."""
+        path = self.path
+        if path is not None and path.is_dir():
+            for file in path.glob('*.npz'):
+                file.unlink()
+        self.stats.update(hits=0, misses=0, stores=0)
@@ -1,5 +1,7 @@
 import numpy as np
+from scipy import sparse as sci_sparse
 
+import autorobot.app as app
 from .constants import (
     RBarPLValues,
     RBarUDLValues,
@@ -7,16 +9,23 @@ from .constants import (
     RCaseType,
     RDeadValues,
     RLoadType,
+    RNodalValues,
     ROType,
 )
 from .extensions import (
     Capsule,
     ExtendedServer,
+    compile_selection,
+)
+from .combinations import (
+    factor_matrix,
+    rules,
 )
 from .synonyms import synonyms
 
 from .errors import (
     AutoRobotIdError,
+    AutoRobotValueError,
 )
 
 from .robotom import RobotOM  # NOQA F401
@@ -42,22 +51,106 @@ class ExtendedSimpleCase(Capsule):
         RLoadType.DEAD: RDeadValues,
         RLoadType.BAR_UDL: RBarUDLValues,
         RLoadType.BAR_PL: RBarPLValues,
+        RLoadType.NODAL: RNodalValues,
+    }
+
+    resultant_objects = {
+        RLoadType.NODAL: 'nodes',
+        RLoadType.BAR_PL: 'bars',
+        RLoadType.BAR_UDL: 'bars',
     }
+    """
+    A dictionary of the load types summed by :py:meth:`applied_forces` and
+    the servers of the loaded objects.
+    """
 
     @property
     def loads(self):
         """The list of loads defined."""
-        n = self.Records.Count
-        _loads = []
-        for i in range(1, n + 1):
+        return list(self.iter_loads())
+
+    def iter_loads(self, details=False):
+        """Yields the loads defined, reading one record at a time.
+
+        Records are only read as the iterator is consumed, so that a scan
+        can stop early without reading the whole case.
+
+        :param bool details:
+           Whether to add the record index (``'Index'``) and the selection
+           text of the loaded objects (``'Objects'``) to each load
+        :return: A generator of dictionaries (see :py:attr:`loads`)
+        """
+        for i in range(1, self.Records.Count + 1):
             rec = self.get(i)
             load = {'Type': rec.Type, 'Description': rec.Description}
+            if details:
+                load['Index'] = i
+                load['Objects'] = rec.Objects.ToText().strip()
             if self.load_type_values.get(rec.Type, None):
                 index = self.load_type_values[rec.Type].custom_index
                 for k, v in index.items():
                     load[k] = self.get_record_value(rec, v)
-            _loads.append(load)
-        return _loads
+            yield load
+
+    def loads_table(self):
+        """Returns the loads defined as one structured array per load type.
+
+        Every record is read once. Each array has the fields ``Index``,
+        ``Description``, ``Objects`` (the selection text) and one field per
+        value of the load type (see :py:attr:`load_type_values`).
+
+        :return: A dictionary of structured arrays keyed by load type
+        """
+        loads = {}
+        for load in self.iter_loads(details=True):
+            loads.setdefault(load['Type'], []).append(load)
+
+        tables = {}
+        for load_type, rows in loads.items():
+            values = self.load_type_values.get(load_type, None)
+            keys = list(values.custom_index) if values else []
+            fields = ['Index', 'Description', 'Objects'] + keys
+            dtype = (
+                [('Index', int), ('Description', object), ('Objects', object)]
+                + [(k, float) for k in keys]
+            )
+            tables[load_type] = np.array(
+                [tuple(row[f] for f in fields) for row in rows], dtype=dtype)
+        return tables
+
+    def applied_forces(self):
+        """Returns the resultant of the forces applied by the load case.
+
+        Nodal forces, bar point loads and bar uniform loads are summed in
+        global axes, which allows a check of the global equilibrium against
+        the sum of the reactions (see
+        :py:meth:`.ExtendedResultServer.equilibrium`).
+
+        :return: A 1d array with the resultant forces FX, FY and FZ
+        :raise AutoRobotValueError:
+           If the load case has records that can't be summed, e.g.
+           self-weight or loads in local axes, rotated or projected
+        """
+        total = np.zeros(3)
+        for load_type, table in self.loads_table().items():
+            server = self.resultant_objects.get(load_type, None)
+            flags = [
+                k for k in ('ALPHA', 'BETA', 'GAMMA', 'IS_LOC', 'IS_PROJ')
+                if k in (table.dtype.names or ())
+            ]
+            if server is None or any(np.any(table[k]) for k in flags):
+                raise AutoRobotValueError(
+                    f"Can't sum the forces of case {self.Number}.")
+            objects = getattr(app.app, server)
+            for row in table:
+                force = np.array([row['FX'], row['FY'], row['FZ']])
+                if load_type == RLoadType.BAR_UDL:
+                    total += force * objects.lengths(row['Objects']).sum()
+                else:
+                    count = sum(1 for _ in objects.select(
+                        row['Objects'], obj=False))
+                    total += force * count
+        return total
 
     def add_self_weight(self, s='all', factor=1., desc=''):
         """Adds self-weight forces to the structure.
@@ -114,6 +207,36 @@ class ExtendedSimpleCase(Capsule):
         for k, v in rec_values.items():
             self.set_record_value(rec, k, v)
 
+    def add_bar_udl_many(self, bars, fx=0., fy=0., fz=0.,
+                         alpha=0., beta=0., gamma=0.,
+                         is_local=False, is_proj=False, is_relative=False,
+                         offset_y=0., offset_z=0.,
+                         unit=1e3, unit_angle=np.pi / 180, desc=''):
+        """Adds uniformly distributed loads on many bars at once.
+
+        Each argument can be a scalar or an array with one value per bar.
+        Bars with identical load values share a single record whose
+        selection is compiled from all the matching bars.
+
+        :param bars: An iterable of bar numbers
+        :return: The number of load records created
+
+        The other arguments are the same as for :py:meth:`add_bar_udl`.
+        """
+        return self.add_records(RLoadType.BAR_UDL, bars, {
+            RBarUDLValues.FX: np.multiply(fx, unit),
+            RBarUDLValues.FY: np.multiply(fy, unit),
+            RBarUDLValues.FZ: np.multiply(fz, unit),
+            RBarUDLValues.ALPHA: np.multiply(alpha, unit_angle),
+            RBarUDLValues.BETA: np.multiply(beta, unit_angle),
+            RBarUDLValues.GAMMA: np.multiply(gamma, unit_angle),
+            RBarUDLValues.IS_LOC: is_local,
+            RBarUDLValues.IS_PROJ: is_proj,
+            RBarUDLValues.IS_REL: is_relative,
+            RBarUDLValues.OFFSET_Y: offset_y,
+            RBarUDLValues.OFFSET_Z: offset_z,
+        }, desc)
+
     def add_bar_pl(self, s, x=0., fx=0., fy=0., fz=0., alpha=0.,
                    beta=0., gamma=0., is_local=False, is_relative=False,
                    offset_y=0., offset_z=0.,
@@ -150,6 +273,130 @@ class ExtendedSimpleCase(Capsule):
         for k, v in rec_values.items():
             self.set_record_value(rec, k, v)
 
+    def add_bar_pl_many(self, bars, x=0., fx=0., fy=0., fz=0., alpha=0.,
+                        beta=0., gamma=0., is_local=False, is_relative=False,
+                        offset_y=0., offset_z=0.,
+                        unit=1e3, unit_angle=np.pi / 180, desc=''):
+        """Adds point loads on many bars at once.
+
+        Each argument can be a scalar or an array with one value per bar.
+        Bars with identical load values share a single record whose
+        selection is compiled from all the matching bars.
+
+        :param bars: An iterable of bar numbers
+        :return: The number of load records created
+
+        The other arguments are the same as for :py:meth:`add_bar_pl`.
+        """
+        return self.add_records(RLoadType.BAR_PL, bars, {
+            RBarPLValues.X: x,
+            RBarPLValues.FX: np.multiply(fx, unit),
+            RBarPLValues.FY: np.multiply(fy, unit),
+            RBarPLValues.FZ: np.multiply(fz, unit),
+            RBarPLValues.ALPHA: np.multiply(alpha, unit_angle),
+            RBarPLValues.BETA: np.multiply(beta, unit_angle),
+            RBarPLValues.GAMMA: np.multiply(gamma, unit_angle),
+            RBarPLValues.IS_LOC: is_local,
+            RBarPLValues.IS_REL: is_relative,
+            RBarPLValues.OFFSET_Y: offset_y,
+            RBarPLValues.OFFSET_Z: offset_z,
+        }, desc)
+
+    def add_nodal_force(self, s, fx=0., fy=0., fz=0., cx=0., cy=0., cz=0.,
+                        alpha=0., beta=0., gamma=0.,
+                        unit=1e3, unit_angle=np.pi / 180, desc=''):
+        """Adds a force on a selection of nodes.
+
+        :param str s: A valid node selection string
+        :param str desc: A description (optional)
+        :param float fx, fy, fz: Force vector
+        :param float cx, cy, cz: Moment vector
+        :param float alpha, beta, gamma: Rotation of the force vector
+        :param float unit: A multiplication factor for the force input
+        :param float unit_angle: A multiplication factor for angle input
+        """
+        rec = IRobotLoadRecord(self.Records.Create(RLoadType.NODAL))
+        rec.Objects.FromText(str(s))
+        rec.Description = desc
+        rec_values = {
+            RNodalValues.FX: fx * unit,
+            RNodalValues.FY: fy * unit,
+            RNodalValues.FZ: fz * unit,
+            RNodalValues.CX: cx * unit,
+            RNodalValues.CY: cy * unit,
+            RNodalValues.CZ: cz * unit,
+            RNodalValues.ALPHA: alpha * unit_angle,
+            RNodalValues.BETA: beta * unit_angle,
+            RNodalValues.GAMMA: gamma * unit_angle,
+        }
+        for k, v in rec_values.items():
+            self.set_record_value(rec, k, v)
+
+    def add_nodal_force_many(self, nodes, fx=0., fy=0., fz=0.,
+                             cx=0., cy=0., cz=0., alpha=0., beta=0., gamma=0.,
+                             unit=1e3, unit_angle=np.pi / 180, desc=''):
+        """Adds forces on many nodes at once.
+
+        Each argument can be a scalar or an array with one value per node,
+        for example the columns of a (node, FX, FY, FZ, CX, CY, CZ) array.
+        Nodes with identical force vectors share a single record whose
+        selection is compiled from all the matching nodes.
+
+        :param nodes: An iterable of node numbers
+        :return: The number of load records created
+
+        The other arguments are the same as for :py:meth:`add_nodal_force`.
+        """
+        return self.add_records(RLoadType.NODAL, nodes, {
+            RNodalValues.FX: np.multiply(fx, unit),
+            RNodalValues.FY: np.multiply(fy, unit),
+            RNodalValues.FZ: np.multiply(fz, unit),
+            RNodalValues.CX: np.multiply(cx, unit),
+            RNodalValues.CY: np.multiply(cy, unit),
+            RNodalValues.CZ: np.multiply(cz, unit),
+            RNodalValues.ALPHA: np.multiply(alpha, unit_angle),
+            RNodalValues.BETA: np.multiply(beta, unit_angle),
+            RNodalValues.GAMMA: np.multiply(gamma, unit_angle),
+        }, desc)
+
+    def add_records(self, load_type, objects, values, desc=''):
+        """Adds load records, grouping objects with identical values.
+
+        One record is created for each distinct row of values, with a
+        selection compiled from all the objects sharing that row. The
+        records are created within a single multi-operation.
+
+        :param int load_type: The type of load record (see `RLoadType`)
+        :param objects: An iterable of object numbers
+        :param dict values:
+           A dictionary of (key, value) pairs where the keys are Enum members
+           (e.g. ``RBarUDLValues.FX``) and the values are scalars or arrays
+           with one value per object
+        :param str desc: A description (optional)
+        :return: The number of load records created
+        """
+        objects = np.asarray(objects, dtype=int).ravel()
+        if not objects.size:
+            return 0
+        keys = list(values)
+        table = np.column_stack([
+            np.broadcast_to(np.asarray(values[k], dtype=float), objects.shape)
+            for k in keys
+        ])
+        rows, inverse = np.unique(table, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind='stable')
+        groups = np.split(objects[order], np.cumsum(np.bincount(inverse))[:-1])
+
+        with app.app.cases:
+            for row, group in zip(rows, groups):
+                rec = IRobotLoadRecord(self.Records.Create(load_type))
+                rec.Objects.FromText(compile_selection(group))
+                rec.Description = desc
+                for k, v in zip(keys, row):
+                    self.set_record_value(rec, k, float(v))
+        return len(rows)
+
     def delete(self, n):
         """Deletes the load record at index n.
 
@@ -266,10 +513,64 @@ class ExtendedCaseServer(ExtendedServer):
                 self.Delete(num)
             else:
                 raise AutoRobotIdError(f"Case with id {num} already exists.")
+        return self._create_simple(
+            num, name, synonyms[nature], synonyms[analysis_type])
+
+    def create_cases(self, table, overwrite=False):
+        """Creates new load cases from a table.
+
+        The synonyms are resolved once per distinct value, the case numbers
+        are checked against a single snapshot of the existing numbers and
+        the load cases are created within a single multi-operation.
+
+        :param table:
+           An iterable of rows ``(num, name, nature, analysis_type)`` (see
+           :py:meth:`create_case`). When **num** is ``None``, the case gets
+           the first number available after the existing cases.
+        :param bool overwrite:
+           Whether to override if numbers conflict with existing data
+        :return:
+           A dictionary of the load cases (as ``ExtendedSimpleCase``
+           instances) indexed by number
+
+        .. tip:: This method supports :ref:`about_synonyms` for the
+          **nature** and **analysis_type** values. For example: ::
+
+                create_cases([(1, 'Dead', 'PERM', 'LINEAR'),
+                              (2, 'Live', 'IMPOSED', 'LINEAR')])
+        """
+        rows = [tuple(row) for row in table]
+        values = {v: synonyms[v] for row in rows for v in row[2:4]}
+        existing = set(self.select('all', obj=False))
+
+        nums = [None if row[0] is None else int(row[0]) for row in rows]
+        if len(set(n for n in nums if n is not None)) < sum(
+                n is not None for n in nums):
+            raise AutoRobotIdError("Case numbers must be unique.")
+        conflicts = existing.intersection(nums)
+        if conflicts and not overwrite:
+            raise AutoRobotIdError(
+                f"Cases with ids {sorted(conflicts)} already exist.")
+        free = max(existing.union(n for n in nums if n is not None),
+                   default=0) + 1
+        for i, n in enumerate(nums):
+            if n is None:
+                nums[i], free = free, free + 1
+
+        cases = {}
+        with self:
+            for num, (_, name, nature, analysis_type) in zip(nums, rows):
+                if num in conflicts:
+                    self.Delete(num)
+                cases[num] = self._create_simple(
+                    num, name, values[nature], values[analysis_type])
+        return cases
+
+    def _create_simple(self, num, name, nature, analysis_type):
+        """Creates a simple load case from resolved constants."""
         case = IRobotSimpleCase(
-            self.CreateSimple(num, name, synonyms[nature],
-                              synonyms[analysis_type]))
-        case.label = self.label_prefix[synonyms[nature]] + str(num)
+            self.CreateSimple(num, name, nature, analysis_type))
+        case.label = self.label_prefix[nature] + str(num)
         return ExtendedSimpleCase(IRobotSimpleCase(case))
 
     def create_combination(self, num, name, case_factors, comb_type, nature,
@@ -308,6 +609,187 @@ class ExtendedCaseServer(ExtendedServer):
             comb.CaseFactors.New(k, v)
         return comb
 
+    def create_combinations(self, matrix, cases, comb_type, nature,
+                            analysis_type, names=None, num=None,
+                            overwrite=False):
+        """Creates load case combinations from a factor matrix.
+
+        The existing case numbers are read once and all the combinations are
+        created within a single multi-operation.
+
+        :param numpy.ndarray matrix:
+           A 2d array of factors (one row per combination, one column per
+           load case)
+        :param cases: An iterable of load case numbers (one per column)
+        :param int comb_type: The type of the combinations (see `RCombType`)
+        :param int nature: Nature of the combinations (see `RCaseNature`)
+        :param int analysis_type: Type of analysis (see `RAnalysisType`)
+        :param names:
+           An iterable of names, one per combination (default:
+           ``'Comb {num}'``)
+        :param int num:
+           The number of the first combination (default: the first number
+           after the existing cases), the combinations are numbered
+           consecutively
+        :param bool overwrite: Whether to overwrite if case ids already exist
+        :return: An array with the combination numbers
+
+        .. tip:: This method supports :ref:`about_synonyms` for the
+          **comb_type**, **nature** and **analysis_type** arguments.
+        """
+        matrix = np.atleast_2d(np.asarray(matrix, dtype=float))
+        cases = np.asarray(cases, dtype=int).ravel()
+        if matrix.shape[1] != cases.size:
+            raise AutoRobotValueError(
+                "The factor matrix must have one column per load case.")
+        existing = set(self.select('all', obj=False))
+        if num is None:
+            num = max(existing, default=0) + 1
+        nums = np.arange(int(num), int(num) + len(matrix))
+        conflicts = existing.intersection(nums.tolist())
+        if conflicts and not overwrite:
+            raise AutoRobotIdError(
+                f"Cases with ids {sorted(conflicts)} already exist.")
+        if names is None:
+            names = [f'Comb {n}' for n in nums]
+
+        comb_type, nature, analysis_type = (
+            synonyms[comb_type], synonyms[nature], synonyms[analysis_type])
+        with self:
+            for n, name, row in zip(nums, names, matrix):
+                if n in conflicts:
+                    self.Delete(int(n))
+                comb = IRobotCaseCombination(self.CreateCombination(
+                    int(n), str(name), comb_type, nature, analysis_type))
+                for i in np.flatnonzero(row):
+                    comb.CaseFactors.New(int(cases[i]), float(row[i]))
+        return nums
+
+    def generate_combinations(self, rule='6.10', s='all', groups=None,
+                              comb_type=None, nature='PERM',
+                              analysis_type='COMB_LINEAR', num=None,
+                              prefix=None):
+        """Generates the load case combinations given by a rule.
+
+        The factor matrix is built from the natures of the simple load cases
+        (see :py:func:`autorobot.combinations.factor_matrix`) and the
+        combinations are created with :py:meth:`create_combinations`.
+
+        :param str rule:
+           The combination rule (see :py:data:`autorobot.combinations.rules`)
+        :param str s: A valid selection string for the simple load cases
+        :param groups:
+           An iterable of group identifiers, one per simple load case, for
+           mutually exclusive cases (default: cases sharing a nature)
+        :param int comb_type:
+           The type of the combinations (default: given by the rule)
+        :param int nature: Nature of the combinations (see `RCaseNature`)
+        :param int analysis_type: Type of analysis (see `RAnalysisType`)
+        :param int num: The number of the first combination (optional)
+        :param str prefix: A prefix for the names (default: the rule)
+        :return: An array with the combination numbers
+        """
+        cases = [c for c in self.select(s)
+                 if isinstance(c, ExtendedSimpleCase)]
+        matrix = factor_matrix([c.Nature for c in cases], rule, groups)
+        prefix = rule if prefix is None else prefix
+        return self.create_combinations(
+            matrix, [c.Number for c in cases],
+            rules[rule] if comb_type is None else comb_type,
+            nature, analysis_type,
+            names=[f'{prefix} {i + 1}' for i in range(len(matrix))],
+            num=num
+        )
+
+    def combination_matrix(self, s='all', sparse=False):
+        """Returns the factors of load case combinations as a matrix.
+
+        :param str s: A valid selection string for the combinations
+        :param bool sparse:
+           Whether to return a sparse matrix (``scipy.sparse.csr_matrix``)
+           instead of a dense array
+        :return:
+           A tuple ``(matrix, combs, cases)`` with the factor matrix
+           (combinations × load cases), the array of combination numbers
+           (rows) and the array of load case numbers (columns)
+        """
+        selected = set(self.select(s, obj=False))
+        cases, combs, rows, cols, factors = [], [], [], [], []
+        # Only the selected combinations are cast, the other cases are
+        # only read for their number and type
+        for case in super(ExtendedCaseServer, self).select('all'):
+            number, case_type = case.Number, case.Type
+            if case_type == RCaseType.SIMPLE:
+                cases.append(number)
+            elif case_type == RCaseType.COMB and number in selected:
+                case_factors = IRobotCaseCombination(case).CaseFactors
+                for i in range(1, case_factors.Count + 1):
+                    factor = case_factors.Get(i)
+                    rows.append(len(combs))
+                    cols.append(factor.CaseNumber)
+                    factors.append(factor.Factor)
+                combs.append(number)
+
+        cases = np.union1d(cases, cols).astype(int)
+        combs = np.array(combs, dtype=int)
+        matrix = sci_sparse.coo_matrix(
+            (factors, (rows, np.searchsorted(cases, cols))),
+            shape=(combs.size, cases.size)
+        ).tocsr()
+        return (matrix if sparse else matrix.toarray()), combs, cases
+
+    def set_combination_matrix(self, matrix, combs, cases, tol=1e-9):
+        """Sets the factors of existing load case combinations.
+
+        The matrix is compared with the current factors and only the
+        combinations whose factors changed are rewritten, within a single
+        multi-operation.
+
+        :param matrix:
+           A 2d array or sparse matrix of factors (combinations × load
+           cases)
+        :param combs: An iterable of combination numbers (rows)
+        :param cases: An iterable of load case numbers (columns)
+        :param float tol: The tolerance used to compare factors
+        :return: An array with the numbers of the combinations rewritten
+        """
+        if sci_sparse.issparse(matrix):
+            matrix = matrix.toarray()
+        matrix = np.atleast_2d(np.asarray(matrix, dtype=float))
+        combs = np.asarray(combs, dtype=int).ravel()
+        cases = np.asarray(cases, dtype=int).ravel()
+        if matrix.shape != (combs.size, cases.size):
+            raise AutoRobotValueError(
+                "The factor matrix must have one row per combination "
+                "and one column per load case.")
+
+        current, cur_combs, cur_cases = self.combination_matrix(
+            compile_selection(combs))
+        missing = np.setdiff1d(combs, cur_combs)
+        if missing.size:
+            raise AutoRobotValueError(
+                f"Combinations {list(missing)} don't exist.")
+
+        all_cases = np.union1d(cases, cur_cases)
+        new = np.zeros((combs.size, all_cases.size))
+        new[:, np.searchsorted(all_cases, cases)] = matrix
+        # The combinations are read in the order of the server, not sorted
+        order = np.argsort(cur_combs)
+        old = np.zeros_like(new)
+        old[:, np.searchsorted(all_cases, cur_cases)] = current[
+            order[np.searchsorted(cur_combs, combs, sorter=order)]]
+        changed = np.any(np.abs(new - old) > tol, axis=1)
+
+        with self:
+            for i in np.flatnonzero(changed):
+                comb = IRobotCaseCombination(self.server.Get(int(combs[i])))
+                case_factors = comb.CaseFactors
+                for k in range(case_factors.Count, 0, -1):
+                    case_factors.Delete(k)
+                for j in np.flatnonzero(new[i]):
+                    case_factors.New(int(all_cases[j]), float(new[i, j]))
+        return combs[changed]
+
     def get(self, n):
         """A method to retrieve load case objects from the server.
 
@@ -332,6 +814,4 @@ class ExtendedCaseServer(ExtendedServer):
         it = super(ExtendedCaseServer, self).select(s, obj)
         if not obj:
             return it
-        else:
-            for c in it:
-                yield self.cast(c)
+        return (self.cast(c) for c in it)
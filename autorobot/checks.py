@@ -0,0 +1,51 @@
+import numpy as np
+
+from .extensions import compile_selection
+
+
+def utilisation(forces, props, gamma_m=1.):
+    """Returns the utilisation ratios of bars from their internal forces.
+
+    Two ratios are computed for every case, bar and point:
+
+     * the axial and bending ratio:
+       ``(|FX| / AX + |MY| / WY + |MZ| / WZ) / fd``
+     * the shear ratio: ``max(|FY| / AY, |FZ| / AZ) / (fd / √3)``
+
+    where ``fd = fy / γM``.
+
+    :param numpy.ndarray forces:
+       The bar forces, e.g. of shape (cases, bars, points, 6) with the
+       components of :py:data:`.bar_force_ids`
+    :param numpy.ndarray props:
+       The properties of the bars (see
+       :py:meth:`.ExtendedBarServer.property_table`), in the order of the
+       bars of the forces
+    :param float gamma_m: The partial factor of the resistance
+    :return:
+       An array with the shape of the forces where the last axis holds the
+       axial and bending ratio and the shear ratio
+    """
+    forces = np.abs(np.asarray(forces, dtype=float))
+    fx, fy, fz, _, my, mz = np.moveaxis(forces, -1, 0)
+    props = props[:, None]  # Broadcast the properties along the points
+    design = props['fy'] / gamma_m
+    with np.errstate(divide='ignore', invalid='ignore'):
+        axial = (fx / props['AX'] + my / props['WY'] + mz / props['WZ'])
+        shear = np.maximum(fy / props['AY'], fz / props['AZ']) * np.sqrt(3.)
+        return np.stack([axial / design, shear / design], axis=-1)
+
+
+def failing(ratios, bars, limit=1.):
+    """Returns a selection of the bars with a ratio above a limit.
+
+    :param numpy.ndarray ratios:
+       The utilisation ratios, with the bars on the second axis (see
+       :py:func:`utilisation`)
+    :param bars: The bar numbers of the second axis of the ratios
+    :param float limit: The limit of the ratios
+    :return: A selection string of the failing bars
+    """
+    ratios = np.moveaxis(np.asarray(ratios), 1, 0).reshape(len(bars), -1)
+    fails = np.any(ratios > limit, axis=1)
+    return compile_selection(np.asarray(bars)[fails])
@@ -0,0 +1,154 @@
+from itertools import product
+import numpy as np
+
+from .constants import RCaseNature
+from .errors import AutoRobotValueError
+from .synonyms import synonyms
+
+
+psi_factors = {
+    RCaseNature.IMPOSED: (0.7, 0.5, 0.3),
+    RCaseNature.SNOW: (0.5, 0.2, 0.),
+    RCaseNature.WIND: (0.6, 0.2, 0.),
+}
+"""
+A dictionary providing the combination factors ψ0, ψ1 and ψ2 for variable
+actions based on the nature of the load case. The default values are those of
+EN 1990 Table A1.1 for buildings (category A imposed loads, snow for sites
+below 1000 m). The values can be changed to suit the project:
+
+ * ``RCaseNature.IMPOSED``: ``(0.7, 0.5, 0.3)``,
+ * ``RCaseNature.SNOW``: ``(0.5, 0.2, 0.)``,
+ * ``RCaseNature.WIND``: ``(0.6, 0.2, 0.)``,
+"""
+
+partial_factors = {
+    'G_sup': 1.35,
+    'G_inf': 1.,
+    'Q': 1.5,
+    'xi': .85,
+}
+"""
+A dictionary providing the partial factors for ultimate limit states
+(EN 1990 Table A1.2(B)). The default values are:
+
+ * ``'G_sup'``: ``1.35`` (unfavourable permanent actions),
+ * ``'G_inf'``: ``1.`` (favourable permanent actions),
+ * ``'Q'``: ``1.5`` (variable actions),
+ * ``'xi'``: ``.85`` (reduction factor of expression 6.10b),
+"""
+
+rules = {
+    '6.10': 'ULS',
+    '6.10a': 'ULS',
+    '6.10b': 'ULS',
+    'characteristic': 'SLS',
+    'frequent': 'SLS',
+    'quasi-permanent': 'SLS',
+}
+"""
+A dictionary of the supported combination rules and the corresponding type
+of combination (see :ref:`about_synonyms`).
+"""
+
+
+def rule_factors(rule, psi):
+    """Returns the factors applied to the actions by a combination rule.
+
+    :param str rule: The combination rule (see :py:data:`rules`)
+    :param numpy.ndarray psi:
+       A 2d array with the factors ψ0, ψ1, ψ2 for each load case (one row
+       per load case)
+    :return:
+       A tuple ``(permanent, leading, accompanying)`` where ``permanent`` is
+       a tuple of factors for permanent actions (one combination per
+       factor), ``leading`` and ``accompanying`` are arrays of factors for
+       each load case. ``leading`` is ``None`` when the rule has no leading
+       action.
+    """
+    g_sup, g_inf = partial_factors['G_sup'], partial_factors['G_inf']
+    g_q, xi = partial_factors['Q'], partial_factors['xi']
+    ones = np.ones(len(psi))
+    if rule == '6.10':
+        return (g_sup, g_inf), g_q * ones, g_q * psi[:, 0]
+    if rule == '6.10a':
+        return (g_sup, g_inf), None, g_q * psi[:, 0]
+    if rule == '6.10b':
+        return (xi * g_sup, g_inf), g_q * ones, g_q * psi[:, 0]
+    if rule == 'characteristic':
+        return (1.,), ones, psi[:, 0]
+    if rule == 'frequent':
+        return (1.,), psi[:, 1], psi[:, 2]
+    if rule == 'quasi-permanent':
+        return (1.,), None, psi[:, 2]
+    raise AutoRobotValueError(f"Unknown combination rule '{rule}'.")
+
+
+def factor_matrix(natures, rule='6.10', groups=None):
+    """Returns the factor matrix of the combinations given by a rule.
+
+    Permanent load cases are always active and take the same factor in a
+    combination. Accidental load cases are left out. Variable load cases
+    sharing a group are mutually exclusive (by default, load cases sharing
+    the same nature, e.g. several wind directions, are exclusive). Every
+    subset of variable actions is combined, with each active action taken
+    in turn as the leading action if the rule has one.
+
+    :param natures:
+       An iterable of load case natures (see
+       :py:class:`autorobot.RCaseNature`), one per load case
+    :param str rule: The combination rule (see :py:data:`rules`)
+    :param groups:
+       An iterable of group identifiers, one per load case (optional)
+    :return: A 2d array of factors (combinations × load cases)
+
+    .. tip:: This function supports :ref:`about_synonyms` for the
+      **natures** argument. For example: ::
+
+            factor_matrix(['PERM', 'IMPOSED', 'WIND', 'WIND'], '6.10')
+    """
+    natures = [synonyms[n] for n in natures]
+    codes = np.array([int(n) for n in natures], dtype=int)
+    groups = codes if groups is None else np.asarray(groups)
+    if len(groups) != len(codes):
+        raise AutoRobotValueError("There must be one group per load case.")
+
+    psi = np.zeros((len(natures), 3))
+    for nature, factors in psi_factors.items():
+        psi[codes == int(nature)] = factors
+    permanent, leading, accompanying = rule_factors(rule, psi)
+
+    is_perm = codes == int(RCaseNature.PERM)
+    is_var = ~is_perm & (codes != int(RCaseNature.ACC))
+    choices = [
+        [None] + list(np.flatnonzero(is_var & (groups == g)))
+        for g in np.unique(groups[is_var])
+    ]
+
+    rows = []
+    for choice in product(*choices):
+        active = [i for i in choice if i is not None]
+        for lead in (active if leading is not None and active else [None]):
+            row = np.zeros(len(codes))
+            row[active] = accompanying[active]
+            if lead is not None:
+                row[lead] = leading[lead]
+            for g in permanent:
+                row[is_perm] = g
+                rows.append(row.copy())
+    return prune(np.array(rows).reshape(-1, len(codes)))
+
+
+def prune(matrix, decimals=9):
+    """Removes duplicate and empty rows from a factor matrix.
+
+    The order of the first occurrence of each row is preserved.
+
+    :param numpy.ndarray matrix: A 2d array of factors
+    :param int decimals: The number of decimals used to compare factors
+    :return: The pruned factor matrix
+    """
+    matrix = np.round(np.asarray(matrix, dtype=float), decimals)
+    matrix = matrix[np.any(matrix != 0., axis=1)]
+    _, index = np.unique(matrix, axis=0, return_index=True)
+    return matrix[np.sort(index)]
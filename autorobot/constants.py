@@ -9,15 +9,19 @@ from RobotOM import (
     IRobotCaseNature,
     IRobotCaseType,
     IRobotCombinationType,
+    IRobotComponentType,
     IRobotDeadRecordValues,
     IRobotLabelType,
     IRobotLicenseEntitlement,
     IRobotLicenseEntitlementStatus,
     IRobotLoadRecordType,
     IRobotMaterialType,
+    IRobotNodeForceRecordValues,
     IRobotObjectType,
     IRobotProjectType,
     IRobotQuitOption,
+    IRobotResultParamType,
+    IRobotResultQueryReturnType,
 )
 
 
@@ -28,16 +32,20 @@ __all__ = [
     'RCaseNature',
     'RCaseType',
     'RCombType',
+    'RComponent',
     'RDeadValues',
     'RLabelType',
     'RLicense',
     'RLicenseStatus',
     'RLoadType',
     'RMatType',
+    'RNodalValues',
     'ROType',
     'RProjType',
+    'RQueryState',
     'RQuitOpt',
     'RReleaseValues',
+    'RResultParam',
 ]
 
 
@@ -265,6 +273,70 @@ Aliases for bars' point loads. For more details, see
 """
 
 
+RNodalValues = EnumCapsule(
+    IRobotNodeForceRecordValues,
+    {
+        'FX': 'I_NFRV_FX',
+        'FY': 'I_NFRV_FY',
+        'FZ': 'I_NFRV_FZ',
+        'CX': 'I_NFRV_CX',
+        'CY': 'I_NFRV_CY',
+        'CZ': 'I_NFRV_CZ',
+        'ALPHA': 'I_NFRV_ALPHA',
+        'BETA': 'I_NFRV_BETA',
+        'GAMMA': 'I_NFRV_GAMMA'
+    }
+)
+"""
+Aliases for nodal forces. For more details, see
+``IRobotNodeForceRecordValues``.
+"""
+
+
+RComponent = EnumCapsule(
+    IRobotComponentType,
+    {
+        'RESULT_QUERY': 'I_CT_RESULT_QUERY_PARAMS'
+    }
+)
+"""
+Aliases for the component types created by the component factory. For more
+details, see ``IRobotComponentType``.
+"""
+
+
+RResultParam = EnumCapsule(
+    IRobotResultParamType,
+    {
+        'BAR_ID': 'I_RPT_BAR_ID',
+        'NODE_ID': 'I_RPT_NODE_ID',
+        'CASE_ID': 'I_RPT_LOAD_CASE_ID',
+        'POINT': 'I_RPT_BAR_DIV_POINT',
+        'DIV_COUNT': 'I_RPT_BAR_DIV_COUNT',
+        'MULTI_THREADS': 'I_RPT_MULTI_THREADS',
+        'THREAD_COUNT': 'I_RPT_THREAD_COUNT',
+        'SMART_CANCEL': 'I_RPT_SMART_CANCEL'
+    }
+)
+"""
+Aliases for the parameters of result queries. For more details, see
+``IRobotResultParamType``.
+"""
+
+
+RQueryState = EnumCapsule(
+    IRobotResultQueryReturnType,
+    {
+        'MORE': 'I_RQRT_MORE_AVAILABLE',
+        'DONE': 'I_RQRT_DONE'
+    }
+)
+"""
+Aliases for the states returned by result queries. For more details, see
+``IRobotResultQueryReturnType``.
+"""
+
+
 RLicense = EnumCapsule(
     IRobotLicenseEntitlement,
     {
@@ -30,6 +30,35 @@ def requires_init(func):
     return wrapper
 
 
+def on_com_thread(method):
+    """Method decorator to run a method on the thread owning the application.
+
+    The result is wrapped for the calling thread, so that COM objects are
+    not used off the thread owning them. The instance must have ``call``
+    and ``wrap`` methods (see :py:meth:`.ExtendedRobotApp.call` and
+    :py:meth:`.ExtendedRobotApp.wrap`).
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self.wrap(self.call(method, self, *args, **kwargs))
+    return wrapper
+
+
+def recycling(reopen=True):
+    """Method decorator to restart the application first if it is due.
+
+    The instance must have a ``checkpoint`` method (see
+    :py:meth:`.ExtendedRobotApp.checkpoint`).
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            self.checkpoint(reopen)
+            return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
 def abstract_attributes(*names):
     """Class decorator to add abstract attributes.
     """
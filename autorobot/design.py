@@ -0,0 +1,182 @@
+import logging
+import time
+import numpy as np
+
+from .checks import utilisation
+from .errors import AutoRobotValueError
+from .extensions import (
+    compile_selection,
+    selection_text,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class AutoSizer:
+    """
+    A driver sizing bars iteratively from a list of candidate sections.
+
+    Each iteration calculates the structure, extracts the forces in bulk,
+    checks every candidate section against the forces (see
+    :py:func:`.checks.utilisation`) and assigns to each bar the first
+    candidate that passes. Only the bars whose section changed are
+    reassigned, with one selection per section. The loop stops when no
+    section changes (convergence). If an assignment already tried comes up
+    again (oscillation), sections are only allowed to increase from then
+    on, which guarantees the loop ends.
+
+    :param obj app: The application instance
+    :param candidates:
+       An iterable of section names, sorted from the lightest to the
+       heaviest
+    :param bars: A valid selection string or an iterable of bar numbers
+    :param cases: A valid selection string or an iterable of case numbers
+    :param str db_name: The name of the section database (optional)
+    :param int points: The number of points checked along the bars
+    :param float limit: The limit of the utilisation ratios
+    :param float gamma_m: The partial factor of the resistance
+    :param int max_iter: The maximum number of calculations
+
+    .. tip:: The iterations are logged with the ``logging`` module and
+      recorded in :py:attr:`history`: ::
+
+            sizer = AutoSizer(rb, ['UB 203x133x25', 'UB 254x146x31'])
+            if sizer.run():
+                print(sizer.history[-1])
+    """
+
+    def __init__(self, app, candidates, bars='all', cases='all', db_name='',
+                 points=11, limit=1., gamma_m=1., max_iter=10):
+        """Constructor method."""
+        self.app = app
+        self.candidates = np.array(list(candidates), dtype=object)
+        self.bars = selection_text(bars)
+        self.cases = cases
+        self.db_name = db_name
+        self.points = points
+        self.limit = limit
+        self.gamma_m = gamma_m
+        self.max_iter = max_iter
+        #: A list of dictionaries recording each iteration
+        self.history = []
+        #: The bar numbers of the sized bars
+        self.numbers = None
+        #: The indices of the candidate sections assigned to the bars
+        self.index = None
+        #: The yield strength of the sized bars
+        self.fy = None
+        #: A selection string of the bars failing with every candidate
+        self.failing = ''
+        #: The properties of the candidate sections
+        self.catalogue = app.sections.catalogue(self.candidates, db_name)
+        if np.any(np.isnan(self.catalogue['AX'])):
+            missing = self.candidates[np.isnan(self.catalogue['AX'])]
+            raise AutoRobotValueError(
+                f"Sections not found in database: {list(missing)}.")
+
+    @property
+    def sections(self):
+        """The names of the sections assigned to the bars."""
+        return self.candidates[self.index]
+
+    def run(self):
+        """Runs the sizing loop.
+
+        :return: ``True`` if the sections converged, ``False`` otherwise
+        """
+        self._read_labels()
+        seen = {self.index.tobytes()}
+        only_up = False
+        for iteration in range(1, self.max_iter + 1):
+            record = {'iteration': iteration}
+            start = time.perf_counter()
+            self.app.calculate(wait=True).result()
+            record['solve'] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            forces, _, numbers = self.app.results.bar_forces(
+                self.numbers, self.cases, self.points)
+            record['extract'] = time.perf_counter() - start
+            record['result_rows'] = int(np.prod(forces.shape[:-1]))
+            if not np.array_equal(numbers, self.numbers):
+                raise AutoRobotValueError("Missing forces for some bars.")
+
+            start = time.perf_counter()
+            required = self._required(forces)
+            record['check'] = time.perf_counter() - start
+
+            unchanged = np.array_equal(required, self.index)
+            if not unchanged and (only_up or required.tobytes() in seen):
+                # Going back to a previous assignment: only increase
+                only_up = True
+                required = np.maximum(required, self.index)
+            record['oscillation'] = only_up
+            seen.add(required.tobytes())
+
+            start = time.perf_counter()
+            changed = required != self.index
+            record['changed'] = int(changed.sum())
+            record['label_writes'] = self._assign(
+                self.numbers[changed], required[changed])
+            self.index = required
+            record['assign'] = time.perf_counter() - start
+
+            self.history.append(record)
+            logger.info(
+                "Iteration %(iteration)d: %(changed)d bars changed "
+                "(solve %(solve).2fs, extract %(extract).2fs, "
+                "%(result_rows)d result rows, "
+                "%(label_writes)d label writes)", record)
+            if not record['changed']:
+                return True
+        return False
+
+    def _read_labels(self):
+        """Reads the bars, their sections and the yield strength once."""
+        table, names = self.app.bars.label_table(self.bars)
+        table = table[np.argsort(table['bar'])]
+        self.numbers = table['bar']
+        position = {name: i for i, name in enumerate(self.candidates)}
+        index = np.array([position.get(n, -1) for n in names['section']])
+        index = index[table['section']]
+        fy = np.array([np.nan] + [
+            self.app.materials.get(name).RE
+            for name in names['material'][1:]
+        ])
+        self.fy = fy[table['material']]
+        # Bars without a candidate section start from the lightest one
+        self.index = np.maximum(index, 0)
+        self._assign(self.numbers[index < 0], self.index[index < 0])
+
+    def _required(self, forces):
+        """Returns the index of the first passing candidate of each bar."""
+        fields = [f for f in self.catalogue.dtype.names if f != 'name']
+        props = np.empty(len(self.numbers), dtype=[
+            (f, float) for f in fields + ['fy']])
+        props['fy'] = self.fy
+        passing = np.empty((len(self.candidates), len(self.numbers)), bool)
+        for k, candidate in enumerate(self.catalogue):
+            for field in fields:
+                props[field] = candidate[field]
+            ratios = utilisation(forces, props, self.gamma_m)
+            ratios = np.moveaxis(ratios, 1, 0).reshape(len(self.numbers), -1)
+            passing[k] = np.all(ratios <= self.limit, axis=1)
+        required = np.where(passing.any(axis=0), passing.argmax(axis=0),
+                            len(self.candidates) - 1)
+        self.failing = compile_selection(self.numbers[~passing.any(axis=0)])
+        return required
+
+    def _assign(self, numbers, index):
+        """Assigns the candidate sections to bars, grouped by section.
+
+        :return: The number of label assignments
+        """
+        if not len(numbers):
+            return 0
+        names = self.candidates[index]
+        for name in np.unique(names):
+            if not self.app.sections.exist(name):
+                self.app.sections.load(name, self.db_name)
+        self.app.sections.set_groups(numbers, names.astype(str))
+        return len(np.unique(names))
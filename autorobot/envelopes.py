@@ -0,0 +1,154 @@
+import numpy as np
+
+from .errors import AutoRobotValueError
+
+
+class Envelope:
+    """
+    An envelope of results, updated incrementally with chunks of cases.
+
+    The results are arrays whose first axis are the cases, e.g. bar forces
+    of shape (cases, bars, points, 6). For each entry of the other axes, the
+    envelope keeps the maximum and the minimum over the cases folded so far
+    and the number of the governing case. If the envelope tracks concurrent
+    values, it also keeps all the components (last axis) of the governing
+    case, e.g. the axial force concurrent with the maximum bending moment.
+
+    :param components:
+       The names of the components of the last axis of the results, e.g.
+       ``list(bar_force_ids)`` (optional)
+    :param bool concurrent: Whether to keep the concurrent values
+    :param tuple shape:
+       The shape of the results of one case, to initialize the envelope
+       before any update (optional)
+
+    .. tip:: The envelope can be folded as the results are extracted: ::
+
+            env = Envelope(list(bar_force_ids))
+            for forces, cases, bars in rb.results.iter_results(
+                    'bar_forces', by='cases'):
+                env.update(forces, cases)
+            n_with_my_max = env.concurrent('MY', 'FX')
+    """
+
+    def __init__(self, components=None, concurrent=True, shape=None):
+        """Constructor method."""
+        self.components = list(components) if components else None
+        self.is_concurrent = concurrent
+        #: The maxima (``NaN`` where no result was folded)
+        self.maxima = None
+        #: The minima (``NaN`` where no result was folded)
+        self.minima = None
+        #: The numbers of the cases giving the maxima (``0`` if none)
+        self.max_cases = None
+        #: The numbers of the cases giving the minima (``0`` if none)
+        self.min_cases = None
+        #: The values concurrent with the maxima (one more axis)
+        self.max_concurrent = None
+        #: The values concurrent with the minima (one more axis)
+        self.min_concurrent = None
+        if shape is not None:
+            self._initialize(tuple(shape))
+
+    @property
+    def is_empty(self):
+        """Whether no results were folded into the envelope."""
+        return self.maxima is None
+
+    def update(self, results, cases):
+        """Folds a chunk of results into the envelope.
+
+        :param numpy.ndarray results: The results with the cases first
+        :param cases: The numbers of the cases of the chunk
+        :return: The envelope itself
+        """
+        results = np.asarray(results, dtype=float)
+        cases = np.asarray(cases, dtype=int)
+        if results.shape[:1] != cases.shape:
+            raise AutoRobotValueError(
+                "There must be one case number per result.")
+        if not cases.size:
+            return self
+        if self.is_empty:
+            self._initialize(results.shape[1:])
+        nan = np.isnan(results)
+        self._fold(results, cases, np.where(nan, -np.inf, results).argmax(0),
+                   np.greater, self.maxima, self.max_cases,
+                   self.max_concurrent)
+        self._fold(results, cases, np.where(nan, np.inf, results).argmin(0),
+                   np.less, self.minima, self.min_cases,
+                   self.min_concurrent)
+        return self
+
+    def merge(self, other):
+        """Folds another envelope of the same results into the envelope.
+
+        :param Envelope other: Another envelope, e.g. from another process
+        :return: The envelope itself
+        """
+        if other.is_empty:
+            return self
+        if self.is_concurrent and not other.is_concurrent:
+            raise AutoRobotValueError(
+                "Can't merge an envelope without concurrent values.")
+        if self.is_empty:
+            self._initialize(other.maxima.shape)
+        for extreme, compare in (('max', np.greater), ('min', np.less)):
+            values = getattr(self, f'{extreme}ima')
+            others = getattr(other, f'{extreme}ima')
+            better = compare(others, values) | (
+                np.isnan(values) & ~np.isnan(others))
+            values[better] = others[better]
+            cases = getattr(self, f'{extreme}_cases')
+            cases[better] = getattr(other, f'{extreme}_cases')[better]
+            if self.is_concurrent:
+                concurrent = getattr(self, f'{extreme}_concurrent')
+                concurrent[better] = getattr(
+                    other, f'{extreme}_concurrent')[better]
+        return self
+
+    def concurrent(self, component, other, extreme='max'):
+        """Returns the values concurrent with the extreme of a component.
+
+        :param component:
+           The name or the index of the enveloped component, e.g. ``'MY'``
+        :param other:
+           The name or the index of the concurrent component, e.g. ``'FX'``
+        :param str extreme: ``'max'`` or ``'min'``
+        :return: An array of the concurrent values
+        """
+        if not self.is_concurrent:
+            raise AutoRobotValueError("The envelope has no concurrent values.")
+        i, j = (self._index(c) for c in (component, other))
+        return getattr(self, f'{extreme}_concurrent')[..., i, j]
+
+    def _index(self, component):
+        """Returns the index of a component given by its name or index."""
+        if isinstance(component, str):
+            if not self.components or component not in self.components:
+                raise AutoRobotValueError(f"Unknown component '{component}'.")
+            return self.components.index(component)
+        return int(component)
+
+    def _initialize(self, shape):
+        """Initializes the envelope for results of a given shape."""
+        self.maxima = np.full(shape, np.nan)
+        self.minima = np.full(shape, np.nan)
+        self.max_cases = np.zeros(shape, dtype=int)
+        self.min_cases = np.zeros(shape, dtype=int)
+        if self.is_concurrent:
+            self.max_concurrent = np.full(shape + shape[-1:], np.nan)
+            self.min_concurrent = np.full(shape + shape[-1:], np.nan)
+
+    def _fold(self, results, cases, index, compare, values, governing,
+              concurrent):
+        """Folds the extremes of a chunk into the envelope, in place."""
+        extreme = np.take_along_axis(results, index[None], 0)[0]
+        better = compare(extreme, values) | (
+            np.isnan(values) & ~np.isnan(extreme))
+        values[better] = extreme[better]
+        governing[better] = cases[index[better]]
+        if concurrent is not None:
+            rows = np.take_along_axis(
+                results[..., None, :], index[None, ..., None], 0)[0]
+            concurrent[better] = rows[better]
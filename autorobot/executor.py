@@ -0,0 +1,235 @@
+import inspect
+import numbers
+import queue
+import threading
+from concurrent.futures import Executor, Future
+
+import numpy as np
+
+import clr  # NOQA F401
+from System.Threading import (
+    ApartmentState,
+    Thread,
+    ThreadStart,
+)
+
+
+class ComExecutor(Executor):
+    """
+    An executor running all its calls on a single STA thread.
+
+    COM objects must be used from the thread which created them. The
+    executor owns one .NET thread in a single-threaded apartment and runs the
+    submitted calls one at a time, in order, on that thread. A call submitted
+    from the executor thread itself is run at once to avoid a deadlock.
+
+    :param str name: The name of the thread
+
+    .. tip:: The executor is used by the application when initialized with
+      ``threaded=True``: ::
+
+            rb = initialize(visible=False, interactive=False, threaded=True)
+            table = await rb.nodes.table_async('all')
+    """
+
+    def __init__(self, name='autorobot-com'):
+        """Constructor method."""
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._ident = None
+        started = threading.Event()
+
+        def run():
+            self._ident = threading.get_ident()
+            started.set()
+            self._work()
+
+        self._thread = Thread(ThreadStart(run))
+        self._thread.Name = name
+        self._thread.IsBackground = True
+        self._thread.SetApartmentState(ApartmentState.STA)
+        self._thread.Start()
+        started.wait()
+
+    @property
+    def on_thread(self):
+        """Whether the caller is running on the executor thread."""
+        return threading.get_ident() == self._ident
+
+    def submit(self, fn, /, *args, **kwargs):
+        """Schedules a call on the executor thread.
+
+        :param fn: The callable to run
+        :return: A ``concurrent.futures.Future`` of the call
+        """
+        future = Future()
+        if self.on_thread:
+            self._run(future, fn, args, kwargs)
+            return future
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(
+                    "Can't schedule new calls after shutdown.")
+            self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def call(self, fn, /, *args, **kwargs):
+        """Runs a call on the executor thread and waits for its result.
+
+        :param fn: The callable to run
+        :return: The result of the call
+        """
+        return self.submit(fn, *args, **kwargs).result()
+
+    def wrap(self, value):
+        """Returns a value which can be used on the calling thread.
+
+        On the executor thread, the value is returned as is. On another
+        thread, the objects which may hold COM objects are wrapped in a
+        :py:class:`ComProxy`, recursively in tuples, lists and dictionaries.
+        Numbers, strings, arrays, futures and awaitables are returned as is.
+
+        :param value: A value returned by a call on the executor thread
+        """
+        if self.on_thread or _plain(value):
+            return value
+        if isinstance(value, (tuple, list)):
+            return type(value)(self.wrap(v) for v in value)
+        if isinstance(value, dict):
+            return {k: self.wrap(v) for k, v in value.items()}
+        return ComProxy(value, self)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        """Stops the executor thread once the pending calls are done.
+
+        :param bool wait: Whether to wait for the thread to stop
+        :param bool cancel_futures: Whether to cancel the pending calls
+        """
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                if cancel_futures:
+                    self._cancel_pending()
+                self._queue.put(None)
+        if wait and not self.on_thread:
+            self._thread.Join()
+
+    def _work(self):
+        """Runs the queued calls until the executor shuts down."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            self._run(*item)
+
+    def _cancel_pending(self):
+        """Cancels the calls still in the queue."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[0].cancel()
+
+    @staticmethod
+    def _run(future, fn, args, kwargs):
+        """Runs a call and sets its result on the future."""
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+
+def _plain(value):
+    """Checks whether a value holds no COM object."""
+    return (
+        value is None
+        or isinstance(value, (numbers.Number, str, bytes, np.ndarray,
+                              np.generic, Future, Executor))
+        or inspect.isawaitable(value)
+    )
+
+
+class ComProxy:
+    """
+    A proxy running all the operations on an object on the executor thread.
+
+    The COM objects created on the executor thread must not be used from
+    other threads. A proxy forwards the attribute reads and writes, the
+    calls, the iterations and the context management of the wrapped object
+    to the executor, and wraps the returned values (see
+    :py:meth:`ComExecutor.wrap`). The iterations are run to completion on
+    the executor thread.
+
+    :param obj: The wrapped object
+    :param obj executor: The :py:class:`ComExecutor` owning the object
+    """
+
+    __slots__ = ('_obj', '_executor')
+
+    def __init__(self, obj, executor):
+        """Constructor method."""
+        object.__setattr__(self, '_obj', obj)
+        object.__setattr__(self, '_executor', executor)
+
+    def _call(self, func, *args, **kwargs):
+        """Runs a call on the executor thread and wraps its result."""
+        executor = self._executor
+        return executor.wrap(executor.call(func, *args, **kwargs))
+
+    def __getattr__(self, name):
+        return self._call(getattr, self._obj, name)
+
+    def __setattr__(self, name, value):
+        self._executor.call(setattr, self._obj, name, _unwrap(value))
+
+    def __call__(self, *args, **kwargs):
+        return self._call(
+            self._obj, *map(_unwrap, args),
+            **{k: _unwrap(v) for k, v in kwargs.items()})
+
+    def __iter__(self):
+        return iter(self._call(lambda: list(self._obj)))
+
+    def __len__(self):
+        return self._executor.call(len, self._obj)
+
+    def __bool__(self):
+        return self._executor.call(bool, self._obj)
+
+    def __int__(self):
+        return self._executor.call(int, self._obj)
+
+    def __float__(self):
+        return self._executor.call(float, self._obj)
+
+    def __eq__(self, other):
+        return self._executor.call(
+            lambda: self._obj == _unwrap(other))
+
+    def __hash__(self):
+        return self._executor.call(hash, self._obj)
+
+    def __enter__(self):
+        return self._call(lambda: self._obj.__enter__())
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._executor.call(
+            lambda: self._obj.__exit__(exc_type, exc_value, traceback))
+
+    def __str__(self):
+        return self._executor.call(str, self._obj)
+
+    def __repr__(self):
+        return f'<ComProxy of {self._executor.call(repr, self._obj)}>'
+
+
+def _unwrap(value):
+    """Returns the object wrapped by a proxy, or the value itself."""
+    return value._obj if isinstance(value, ComProxy) else value
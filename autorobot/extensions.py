@@ -1,5 +1,6 @@
 from abc import ABC
 from functools import wraps
+import numpy as np
 
 from .decorators import abstract_attributes
 from .errors import (
@@ -10,6 +11,66 @@ from RobotOM import (
     IRobotCollection,
     IRobotNamesArray,
 )
+from System.Runtime.InteropServices import Marshal
+
+
+def compile_selection(numbers):
+    """Compiles object numbers into a compact selection string.
+
+    Consecutive numbers are merged into ranges, for example
+    ``[1, 2, 3, 5, 7, 8]`` gives ``'1to3 5 7to8'``.
+
+    :param numbers: An iterable of object numbers
+    :return: A valid selection string
+    """
+    n = np.unique(np.asarray(numbers, dtype=int).ravel())
+    if not n.size:
+        return ''
+    breaks = np.flatnonzero(np.diff(n) != 1) + 1
+    starts = n[np.r_[0, breaks]]
+    ends = n[np.r_[breaks - 1, n.size - 1]]
+    return ' '.join(
+        str(s) if s == e else f'{s}to{e}' for s, e in zip(starts, ends)
+    )
+
+
+def selection_text(s):
+    """Returns a selection string from a string or an iterable of numbers.
+
+    :param s: A valid selection string or an iterable of object numbers
+    :return: A valid selection string
+    """
+    if isinstance(s, str):
+        return s
+    return compile_selection(s)
+
+
+def release_com(obj):
+    """Releases a COM object or the COM object of a capsule.
+
+    The reference held by the runtime callable wrapper is released at once
+    instead of when the garbage collector runs. The object must not be used
+    afterwards.
+
+    :param obj: A COM object, a :py:class:`Capsule` or ``None``
+    """
+    if isinstance(obj, Capsule):
+        obj.release()
+    elif obj is not None and Marshal.IsComObject(obj):
+        Marshal.ReleaseComObject(obj)
+
+
+def label_name(obj, ltype):
+    """Returns the name of the label of a given type assigned to an object.
+
+    The ``HasLabel`` method of the object is checked first, which avoids the
+    ``COMException`` raised by ``GetLabel`` when no label is assigned.
+
+    :param obj obj: A bar or a node object
+    :param int ltype: The label type (see :py:class:`.RLabelType`)
+    :return: The label name or an empty string if no label is assigned
+    """
+    return str(obj.GetLabelName(ltype)) if obj.HasLabel(ltype) else ''
 
 
 @abstract_attributes('_otype')
@@ -65,9 +126,57 @@ class Capsule(ABC):
         else:
             super().__setattr__(name, value)
 
+    #: Whether the COM object is released when the capsule is deleted
+    release_on_delete = False
+
+    def release(self):
+        """Releases the encapsulated COM object (see :py:func:`release_com`).
+
+        The capsule can't be used afterwards. Releasing twice does nothing.
+        """
+        inst = self.__dict__.get('_inst')
+        super().__setattr__('_inst', None)
+        release_com(inst)
+
+    def __enter__(self):
+        """Enters a context releasing the COM object on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Releases the COM object."""
+        self.release()
+
+    def __del__(self):
+        """Releases the COM object if :py:attr:`release_on_delete` is set.
+        """
+        if self.release_on_delete:
+            self.release()
+
+
+class AsyncMixin:
+    """
+    A mixin giving an awaitable version of the methods of a class.
+
+    Any method ``name`` can be awaited as ``name_async``, which runs the
+    method on the thread owning the ``RobotApplication`` (see
+    :py:meth:`.ExtendedRobotApp.run_async`). The class must have an ``app``
+    attribute referring to the application instance.
+    """
+
+    def __getattr__(self, name):
+        """Returns the awaitable version of a method ending with _async."""
+        if name.endswith('_async'):
+            func = getattr(self, name[:-len('_async')])
+
+            @wraps(func)
+            async def call(*args, **kwargs):
+                return await self.app.run_async(func, *args, **kwargs)
+            return call
+        return super().__getattr__(name)
+
 
 @abstract_attributes('_otype', '_ctype', '_dtype', '_rtype')
-class ExtendedServer(Capsule, ABC):
+class ExtendedServer(AsyncMixin, Capsule, ABC):
     """
     A class to encapsulate an RSA data server.
 
@@ -120,24 +229,35 @@ class ExtendedServer(Capsule, ABC):
                 f"{self.__class__.__name__} couldn't get id `{n}`."
             ) from e
 
-    def select(self, s, obj=True):
+    def select(self, s, obj=True, release=False):
         """
         Returns an iterator of objects referred to by numbers in a selection
         string.
 
         :param str s: A valid selection string
         :param bool obj: Whether to return the objects or their numbers.
+        :param bool release:
+           Whether to release each object when the next one is requested,
+           for a single pass over the objects which doesn't keep them
         :return: A generator of the selected objects
         """
         sel = self.app.selections.Create(self._dtype)
         sel.FromText(str(s))
-        if not obj:
-            for i in range(sel.Count):
-                yield sel.Get(i+1)
-        else:
-            col = IRobotCollection(self.GetMany(sel))
-            for i in range(col.Count):
-                yield self._rtype(self._ctype(col.Get(i+1)))
+        col = None
+        try:
+            if not obj:
+                for i in range(sel.Count):
+                    yield sel.Get(i+1)
+            else:
+                col = IRobotCollection(self.GetMany(sel))
+                for i in range(col.Count):
+                    item = self._rtype(self._ctype(col.Get(i+1)))
+                    yield item
+                    if release:
+                        release_com(item)
+        finally:
+            release_com(col)
+            release_com(sel)
 
     def delete(self, s):
         """Deletes a selection of objects.
@@ -146,8 +266,26 @@ class ExtendedServer(Capsule, ABC):
         """
         sel = self.app.selections.Create(self._dtype)
         sel.FromText(str(s))
+        if any(True for _ in self._usage_indexes()):
+            self.forget_numbers([sel.Get(i + 1) for i in range(sel.Count)])
         self.DeleteMany(sel)
 
+    def forget_numbers(self, numbers):
+        """Removes object numbers from the label usage indexes.
+
+        :param numbers: An iterable of object numbers
+        """
+        numbers = np.asarray(numbers, dtype=int).ravel()
+        for usage in self._usage_indexes():
+            for name, users in usage.items():
+                usage[name] = np.setdiff1d(users, numbers)
+
+    def _usage_indexes(self):
+        """Yields the cached label usage indexes for this type of object."""
+        for key, value in self.app.cache.items():
+            if key[:2] == ('usage', int(self._dtype)):
+                yield value
+
 
 @abstract_attributes('_otype', '_dtype')
 class ExtendedLabel(Capsule, ABC):
@@ -171,7 +309,8 @@ class ExtendedLabel(Capsule, ABC):
         return self.Name
 
 
-@abstract_attributes('_otype', '_ctype', '_ltype', '_dtype', '_rtype')
+@abstract_attributes('_otype', '_ctype', '_ltype', '_dtype', '_rtype',
+                     'objects', 'definition')
 class ExtendedLabelServer(Capsule, ABC):
     """
     A class to encapsulate an ``IRobotLabelServer`` instance.
@@ -186,6 +325,12 @@ class ExtendedLabelServer(Capsule, ABC):
         * ``_rtype``:
             The type returned by queries (e.g. ``ExtendedSupportLabel``)
 
+    It must also define the property ``objects`` returning the server of
+    the objects the labels are assigned to (e.g. ``self.app.nodes``) and the
+    method ``definition(label)`` returning a hashable definition of a label
+    as returned by :py:meth:`get`, used as the key of the
+    :py:attr:`registry`.
+
     """
 
     def __init__(self, inst, app):
@@ -199,6 +344,188 @@ class ExtendedLabelServer(Capsule, ABC):
         self.app = app
         self.server = inst
 
+    @property
+    def registry(self):
+        """
+        A dictionary mapping label definitions to label names.
+
+        The registry is built from the labels available in the structure on
+        first access and is then kept in the application cache, so that it
+        is shared by all the servers of the same label type.
+        """
+        key = ('registry', int(self._ltype))
+        if key not in self.app.cache:
+            self.app.cache[key] = {
+                self.definition(self.get(name)): name
+                for name in self.get_names()
+            }
+        return self.app.cache[key]
+
+    def lookup(self, key):
+        """Returns the name of an existing label matching a definition.
+
+        :param tuple key: A label definition
+        :return: The name of the label or ``None`` if there is no match
+        """
+        name = self.registry.get(key)
+        if name is not None and not self.exist(name):
+            del self.registry[key]
+            return None
+        return name
+
+    def register(self, key, name):
+        """Records the definition of a label in the registry.
+
+        The registry is left untouched if it hasn't been built yet.
+
+        :param tuple key: A label definition
+        :param str name: The name of the label
+        """
+        if ('registry', int(self._ltype)) in self.app.cache:
+            self.registry[key] = name
+
+    def unregister(self, name):
+        """Removes the definitions of a label from the cached data.
+
+        The label is still assigned to the same objects, so the usage index
+        is kept (see :py:meth:`forget`).
+
+        :param str name: The name of the label
+        """
+        registry = self.app.cache.get(('registry', int(self._ltype)), {})
+        for key in [k for k, v in registry.items() if v == name]:
+            del registry[key]
+        self.app.cache.get(self._properties_key, {}).pop(name, None)
+
+    def free_name(self, prefix):
+        """Returns a label name not yet used in the structure.
+
+        :param str prefix: The prefix of the name, suffixed with a number
+        """
+        i = len(self.registry) + 1
+        while self.exist(f'{prefix}{i}'):
+            i += 1
+        return f'{prefix}{i}'
+
+    def set_groups(self, numbers, names):
+        """Sets labels on objects, grouping objects sharing the same label.
+
+        One selection is compiled for each distinct label name and all the
+        assignments are made in a single multi-operation, so that the number
+        of calls to the server doesn't depend on the number of objects.
+
+        :param numbers: An iterable of object numbers
+        :param names: An iterable of label names (one per object)
+        """
+        numbers = np.asarray(numbers, dtype=int).ravel()
+        names = np.asarray(names, dtype=str).ravel()
+        with self.objects as objects:
+            for name in np.unique(names):
+                sel = self.app.selections.Create(objects._dtype)
+                sel.FromText(compile_selection(numbers[names == name]))
+                objects.SetLabel(sel, self._ltype, str(name))
+                self.update_usage(numbers[names == name], name)
+
+    @property
+    def usage(self):
+        """
+        A dictionary mapping label names to arrays of the numbers of the
+        objects each label is assigned to.
+
+        The index is built with a single scan of the objects on first access
+        and is then kept in the application cache. It is kept up to date by
+        the ``set`` and ``delete`` methods of the autoRobot servers.
+        """
+        key = self._usage_key
+        if key not in self.app.cache:
+            numbers, names = [], []
+            for obj in self.objects.select('all', release=True):
+                numbers.append(obj.Number)
+                names.append(label_name(obj, self._ltype))
+            numbers = np.array(numbers, dtype=int)
+            uniques, inverse = np.unique(
+                np.array(names, dtype=str), return_inverse=True)
+            order = np.argsort(inverse, kind='stable')
+            groups = np.split(
+                numbers[order], np.cumsum(np.bincount(inverse))[:-1])
+            self.app.cache[key] = {
+                str(name): np.sort(users)
+                for name, users in zip(uniques, groups) if name
+            }
+        return self.app.cache[key]
+
+    @property
+    def _usage_key(self):
+        """The key of the usage index in the application cache."""
+        return ('usage', int(self.objects._dtype), int(self._ltype))
+
+    @property
+    def _properties_key(self):
+        """The key of the label properties in the application cache."""
+        return ('properties', int(self._ltype))
+
+    def users(self, name):
+        """Returns the numbers of the objects a label is assigned to.
+
+        :param str name: The name of the label
+        :return: A sorted array of object numbers
+        """
+        return self.usage.get(str(name), np.array([], dtype=int))
+
+    def unused(self, func=lambda s: True):
+        """Returns the names of the labels not assigned to any object.
+
+        :param function func: A filter function
+        :return: The list of unused label names
+        """
+        usage = self.usage
+        return [name for name in self.get_names(func)
+                if not len(usage.get(name, ()))]
+
+    def prune(self, func=lambda s: True):
+        """Deletes the labels not assigned to any object.
+
+        The labels are deleted within a single multi-operation of the
+        objects server and the cached data is updated once.
+
+        :param function func: A filter function
+        :return: The list of deleted label names
+        """
+        names = self.unused(func)
+        with self.objects:
+            for name in names:
+                self.Delete(self._ltype, name)
+        self.forget_many(names)
+        return names
+
+    def track(self, sel, name):
+        """Updates the usage index after setting a label on a selection.
+
+        :param obj sel: The selection of objects (``IRobotSelection``)
+        :param str name: The name of the label
+        """
+        if self._usage_key in self.app.cache:
+            self.update_usage(
+                [sel.Get(i + 1) for i in range(sel.Count)], name)
+
+    def update_usage(self, numbers, name):
+        """Updates the usage index after setting a label on objects.
+
+        The index is left untouched if it hasn't been built yet.
+
+        :param numbers: An iterable of object numbers
+        :param str name: The name of the label
+        """
+        usage = self.app.cache.get(self._usage_key)
+        if usage is None:
+            return
+        numbers = np.asarray(numbers, dtype=int).ravel()
+        for n, users in usage.items():
+            usage[n] = np.setdiff1d(users, numbers)
+        if name:
+            usage[str(name)] = np.union1d(
+                usage.get(str(name), numbers), numbers)
+
     def get(self, name):
         """Returns the label with name **name** from the server.
 
@@ -228,6 +555,28 @@ class ExtendedLabelServer(Capsule, ABC):
         :param str name: The name of the label to delete
         """
         self.Delete(self._ltype, name)
+        self.forget(name)
+
+    def forget(self, name):
+        """Removes a label name from the cached data of the server.
+
+        :param str name: The name of the label
+        """
+        self.forget_many([name])
+
+    def forget_many(self, names):
+        """Removes label names from the cached data of the server.
+
+        :param names: An iterable of label names
+        """
+        names = set(names)
+        registry = self.app.cache.get(('registry', int(self._ltype)), {})
+        for key in [k for k, v in registry.items() if v in names]:
+            del registry[key]
+        for cache_key in (self._usage_key, self._properties_key):
+            cached = self.app.cache.get(cache_key, {})
+            for name in names:
+                cached.pop(name, None)
 
     def exist(self, name):
         """Checks whether a label with the given name exists in the structure.
@@ -1,3 +1,5 @@
+import numpy as np
+
 from .extensions import (
     ExtendedLabel,
     ExtendedLabelServer,
@@ -79,6 +81,23 @@ class ExtendedMaterialServer(ExtendedLabelServer):
     _dtype = IRobotMaterialData
     _rtype = ExtendedMaterialLabel
 
+    catalogue_fields = {
+        'E': 'E',
+        'G': 'Kirchoff',
+        'NU': 'NU',
+        'RO': 'RO',
+        'RE': 'RE',
+    }
+    """
+    The fields of the material catalogue and the corresponding attributes
+    of ``IRobotMaterialData``.
+    """
+
+    @property
+    def objects(self):
+        """The server of the bars the labels are assigned to."""
+        return self.app.bars
+
     def load(self, name):
         """Loads a material from the database.
 
@@ -91,6 +110,76 @@ class ExtendedMaterialServer(ExtendedLabelServer):
             self.Store(label)
             return self.get(name)
 
+    def load_many(self, names):
+        """Loads materials from the database, skipping existing materials.
+
+        The names are checked once against the materials of the structure
+        and the cached names of the database (see :py:meth:`get_db_names`),
+        so that only the materials to load reach the server. Each of these
+        still needs its own label and database load, the label server
+        having no bulk operation, but the labels aren't fetched back with
+        :py:meth:`get`.
+
+        :param names: An iterable of material names
+        :return: The list of names of the materials loaded
+        """
+        existing = set(self.get_names())
+        available = set(self.get_db_names())
+        loaded = []
+        for name in dict.fromkeys(str(n) for n in names):
+            if name in existing or name not in available:
+                continue
+            label = self._ctype(self.Create(self._ltype, name))
+            if self._dtype(label.Data).LoadFromDBase(name):
+                self.Store(label)
+                loaded.append(name)
+        return loaded
+
+    def catalogue(self, names=None):
+        """Returns the properties of materials from the database.
+
+        The properties are read from the database once and then kept in
+        the application cache.
+
+        :param names:
+           An iterable of material names (default: all the names in the
+           database)
+        :return:
+           A structured array with the fields ``name``, ``E``, ``G``,
+           ``NU``, ``RO`` and ``RE`` (see :py:attr:`catalogue_fields`)
+        """
+        names = self.get_db_names() if names is None else list(names)
+        rows = self.app.cache.setdefault(('catalogue', int(self._ltype)), {})
+        missing = [name for name in names if name not in rows]
+        if missing:
+            data = self._dtype(
+                self._ctype(self.Create(self._ltype, missing[0])).Data)
+            for name in missing:
+                if data.LoadFromDBase(name):
+                    rows[name] = tuple(
+                        getattr(data, attr)
+                        for attr in self.catalogue_fields.values()
+                    )
+                else:
+                    rows[name] = (np.nan,) * len(self.catalogue_fields)
+
+        table = np.empty(len(names), dtype=[('name', object)] + [
+            (field, float) for field in self.catalogue_fields])
+        table['name'] = names
+        for i, name in enumerate(names):
+            table[i] = (name, *rows[name])
+        return table
+
+    def definition(self, label):
+        """Returns the definition of a material label: its values.
+
+        :param obj label: A material label (see :py:meth:`get`)
+        """
+        return tuple(
+            getattr(label.data, attr)
+            for attr in self.catalogue_fields.values()
+        )
+
     def set(self, s, name):
         """Sets the material for a selection of bars.
 
@@ -101,14 +190,23 @@ class ExtendedMaterialServer(ExtendedLabelServer):
         sel.FromText(str(s))
         with self.app.bars as bars:
             bars.SetLabel(sel, self._ltype, str(name))
+        self.track(sel, name)
 
     def get_db_names(self, func=lambda s: True):
         """Returns the list of material names in database.
 
         :param function func: A filter function
         :return: The list of material names in the database
+
+        .. note::
+
+           The names are read from the database once and then kept in the
+           application cache.
         """
-        db = self.app.Project.Preferences.Materials
-        names = IRobotNamesArray(db.GetAll())
-        names = [names.Get(i) for i in range(1, names.Count + 1)]
-        return [name for name in names if func(name)]
+        key = ('db_names', int(self._ltype))
+        if key not in self.app.cache:
+            db = self.app.Project.Preferences.Materials
+            names = IRobotNamesArray(db.GetAll())
+            self.app.cache[key] = [
+                names.Get(i) for i in range(1, names.Count + 1)]
+        return [name for name in self.app.cache[key] if func(name)]
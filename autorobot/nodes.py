@@ -136,6 +136,35 @@ class ExtendedNodeServer(ExtendedServer):
     _dtype = ROType.NODE
     _rtype = ExtendedNode
 
+    def delete(self, s):
+        """Deletes a selection of nodes.
+
+        Robot also deletes the bars attached to the nodes, so the bar label
+        usage indexes are dropped (see :py:meth:`forget_numbers`).
+
+        :param str s: A valid selection string
+        """
+        super(ExtendedNodeServer, self).delete(s)
+        self._forget_bars()
+
+    def forget_numbers(self, numbers):
+        """Removes node numbers from the label usage indexes.
+
+        The bar label usage indexes are dropped as well, since the bars
+        attached to deleted nodes are deleted by Robot. They are built again
+        when needed.
+
+        :param numbers: An iterable of node numbers
+        """
+        super(ExtendedNodeServer, self).forget_numbers(numbers)
+        self._forget_bars()
+
+    def _forget_bars(self):
+        """Drops the cached bar label usage indexes."""
+        for key in [k for k in self.app.cache
+                    if k[:2] == ('usage', int(ROType.BAR))]:
+            del self.app.cache[key]
+
     def create(self, x, y, z, num=None, obj=True, overwrite=False):
         """Creates a new node from coordinates.
 
@@ -152,6 +181,7 @@ class ExtendedNodeServer(ExtendedServer):
         num = int(num)
         if self.Exist(num):
             if overwrite:
+                self.forget_numbers([num])
                 self.Delete(num)
             else:
                 raise AutoRobotIdError(f"Bar with id {num} already exists.")
@@ -168,7 +198,8 @@ class ExtendedNodeServer(ExtendedServer):
         :return: A 2d array with the nodes numbers and coordinates
         """
         return np.stack(
-            [np.array([n.Number, n.X, n.Y, n.Z]) for n in self.select(s)]
+            [np.array([n.Number, n.X, n.Y, n.Z])
+             for n in self.select(s, release=True)]
         )
 
     def from_array(self, a, num=None, obj=True, overwrite=False):
@@ -0,0 +1,185 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+def _timed(func, *args):
+    """Calls a function and returns its result and its duration."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+class Pipeline:
+    """
+    A pipeline running batches of models through three stages at once.
+
+    1. **generate**: the models are generated from their parameters (pure
+       Python or NumPy) in a background thread.
+    2. **robot**: each model is loaded in a new or template project,
+       calculated and its raw results extracted, on the thread owning the
+       ``RobotApplication``.
+    3. **reduce**: the raw results are reduced in a pool of threads or
+       processes.
+
+    The stages are connected by bounded queues, so that the models are
+    generated and reduced while Robot works without piling up in memory.
+
+    :param obj app: The application instance
+    :param load: A function ``load(rb, model)`` creating the model in Robot
+    :param extract:
+       A function ``extract(rb, model)`` returning the raw results of the
+       calculated model
+    :param generate:
+       A function ``generate(**params)`` returning a model from a set of
+       parameters (optional, the model is the parameters by default)
+    :param reduce:
+       A function ``reduce(raw)`` returning the reduced results (optional)
+    :param proj_type: The type of the new projects (default: ``'SHELL'``)
+    :param template:
+       The path of a project opened instead of creating a new one (optional)
+    :param directory:
+       A directory to save each calculated model as ``<index>.rtd``
+       (optional)
+    :param int size: The maximum number of items waiting between two stages
+    :param executor:
+       The executor of the reduce stage, e.g. a
+       ``concurrent.futures.ProcessPoolExecutor`` (default: a pool of 2
+       threads)
+    :param int workers:
+       The number of workers of the executor, used for its utilisation
+
+    .. tip:: The utilisation of each stage shows the bottleneck: ::
+
+            pipe = Pipeline(rb, load_frame, extract_forces, generate_frame,
+                            reduce_forces)
+            results = pipe.run([{'span': s} for s in range(5, 30)])
+            print(pipe.stats['robot']['utilisation'])
+    """
+
+    def __init__(self, app, load, extract, generate=None, reduce=None,
+                 proj_type='SHELL', template=None, directory=None, size=2,
+                 executor=None, workers=2):
+        """Constructor method."""
+        self.app = app
+        self.load = load
+        self.extract = extract
+        self.generate = generate
+        self.reduce = reduce
+        self.proj_type = proj_type
+        self.template = template
+        self.directory = None if directory is None else Path(directory)
+        self.size = size
+        self.executor = executor
+        self.workers = workers
+        #: The statistics of the last run: the ``elapsed`` time and, for each
+        #: stage, the ``count`` of items, the ``busy`` time and the
+        #: ``utilisation`` (busy time over elapsed time and workers)
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def run(self, params):
+        """Runs the models of a batch through the pipeline.
+
+        :param params:
+           An iterable of dictionaries of keyword arguments, one per model
+        :return:
+           A list of the (reduced) results, in the order of the parameters
+        """
+        params = list(params)
+        self.stats = {stage: {'count': 0, 'busy': 0.}
+                      for stage in ('generate', 'robot', 'reduce')}
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        models = queue.Queue(maxsize=self.size)
+        slots = threading.BoundedSemaphore(self.size + self.workers)
+        stop = threading.Event()
+        start = time.perf_counter()
+
+        producer = threading.Thread(
+            target=self._produce, args=(params, models, stop), daemon=True)
+        producer.start()
+        executor = self.executor or ThreadPoolExecutor(
+            self.workers, thread_name_prefix='autorobot-reduce')
+        outputs = []
+        try:
+            for _ in params:
+                index, model, error = models.get()
+                if error is not None:
+                    raise error
+                raw, busy = _timed(self.app.call, self._robot, index, model)
+                self._count('robot', busy)
+                if self.reduce is None:
+                    outputs.append(raw)
+                    continue
+                # Wait while too many results are waiting to be reduced
+                slots.acquire()
+                future = executor.submit(_timed, self.reduce, raw)
+                future.add_done_callback(lambda _: slots.release())
+                outputs.append(future)
+            if self.reduce is not None:
+                outputs = [self._collect(future) for future in outputs]
+        finally:
+            stop.set()
+            if self.executor is None:
+                executor.shutdown(cancel_futures=True)
+            producer.join()
+
+        elapsed = time.perf_counter() - start
+        self.stats['elapsed'] = elapsed
+        for stage, workers in (('generate', 1), ('robot', 1),
+                               ('reduce', self.workers)):
+            self.stats[stage]['utilisation'] = (
+                self.stats[stage]['busy'] / (elapsed * workers)
+                if elapsed else 0.)
+        return outputs
+
+    def _produce(self, params, models, stop):
+        """Generates the models and queues them (generate stage)."""
+        for index, p in enumerate(params):
+            try:
+                if self.generate is None:
+                    item = (index, p, None)
+                else:
+                    model, busy = _timed(lambda: self.generate(**p))
+                    self._count('generate', busy)
+                    item = (index, model, None)
+            except BaseException as exc:
+                item = (index, None, exc)
+            while not stop.is_set():
+                try:
+                    models.put(item, timeout=.1)
+                    break
+                except queue.Full:
+                    pass
+            if stop.is_set() or item[2] is not None:
+                return
+
+    def _robot(self, index, model):
+        """Creates, calculates and extracts a model (robot stage)."""
+        rb = self.app
+        if self.template is not None:
+            rb.open(self.template)
+        else:
+            rb.new(self.proj_type)
+        self.load(rb, model)
+        rb.calculate(wait=True).result()
+        raw = self.extract(rb, model)
+        if self.directory is not None:
+            rb.save_as(self.directory / f'{index}.rtd')
+        return raw
+
+    def _collect(self, future):
+        """Returns the result of a reduction and records it (reduce stage).
+        """
+        result, busy = future.result()
+        self._count('reduce', busy)
+        return result
+
+    def _count(self, stage, busy):
+        """Records an item done by a stage."""
+        with self._lock:
+            self.stats[stage]['count'] += 1
+            self.stats[stage]['busy'] += busy
@@ -0,0 +1,59 @@
+class RecyclePolicy:
+    """
+    A policy restarting the ``RobotApplication`` during long runs.
+
+    Robot slows down and its memory grows over long sessions. Once the
+    policy is set on :py:attr:`.ExtendedRobotApp.recycle_policy`, the
+    application is restarted (see :py:meth:`.ExtendedRobotApp.recycle`) at
+    the next safe point, i.e. a call to ``new``, ``open``, ``calculate`` or
+    ``checkpoint``, when the number of operations or the memory used by
+    Robot exceeds a limit.
+
+    :param int operations:
+       The maximum number of operations, i.e. calls made through
+       :py:meth:`.ExtendedRobotApp.call` such as getting a server (optional)
+    :param int memory:
+       The maximum working set of the Robot process in bytes (optional)
+    :param int check: The number of operations between two memory checks
+    :param directory:
+       The directory where a project without file name is saved before a
+       restart (default: the temporary directory)
+
+    .. tip:: The application is restarted every 500 models: ::
+
+            rb.recycle_policy = RecyclePolicy(operations=500 * 20)
+            for params in variants:
+                rb.new('SHELL')  # Restarts Robot first if needed
+                build(rb, **params)
+    """
+
+    def __init__(self, operations=None, memory=None, check=100,
+                 directory=None):
+        """Constructor method."""
+        self.operations = operations
+        self.memory = memory
+        self.check = check
+        self.directory = directory
+        #: The number of restarts
+        self.restarts = 0
+        self._checked = 0
+
+    def due(self, app):
+        """Checks whether the application must be restarted.
+
+        :param obj app: The application instance
+        :return: ``True`` if a limit is exceeded, ``False`` otherwise
+        """
+        if self.operations is not None and app.operations >= self.operations:
+            return True
+        if (self.memory is not None
+                and app.operations - self._checked >= self.check):
+            self._checked = app.operations
+            memory = app.memory
+            return memory is not None and memory >= self.memory
+        return False
+
+    def reset(self):
+        """Records a restart of the application."""
+        self.restarts += 1
+        self._checked = 0
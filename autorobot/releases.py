@@ -50,6 +50,13 @@ class ExtendedReleaseServer(ExtendedLabelServer):
     _dtype = IRobotBarReleaseData
     _rtype = ExtendedReleaseLabel
 
+    dofs = ('UX', 'UY', 'UZ', 'RX', 'RY', 'RZ')
+
+    @property
+    def objects(self):
+        """The server of the bars the labels are assigned to."""
+        return self.app.bars
+
     def create(self, name, start, end):
         """Creates a label defining bar end releases.
 
@@ -59,25 +66,58 @@ class ExtendedReleaseServer(ExtendedLabelServer):
             free (`start` and `end` can be a string like `111000`
             for a pin)
         """
-        input = [
-            {
-                "UX": RReleaseValues(int(start[0])),
-                "UY": RReleaseValues(int(start[1])),
-                "UZ": RReleaseValues(int(start[2])),
-                "RX": RReleaseValues(int(start[3])),
-                "RY": RReleaseValues(int(start[4])),
-                "RZ": RReleaseValues(int(start[5])),
-            },
-            {
-                "UX": RReleaseValues(int(end[0])),
-                "UY": RReleaseValues(int(end[1])),
-                "UZ": RReleaseValues(int(end[2])),
-                "RX": RReleaseValues(int(end[3])),
-                "RY": RReleaseValues(int(end[4])),
-                "RZ": RReleaseValues(int(end[5])),
-            },
-        ]
+        self._store(name, start, end)
+        return self.get(name)
+
+    def intern(self, start, end, prefix='R'):
+        """Returns the name of a release label matching a definition.
+
+        The definition is looked up in the :py:attr:`registry` and a new
+        label is only created when no existing label matches it.
+
+        :param str start, end: The releases at each end of the bar
+        :param str prefix:
+           The prefix for the name of a new label (the name is suffixed with
+           a number)
+        """
+        name = self.lookup(self.definition_key(start, end))
+        if name is None:
+            name = self.free_name(prefix)
+            self._store(name, start, end)
+        return name
+
+    def assign(self, s, start, end, prefix='R'):
+        """Sets releases matching a definition for a selection of bars.
 
+        :param str s: A valid selection string
+        :param str start, end: The releases at each end of the bar
+        :param str prefix: The prefix for the name of a new label
+        :return: The name of the release label
+        """
+        name = self.intern(start, end, prefix)
+        self.set(s, name)
+        return name
+
+    @staticmethod
+    def definition_key(start, end):
+        """Returns a hashable key for a release definition.
+
+        :param str start, end: The releases at each end of the bar
+        """
+        return tuple(''.join(str(int(v)) for v in r[:6]) for r in (start, end))
+
+    def definition(self, label):
+        """Returns the definition key of a release label.
+
+        :param obj label: A release label (see :py:meth:`get`)
+        """
+        return self.definition_key(*(
+            [getattr(IRobotBarEndReleaseData(r), dof) for dof in self.dofs]
+            for r in (label.start, label.end)
+        ))
+
+    def _store(self, name, start, end):
+        """Creates and stores a release label."""
         label = self._ctype(self.Create(self._ltype, name))
         data = self._dtype(label.Data)
         node_data = [
@@ -85,12 +125,14 @@ class ExtendedReleaseServer(ExtendedLabelServer):
             IRobotBarEndReleaseData(data.EndNode),
         ]
 
-        for data, params in zip(node_data, input):
-            for dof, val in params.items():
-                setattr(data, dof, val)
+        for data, values in zip(node_data, (start, end)):
+            for dof, val in zip(self.dofs, values):
+                setattr(data, dof, RReleaseValues(int(val)))
 
         self.StoreWithName(label, name)
-        return self.get(name)
+        # A label stored again under its name loses its former definition
+        self.unregister(name)
+        self.register(self.definition_key(start, end), name)
 
     def set(self, s, name):
         """Sets the releases for a selection of bars.
@@ -102,3 +144,4 @@ class ExtendedReleaseServer(ExtendedLabelServer):
         sel.FromText(str(s))
         with self.app.bars as bars:
             bars.SetLabel(sel, self._ltype, str(name))
+        self.track(sel, name)
@@ -0,0 +1,595 @@
+import numpy as np
+
+from .cache import ResultCache
+from .cases import ExtendedSimpleCase
+from .checks import (
+    failing,
+    utilisation,
+)
+from .constants import (
+    RComponent,
+    RQueryState,
+    RResultParam,
+    ROType,
+)
+from .envelopes import Envelope
+from .extensions import (
+    AsyncMixin,
+    Capsule,
+    compile_selection,
+    selection_text,
+)
+from .superposition import (
+    align,
+    envelope,
+    superpose,
+)
+
+from .robotom import RobotOM  # NOQA F401
+from RobotOM import (
+    IRobotResultQueryParams,
+    IRobotResultServer,
+    RobotResultRowSet,
+)
+
+
+bar_force_ids = {
+    'FX': 269,
+    'FY': 270,
+    'FZ': 271,
+    'MX': 272,
+    'MY': 273,
+    'MZ': 274,
+}
+"""
+A dictionary mapping the components of bar internal forces to the result
+ids used by result queries. The order of the dictionary gives the order of
+the components in the arrays returned by
+:py:meth:`.ExtendedResultServer.bar_forces`.
+"""
+
+displacement_ids = {
+    'UX': 234,
+    'UY': 235,
+    'UZ': 236,
+    'RX': 237,
+    'RY': 238,
+    'RZ': 239,
+}
+"""
+A dictionary mapping the components of nodal displacements to the result
+ids used by result queries (see
+:py:meth:`.ExtendedResultServer.displacements`).
+"""
+
+reaction_ids = {
+    'FX': 0,
+    'FY': 1,
+    'FZ': 2,
+    'MX': 3,
+    'MY': 4,
+    'MZ': 5,
+}
+"""
+A dictionary mapping the components of support reactions to the result ids
+used by result queries (see :py:meth:`.ExtendedResultServer.reactions`).
+"""
+
+
+def densify(keys, values):
+    """Scatters the rows returned by a result query into a dense array.
+
+    Each column of **keys** is an axis of the dense array. The numbers found
+    in a column are sorted and give the labels of the axis.
+
+    :param numpy.ndarray keys:
+       A 2d array of integers (rows × axes), e.g. case and bar numbers
+    :param numpy.ndarray values: A 2d array of values (rows × results)
+    :return:
+       A tuple ``(array, axes)`` where ``array`` has one dimension per axis
+       plus a last dimension for the results and ``axes`` is a list of the
+       sorted numbers for each axis. Entries without a row are ``NaN``.
+    """
+    keys = np.asarray(keys, dtype=int)
+    values = np.asarray(values, dtype=float)
+    axes, index = [], []
+    for column in keys.T:
+        axis, inverse = np.unique(column, return_inverse=True)
+        axes.append(axis)
+        index.append(inverse)
+    array = np.full([len(a) for a in axes] + [values.shape[1]], np.nan)
+    array[tuple(index)] = values
+    return array, axes
+
+
+class ExtendedResultServer(AsyncMixin, Capsule):
+    """
+    This class is an extension for ``IRobotResultServer`` providing
+    vectorized access to the results of the calculation.
+
+    The results are read in bulk with ``IRobotResultQueryParams`` instead of
+    one call per value, which reduces the number of COM calls by several
+    orders of magnitude on large models.
+    """
+
+    _otype = IRobotResultServer
+
+    row_bytes = 512
+    """
+    The approximate memory used by a result row while a query is read and
+    stored in arrays, including the overhead of Python objects. It is used
+    to size the chunks of :py:meth:`iter_results`.
+    """
+
+    object_servers = {
+        'bar_forces': 'bars',
+        'displacements': 'nodes',
+        'reactions': 'nodes',
+    }
+    """
+    A dictionary of the extraction methods supported by
+    :py:meth:`iter_results` and the servers of the objects they read.
+    """
+
+    components = {
+        'bar_forces': bar_force_ids,
+        'displacements': displacement_ids,
+        'reactions': reaction_ids,
+    }
+    """
+    A dictionary of the extraction methods and the result ids giving the
+    names of the components of their results.
+    """
+
+    reductions = {
+        'max': np.nanmax,
+        'min': np.nanmin,
+        'absmax': lambda a, axis: np.nanmax(np.abs(a), axis=axis),
+    }
+    """
+    A dictionary of the reductions supported by :py:meth:`reduce_results`.
+    The ``'absmax'`` reduction gives the maximum magnitude.
+    """
+
+    def __init__(self, inst, app):
+        """
+        Initializes an ``ExtendedResultServer`` instance.
+
+        :param obj inst: The server instance
+        :param obj app: The application instance
+        """
+        super(ExtendedResultServer, self).__init__(inst)
+        self.app = app
+        self.server = inst
+
+    @property
+    def disk_cache(self):
+        """
+        The on-disk cache of extracted results as an instance of
+        :py:class:`.ResultCache`. The instance is kept in the application
+        cache, with its hit and miss statistics, until the project is
+        closed.
+        """
+        return self.app.cache.setdefault(
+            ('result_cache',), ResultCache(self.app))
+
+    def cached(self, name, *args, fingerprint=None, **kwargs):
+        """Returns the result of an extraction method, using the disk cache.
+
+        :param str name:
+           The name of the method, e.g. ``'bar_forces'``, ``'displacements'``
+           or ``'reactions'``
+        :param args, kwargs: The arguments of the method
+        :param str fingerprint:
+           A fingerprint of the structure (see
+           :py:meth:`.ResultCache.fingerprint`) reused for several lookups
+        :return: The result of the method
+
+        .. tip:: The fingerprint of the structure can be computed once for
+          several extractions: ::
+
+                fingerprint = rb.results.disk_cache.fingerprint()
+                forces, cases, bars = rb.results.cached(
+                    'bar_forces', 'all', 'all', 5, fingerprint=fingerprint)
+                disp, cases, nodes = rb.results.cached(
+                    'displacements', fingerprint=fingerprint)
+        """
+        return self.disk_cache.get(
+            name, getattr(self, name), *args,
+            fingerprint=fingerprint, **kwargs
+        )
+
+    def query(self, result_ids, selections, keys, params=None):
+        """Runs a result query and returns the rows as arrays.
+
+        The query is repeated until Robot reports that no more rows are
+        available.
+
+        :param result_ids: An iterable of result ids
+        :param dict selections:
+           A dictionary mapping object types (see :py:class:`.ROType`) to
+           selection strings or iterables of object numbers
+        :param keys:
+           An iterable of result parameters read for each row (see
+           :py:class:`.RResultParam`), e.g. the case and bar numbers
+        :param dict params:
+           A dictionary of result parameters and values set on the query
+           (optional)
+        :return:
+           A tuple ``(keys, values)`` of 2d arrays with one row per result
+           row, one column per key and one column per result id
+        """
+        result_ids = [int(i) for i in result_ids]
+        keys = list(keys)
+        query = IRobotResultQueryParams(
+            self.app.Kernel.CmpntFactory.Create(RComponent.RESULT_QUERY))
+        for otype, s in selections.items():
+            sel = self.app.selections.Create(otype)
+            sel.FromText(selection_text(s))
+            query.Selection.Set(otype, sel)
+        query.ResultIds.SetSize(len(result_ids))
+        for i, result_id in enumerate(result_ids):
+            query.ResultIds.Set(i + 1, result_id)
+        for param, value in (params or {}).items():
+            query.SetParam(param, value)
+
+        rows = RobotResultRowSet()
+        row_keys, row_values = [], []
+        state = RQueryState.MORE
+        while state == RQueryState.MORE:
+            state = self.server.Query(query, rows)
+            ok = rows.MoveFirst()
+            while ok:
+                row = rows.CurrentRow
+                row_keys.append([row.GetParam(k) for k in keys])
+                row_values.append([row.GetValue(i) for i in result_ids])
+                ok = rows.MoveNext()
+        return (
+            np.array(row_keys, dtype=int).reshape(-1, len(keys)),
+            np.array(row_values, dtype=float).reshape(-1, len(result_ids)),
+        )
+
+    def bar_forces(self, bars='all', cases='all', points=3, params=None):
+        """Returns the internal forces in bars as a dense array.
+
+        :param bars:
+           A valid selection string or an iterable of bar numbers
+        :param cases:
+           A valid selection string or an iterable of case numbers
+        :param int points:
+           The number of points where forces are read along the bars
+           (equally spaced, including the ends)
+        :param dict params:
+           Additional query parameters (see :py:meth:`query`), e.g. to
+           enable multithreading
+        :return:
+           A tuple ``(forces, cases, bars)`` where ``forces`` is a 4d array
+           of shape (cases, bars, points, 6) with the components listed in
+           :py:data:`.bar_force_ids`, and ``cases``, ``bars`` are the case
+           and bar numbers of the first two axes
+
+        .. tip:: The components are easily unpacked: ::
+
+                forces, cases, bars = rb.results.bar_forces('1to10', [1, 2])
+                fx, fy, fz, mx, my, mz = np.moveaxis(forces, -1, 0)
+        """
+        keys, values = self.query(
+            bar_force_ids.values(),
+            {ROType.BAR: bars, ROType.CASE: cases},
+            (RResultParam.CASE_ID, RResultParam.BAR_ID, RResultParam.POINT),
+            {RResultParam.DIV_COUNT: int(points), **(params or {})},
+        )
+        forces, (case_nums, bar_nums, _) = densify(keys, values)
+        return forces, case_nums, bar_nums
+
+    def displacements(self, nodes='all', cases='all', params=None):
+        """Returns the displacements of nodes as a dense array.
+
+        :param nodes:
+           A valid selection string or an iterable of node numbers
+        :param cases:
+           A valid selection string or an iterable of case numbers
+        :param dict params: Additional query parameters (optional)
+        :return:
+           A tuple ``(displacements, cases, nodes)`` where ``displacements``
+           is a 3d array of shape (cases, nodes, 6) with the components
+           listed in :py:data:`.displacement_ids`
+        """
+        return self._node_results(displacement_ids, nodes, cases, params)
+
+    def reactions(self, nodes='all', cases='all', params=None):
+        """Returns the reactions at supports as a dense array.
+
+        Only the supported nodes of the selection have reactions, the
+        returned nodes are those found in the results.
+
+        :param nodes:
+           A valid selection string or an iterable of node numbers
+        :param cases:
+           A valid selection string or an iterable of case numbers
+        :param dict params: Additional query parameters (optional)
+        :return:
+           A tuple ``(reactions, cases, nodes)`` where ``reactions`` is a 3d
+           array of shape (cases, nodes, 6) with the components listed in
+           :py:data:`.reaction_ids`
+        """
+        return self._node_results(reaction_ids, nodes, cases, params)
+
+    def reaction_sums(self, cases='all'):
+        """Returns the resultant of the reactions for each load case.
+
+        The moments are taken about the origin of the global axes.
+
+        :param cases:
+           A valid selection string or an iterable of case numbers
+        :return:
+           A tuple ``(sums, cases)`` where ``sums`` is a 2d array of shape
+           (cases, 6) with the resultant forces and moments
+        """
+        reactions, case_nums, node_nums = self.reactions('all', cases)
+        if not node_nums.size:
+            return np.zeros((len(case_nums), 6)), case_nums
+        coords = self.app.nodes.table(compile_selection(node_nums))
+        coords = coords[np.argsort(coords[:, 0]), 1:]
+        reactions = np.nan_to_num(reactions)
+        forces = reactions[..., :3]
+        moments = reactions[..., 3:] + np.cross(coords, forces)
+        return (
+            np.concatenate([forces.sum(axis=1), moments.sum(axis=1)], axis=1),
+            case_nums
+        )
+
+    def equilibrium(self, cases='all'):
+        """Returns the residual forces of the global equilibrium.
+
+        The residual is the sum of the reactions and of the applied forces
+        (see :py:meth:`.ExtendedSimpleCase.applied_forces`) and should be
+        close to zero for each simple load case. The combinations are
+        skipped.
+
+        :param cases:
+           A valid selection string or an iterable of case numbers
+        :return:
+           A tuple ``(residuals, cases)`` where ``residuals`` is a 2d array
+           of shape (simple cases, 3)
+        """
+        sums, case_nums = self.reaction_sums(cases)
+        loaded = [self.app.cases.get(c) for c in case_nums]
+        simple = np.array(
+            [isinstance(c, ExtendedSimpleCase) for c in loaded], dtype=bool)
+        applied = np.array([
+            c.applied_forces() for c in loaded
+            if isinstance(c, ExtendedSimpleCase)
+        ]).reshape(-1, 3)
+        return sums[simple, :3] + applied, case_nums[simple]
+
+    def iter_results(self, name, objects='all', cases='all', by='objects',
+                     memory=2**28, **kwargs):
+        """Yields results in chunks of objects or cases.
+
+        The objects and cases are read from the selections with the
+        ``select`` method of the servers and split in chunks so that the
+        memory used by a chunk stays below a ceiling. Each chunk is read
+        with a single result query.
+
+        :param str name:
+           The extraction method (see :py:attr:`object_servers`), e.g.
+           ``'bar_forces'``
+        :param objects:
+           A valid selection string or an iterable of object numbers
+        :param cases:
+           A valid selection string or an iterable of case numbers
+        :param str by: Whether chunks are made of ``'objects'`` or ``'cases'``
+        :param int memory: The memory ceiling of a chunk in bytes
+        :param kwargs: Keyword arguments of the extraction method
+        :return:
+           A generator of tuples ``(results, cases, objects)`` as returned
+           by the extraction method for each chunk
+
+        .. tip:: The maximum bending moment of a large model is found
+          without storing all the results: ::
+
+                my_max = max(
+                    np.nanmax(forces[..., 4])
+                    for forces, _, _ in rb.results.iter_results('bar_forces')
+                )
+        """
+        server = getattr(self.app, self.object_servers[name])
+        numbers = {
+            'objects': np.fromiter(
+                server.select(selection_text(objects), obj=False), int),
+            'cases': np.fromiter(
+                self.app.cases.select(selection_text(cases), obj=False), int),
+        }
+        other = 'cases' if by == 'objects' else 'objects'
+        points = kwargs.get('points', 3) if name == 'bar_forces' else 1
+        rows = len(numbers[other]) * points
+        size = max(1, int(memory // max(1, rows * self.row_bytes)))
+        method = getattr(self, name)
+        for start in range(0, len(numbers[by]), size):
+            chunk = {
+                by: numbers[by][start:start + size],
+                other: numbers[other],
+            }
+            yield method(chunk['objects'], chunk['cases'], **kwargs)
+
+    def reduce_results(self, name, reduction='max', over='cases',
+                       objects='all', cases='all', memory=2**28, **kwargs):
+        """Reduces results over cases or objects, chunk by chunk.
+
+        The results are streamed along the other axis (see
+        :py:meth:`iter_results`) so that each chunk is reduced on its own and
+        the whole results are never stored.
+
+        :param str name: The extraction method, e.g. ``'bar_forces'``
+        :param str reduction: A reduction (see :py:attr:`reductions`)
+        :param str over: Whether to reduce over ``'cases'`` or ``'objects'``
+        :param objects:
+           A valid selection string or an iterable of object numbers
+        :param cases:
+           A valid selection string or an iterable of case numbers
+        :param int memory: The memory ceiling of a chunk in bytes
+        :param kwargs: Keyword arguments of the extraction method
+        :return:
+           A tuple ``(reduced, numbers)`` where ``reduced`` is the results
+           array without the reduced axis and ``numbers`` are the object
+           numbers (reduction over cases) or the case numbers (reduction
+           over objects) of its first axis
+        """
+        reduce = self.reductions[reduction]
+        by, axis = ('objects', 0) if over == 'cases' else ('cases', 1)
+        reduced, numbers = [], []
+        for results, case_nums, object_nums in self.iter_results(
+                name, objects, cases, by, memory, **kwargs):
+            if results.size:
+                reduced.append(reduce(results, axis=axis))
+                numbers.append(object_nums if axis == 0 else case_nums)
+        if not reduced:
+            return np.empty((0,)), np.empty((0,), dtype=int)
+        return np.concatenate(reduced), np.concatenate(numbers)
+
+    def envelope(self, name, objects='all', cases='all', concurrent=True,
+                 memory=2**28, **kwargs):
+        """Returns the envelope of results over cases.
+
+        The results are extracted by chunks of cases (see
+        :py:meth:`iter_results`) and folded into an
+        :py:class:`.Envelope` as they are extracted.
+
+        :param str name:
+           The extraction method, e.g. ``'bar_forces'`` or
+           ``'displacements'``
+        :param objects:
+           A valid selection string or an iterable of object numbers
+        :param cases:
+           A valid selection string or an iterable of case numbers
+        :param bool concurrent: Whether to keep the concurrent values
+        :param int memory: The memory ceiling of a chunk in bytes
+        :param kwargs: Keyword arguments of the extraction method
+        :return:
+           A tuple ``(envelope, objects)`` of the :py:class:`.Envelope` and
+           the object numbers
+
+        .. tip:: The axial force concurrent with the maximum bending
+          moment is given by: ::
+
+                env, bars = rb.results.envelope('bar_forces', points=11)
+                my_max, n = env.maxima[..., 4], env.concurrent('MY', 'FX')
+        """
+        env = Envelope(self.components[name], concurrent)
+        object_nums = np.empty((0,), dtype=int)
+        for results, case_nums, object_nums in self.iter_results(
+                name, objects, cases, 'cases', memory, **kwargs):
+            env.update(results, case_nums)
+        return env, object_nums
+
+    def utilisation(self, bars='all', cases='all', points=11, limit=1.,
+                    gamma_m=1., forces=None):
+        """Returns the utilisation ratios of bars for a set of cases.
+
+        The forces of all the bars, cases and points are checked in one
+        vectorized pass (see :py:func:`.checks.utilisation`) against the
+        properties of the bars (see
+        :py:meth:`.ExtendedBarServer.property_table`).
+
+        :param bars:
+           A valid selection string or an iterable of bar numbers
+        :param cases:
+           A valid selection string or an iterable of case numbers
+        :param int points: The number of points along the bars
+        :param float limit: The limit of the ratios
+        :param float gamma_m: The partial factor of the resistance
+        :param tuple forces:
+           The tuple ``(forces, cases, bars)`` returned by
+           :py:meth:`bar_forces` or :py:meth:`superpose` to check results
+           already extracted (optional)
+        :return:
+           A tuple ``(ratios, cases, bars, failing)`` where ``ratios`` has
+           the shape (cases, bars, points, 2) (see
+           :py:func:`.checks.utilisation`) and ``failing`` is a selection
+           string of the bars with a ratio above the limit
+        """
+        if forces is None:
+            forces = self.bar_forces(bars, cases, points)
+        forces, case_nums, bar_nums = forces
+        props = self.app.bars.property_table(compile_selection(bar_nums))
+        props = props[np.argsort(props['bar'])]
+        ratios = utilisation(forces, props, gamma_m)
+        return ratios, case_nums, bar_nums, failing(ratios, bar_nums, limit)
+
+    def superpose(self, name, objects='all', combs='all', out=None,
+                  block=256, **kwargs):
+        """Returns the results of linear combinations by superposition.
+
+        The factors of the combinations are read with
+        :py:meth:`.ExtendedCaseServer.combination_matrix` and the results of
+        the simple cases with the extraction method, then the results of
+        all the combinations are computed as one matrix product (see
+        :py:func:`.superposition.superpose`). Robot doesn't need to
+        calculate the combinations.
+
+        :param str name: The extraction method, e.g. ``'bar_forces'``
+        :param objects:
+           A valid selection string or an iterable of object numbers
+        :param combs:
+           A valid selection string or an iterable of combination numbers
+        :param out:
+           An array or a path for a ``numpy.memmap`` to store the results
+           (optional)
+        :param int block: The number of combinations computed at once
+        :param kwargs: Keyword arguments of the extraction method
+        :return:
+           A tuple ``(results, combs, objects)`` where the first axis of
+           ``results`` are the combinations
+        """
+        matrix, results, comb_nums, object_nums = self._simple_results(
+            name, objects, combs, **kwargs)
+        return (superpose(matrix, results, out, block),
+                comb_nums, object_nums)
+
+    def combination_envelope(self, name, objects='all', combs='all',
+                             block=256, **kwargs):
+        """Returns the envelope of linear combinations by superposition.
+
+        The results of the combinations are computed by blocks and folded
+        into the envelope (see :py:func:`.superposition.envelope`).
+
+        :param str name: The extraction method, e.g. ``'bar_forces'``
+        :param objects:
+           A valid selection string or an iterable of object numbers
+        :param combs:
+           A valid selection string or an iterable of combination numbers
+        :param int block: The number of combinations computed at once
+        :param kwargs: Keyword arguments of the extraction method
+        :return:
+           A tuple ``(maxima, minima, max_combs, min_combs, objects)``
+           where ``max_combs`` and ``min_combs`` are the numbers of the
+           governing combinations (``0`` where there's no result)
+        """
+        matrix, results, comb_nums, object_nums = self._simple_results(
+            name, objects, combs, **kwargs)
+        maxima, minima, imax, imin = envelope(matrix, results, block)
+        governing = np.r_[comb_nums, 0]
+        return (maxima, minima, governing[imax], governing[imin],
+                object_nums)
+
+    def _simple_results(self, name, objects, combs, **kwargs):
+        """Returns the factor matrix aligned with simple case results."""
+        matrix, comb_nums, case_nums = self.app.cases.combination_matrix(
+            selection_text(combs), sparse=True)
+        used = case_nums[matrix.getnnz(axis=0) > 0]
+        results, result_cases, object_nums = getattr(self, name)(
+            objects, used, **kwargs)
+        matrix = align(matrix, case_nums, result_cases)
+        return matrix, results, comb_nums, object_nums
+
+    def _node_results(self, result_ids, nodes, cases, params):
+        """Returns nodal results as a dense array (cases, nodes, results)."""
+        keys, values = self.query(
+            result_ids.values(),
+            {ROType.NODE: nodes, ROType.CASE: cases},
+            (RResultParam.CASE_ID, RResultParam.NODE_ID),
+            params,
+        )
+        results, (case_nums, node_nums) = densify(keys, values)
+        return results, case_nums, node_nums
@@ -1,3 +1,5 @@
+import numpy as np
+
 from .constants import (
     RLabelType,
     ROType,
@@ -117,6 +119,97 @@ class ExtendedSectionServer(ExtendedLabelServer):
     _dtype = IRobotBarSectionData
     _rtype = ExtendedSectionLabel
 
+    property_fields = {
+        'AX': IRobotBarSectionDataValue.I_BSDV_AX,
+        'AY': IRobotBarSectionDataValue.I_BSDV_AY,
+        'AZ': IRobotBarSectionDataValue.I_BSDV_AZ,
+        'IX': IRobotBarSectionDataValue.I_BSDV_IX,
+        'IY': IRobotBarSectionDataValue.I_BSDV_IY,
+        'IZ': IRobotBarSectionDataValue.I_BSDV_IZ,
+        'WY': IRobotBarSectionDataValue.I_BSDV_WY,
+        'WZ': IRobotBarSectionDataValue.I_BSDV_WZ,
+        'WEIGHT': IRobotBarSectionDataValue.I_BSDV_WEIGHT,
+    }
+    """
+    The fields of the section property tables and the corresponding values
+    of ``IRobotBarSectionData``.
+    """
+
+    @property
+    def objects(self):
+        """The server of the bars the labels are assigned to."""
+        return self.app.bars
+
+    def properties(self, names=None):
+        """Returns the properties of the sections defined in the model.
+
+        The properties of a section label are read once and then kept in
+        the application cache until the label is created or loaded again.
+
+        :param names:
+           An iterable of section names (default: all the section labels)
+        :return:
+           A structured array with the field ``name`` and the fields of
+           :py:attr:`property_fields`. The properties of unknown sections
+           are ``NaN``.
+        """
+        names = self.get_names() if names is None else list(names)
+        rows = self.app.cache.setdefault(self._properties_key, {})
+        for name in names:
+            if name not in rows:
+                rows[name] = (
+                    self._values(self.get(name).data) if self.exist(name)
+                    else (np.nan,) * len(self.property_fields)
+                )
+        return self._table(names, rows)
+
+    def catalogue(self, names, db_name=''):
+        """Returns the properties of sections from a database.
+
+        The properties are read from the database once and then kept in
+        the application cache. The sections are not added to the model.
+
+        :param names: An iterable of section names
+        :param str db_name: The name of the database to use for lookup
+        :return:
+           A structured array like :py:meth:`properties`. The properties of
+           the sections missing from the database are ``NaN``.
+        """
+        names = list(names)
+        rows = self.app.cache.setdefault(
+            ('catalogue', int(self._ltype), db_name), {})
+        missing = [name for name in names if name not in rows]
+        if missing:
+            data = self._dtype(
+                self._ctype(self.Create(self._ltype, missing[0])).Data)
+            for name in missing:
+                success = (data.LoadFromDBase2(name, db_name) if db_name
+                           else data.LoadFromDBase(name))
+                rows[name] = (
+                    self._values(data) if success
+                    else (np.nan,) * len(self.property_fields)
+                )
+        return self._table(names, rows)
+
+    def definition(self, label):
+        """Returns the definition of a section label: its property values.
+
+        :param obj label: A section label (see :py:meth:`get`)
+        """
+        return self._values(label.data)
+
+    def _values(self, data):
+        """Returns the values of the property fields of section data."""
+        return tuple(data.GetValue(v) for v in self.property_fields.values())
+
+    def _table(self, names, rows):
+        """Returns a property table from a dictionary of rows."""
+        table = np.empty(len(names), dtype=[('name', object)] + [
+            (field, float) for field in self.property_fields])
+        for i, name in enumerate(names):
+            table[i] = (name, *rows[name])
+        return table
+
     def create(self, name, h, w=0., t=0., shape='round', is_solid=True,
                material='', unit=1e-3):
         """Creates a custom section.
@@ -187,6 +280,7 @@ class ExtendedSectionServer(ExtendedLabelServer):
 
         data.CalcNonstdGeometry()
         self.StoreWithName(label, name)
+        self.app.cache.get(self._properties_key, {}).pop(name, None)
         return self.get(name)
 
     def set(self, s, name):
@@ -199,6 +293,7 @@ class ExtendedSectionServer(ExtendedLabelServer):
         sel.FromText(str(s))
         with self.app.bars as bars:
             bars.SetLabel(sel, self._ltype, str(name))
+        self.track(sel, name)
 
     def db_list(self, func=lambda s: True):
         """Returns the list of section database names.
@@ -247,4 +342,5 @@ class ExtendedSectionServer(ExtendedLabelServer):
             success = data.LoadFromDBase(name)
         if success:
             self.Store(label)
+            self.app.cache.get(self._properties_key, {}).pop(name, None)
             return self.get(name)
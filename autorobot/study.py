@@ -0,0 +1,291 @@
+import logging
+import multiprocessing
+import os
+import queue
+import time
+import traceback
+from collections import Counter, deque
+from itertools import count
+from pathlib import Path
+import numpy as np
+
+from .envelopes import Envelope
+
+logger = logging.getLogger(__name__)
+
+
+def _save(file, arrays):
+    """Writes arrays to a ``.npz`` file atomically."""
+    temp = file.with_suffix('.tmp')
+    with open(temp, 'wb') as f:
+        if isinstance(arrays, dict):
+            np.savez_compressed(f, **arrays)
+        else:
+            np.savez_compressed(
+                f, *(arrays if isinstance(arrays, tuple) else (arrays,)))
+    os.replace(temp, file)
+
+
+def _kill(process_id):
+    """Kills a Robot process left running by a worker."""
+    from System.Diagnostics import Process
+
+    if process_id is None:
+        return
+    try:
+        process = Process.GetProcessById(process_id)
+        if process.ProcessName.lower() == 'robot':
+            process.Kill()
+    except Exception:
+        # The process already exited
+        pass
+
+
+def _work(wid, build, extract, directory, tasks, results):
+    """Runs the tasks of a worker process with its own Robot instance."""
+    from .app import initialize
+
+    rb = initialize(visible=False, interactive=False)
+    try:
+        results.put(('ready', wid, None, rb.process_id))
+        while True:
+            item = tasks.get()
+            if item is None:
+                break
+            index, params = item
+            start = time.perf_counter()
+            try:
+                build(rb, **params)
+                rb.calculate(wait=True).result()
+                file = Path(directory) / f'{index}.npz'
+                _save(file, extract(rb, **params))
+            except Exception:
+                results.put(('error', wid, index, traceback.format_exc()))
+            else:
+                results.put(('done', wid, index,
+                             (str(file), time.perf_counter() - start)))
+    finally:
+        rb.quit(save=False)
+
+
+class Study:
+    """
+    A parametric study run by a pool of processes, each with its own
+    ``RobotApplication``.
+
+    Each task builds a model from a set of parameters, calculates it and
+    extracts results which are stored in a ``.npz`` file named after the
+    index of the task. A task raising an exception is reported by its
+    worker, which goes on with the next task. A worker which dies, whose
+    Robot process exits, which hangs longer than the timeout or which
+    doesn't start in time is replaced by a new one, its Robot process being
+    killed. The failed tasks are tried again, up to a number of retries.
+
+    :param build:
+       A function ``build(rb, **params)`` creating the model in the
+       application ``rb``, e.g. starting with ``rb.new('SHELL')``
+    :param extract:
+       A function ``extract(rb, **params)`` returning the results of the
+       calculated model as an array, a tuple of arrays or a dictionary of
+       arrays
+    :param directory: The directory of the result files
+    :param int workers:
+       The number of worker processes (default: the number of CPUs)
+    :param float timeout:
+       The maximum duration of a task in seconds, from its dispatch to a
+       worker (optional)
+    :param int retries: The number of times a task is tried again
+    :param float startup_timeout:
+       The maximum time in seconds for a worker to start Robot (default:
+       300)
+
+    .. note:: The worker processes are spawned, so **build** and **extract**
+      must be defined at the top level of a module and the study must be run
+      under ``if __name__ == '__main__':``.
+
+    .. tip:: The results are loaded from the result files: ::
+
+            study = Study(build_frame, extract_forces, 'results', workers=8)
+            files = study.run([{'span': s} for s in range(5, 30)])
+            forces = study.load(0)
+    """
+
+    def __init__(self, build, extract, directory, workers=None, timeout=None,
+                 retries=2, startup_timeout=300.):
+        """Constructor method."""
+        self.build = build
+        self.extract = extract
+        self.directory = Path(directory)
+        self.workers = workers or os.cpu_count()
+        self.timeout = timeout
+        self.retries = retries
+        self.startup_timeout = startup_timeout
+        #: The error messages of the tasks which failed, by index
+        self.failures = {}
+        #: The durations of the tasks done in seconds, by index
+        self.durations = {}
+        #: The number of workers replaced
+        self.restarts = 0
+        self._context = multiprocessing.get_context('spawn')
+
+    def run(self, params, poll=.5):
+        """Runs the tasks of the study.
+
+        :param params:
+           An iterable of dictionaries of keyword arguments, one per task
+        :param float poll:
+           The interval in seconds between two checks of the workers
+        :return:
+           A list of the paths of the result files, ``None`` for the tasks
+           which failed
+        :raise RuntimeError:
+           If the workers fail to start Robot more than **retries** times in
+           a row
+        """
+        from .app import _exited
+
+        params = list(params)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.failures.clear()
+        self.durations.clear()
+        self.restarts = 0
+        files = [None] * len(params)
+        pending = deque(range(len(params)))
+        attempts = Counter()
+        results = self._context.Queue()
+        workers = {}
+        # The spawn time of the workers which are not ready yet
+        spawned = {}
+        # The id of the Robot process of the ready workers (None if unknown)
+        robots = {}
+        # The task index and its dispatch time per busy worker
+        busy = {}
+        # Workers get new ids so that messages of replaced ones are ignored
+        ids = count()
+        failed_starts = 0
+
+        def start():
+            wid = next(ids)
+            tasks = self._context.Queue()
+            process = self._context.Process(
+                target=_work, daemon=True,
+                args=(wid, self.build, self.extract, self.directory, tasks,
+                      results))
+            process.start()
+            workers[wid] = (process, tasks)
+            spawned[wid] = time.monotonic()
+
+        def fail(index, reason):
+            attempts[index] += 1
+            if attempts[index] > self.retries:
+                self.failures[index] = reason
+                logger.warning("Task %d failed: %s", index, reason)
+            else:
+                pending.appendleft(index)
+
+        def replace(wid, reason):
+            nonlocal failed_starts
+            process, _ = workers.pop(wid)
+            if process.is_alive():
+                process.terminate()
+            process.join()
+            _kill(robots.pop(wid, None))
+            if spawned.pop(wid, None) is not None:
+                failed_starts += 1
+                if failed_starts > self.retries:
+                    raise RuntimeError(
+                        f"The workers couldn't start Robot: {reason}")
+            if wid in busy:
+                fail(busy.pop(wid)[0], reason)
+            logger.warning("Worker %d replaced: %s", wid, reason)
+            self.restarts += 1
+            if pending:
+                start()
+
+        for _ in range(min(self.workers, len(params))):
+            start()
+        try:
+            while pending or busy:
+                now = time.monotonic()
+                for wid, (process, _) in list(workers.items()):
+                    if not process.is_alive():
+                        replace(wid, f"Worker exited with code "
+                                     f"{process.exitcode}.")
+                    elif (wid in spawned
+                          and now - spawned[wid] > self.startup_timeout):
+                        replace(wid, "Startup timeout.")
+                    elif (robots.get(wid) is not None
+                          and _exited(robots[wid])):
+                        replace(wid, "Robot exited.")
+                    elif (wid in busy and self.timeout is not None
+                          and now - busy[wid][1] > self.timeout):
+                        replace(wid, "Timeout.")
+                for wid, (_, tasks) in workers.items():
+                    if wid in robots and wid not in busy and pending:
+                        index = pending.popleft()
+                        busy[wid] = (index, time.monotonic())
+                        tasks.put((index, params[index]))
+                try:
+                    kind, wid, index, data = results.get(timeout=poll)
+                except queue.Empty:
+                    continue
+                if wid not in workers:
+                    # A message of a replaced worker
+                    continue
+                if kind == 'ready':
+                    del spawned[wid]
+                    robots[wid] = data
+                    failed_starts = 0
+                elif kind == 'error':
+                    del busy[wid]
+                    fail(index, data)
+                elif kind == 'done':
+                    files[index], self.durations[index] = data
+                    del busy[wid]
+                    logger.info("Task %d done in %.2fs", index, data[1])
+        finally:
+            for process, tasks in workers.values():
+                tasks.put(None)
+            for wid, (process, _) in workers.items():
+                process.join(timeout=60)
+                if process.is_alive():
+                    process.terminate()
+                    _kill(robots.get(wid))
+        return files
+
+    def load(self, index):
+        """Loads the results of a task.
+
+        :param int index: The index of the task
+        :return:
+           A dictionary of arrays if the results were given as a dictionary,
+           the array or the tuple of arrays otherwise
+        """
+        with np.load(self.directory / f'{index}.npz',
+                     allow_pickle=False) as data:
+            if all(name.startswith('arr_') for name in data.files):
+                arrays = tuple(
+                    data[f'arr_{i}'] for i in range(len(data.files)))
+                return arrays if len(arrays) > 1 else arrays[0]
+            return {name: data[name] for name in data.files}
+
+    def envelope(self, name, indices=None, **kwargs):
+        """Returns the envelope of a result over the tasks.
+
+        The governing cases of the envelope are the task numbers, i.e. the
+        task indices plus one.
+
+        :param str name:
+           The name of the result in the dictionaries returned by
+           **extract**, the results of a task having the cases first
+        :param indices:
+           The indices of the tasks (default: all the tasks done)
+        :param kwargs: Keyword arguments passed to :py:class:`.Envelope`
+        :return: An instance of :py:class:`.Envelope`
+        """
+        env = Envelope(**kwargs)
+        indices = sorted(self.durations) if indices is None else indices
+        for index in indices:
+            results = self.load(index)[name]
+            env.update(results, np.full(len(results), index + 1))
+        return env
@@ -0,0 +1,103 @@
+import os
+import numpy as np
+from scipy import sparse as sci_sparse
+
+from .envelopes import Envelope
+from .errors import AutoRobotValueError
+
+
+def align(matrix, cases, result_cases):
+    """Reorders the columns of a factor matrix to match result arrays.
+
+    :param matrix:
+       A factor matrix (combinations × load cases), dense or sparse
+    :param cases: The load case numbers of the columns of the matrix
+    :param result_cases: The load case numbers of the results
+    :return: A sparse matrix (combinations × result cases)
+    :raise AutoRobotValueError:
+       If a load case with a factor is missing from the results
+    """
+    matrix = sci_sparse.coo_matrix(matrix)
+    cases = np.asarray(cases, dtype=int)
+    result_cases = np.asarray(result_cases, dtype=int)
+    position = {c: j for j, c in enumerate(result_cases)}
+    columns = np.array(
+        [position.get(c, -1) for c in cases[matrix.col]], dtype=int)
+    used = matrix.data != 0.
+    missing = np.unique(cases[matrix.col[used & (columns < 0)]])
+    if missing.size:
+        raise AutoRobotValueError(
+            f"Missing results for load cases {missing.tolist()}.")
+    return sci_sparse.csr_matrix(
+        (matrix.data[used], (matrix.row[used], columns[used])),
+        shape=(matrix.shape[0], result_cases.size)
+    )
+
+
+def superpose(matrix, results, out=None, block=256):
+    """Computes the results of linear combinations from simple case results.
+
+    The results of the combinations are the product of the factor matrix
+    and the results of the simple cases, computed by blocks of
+    combinations. A zero factor ignores the results of a load case even if
+    they are ``NaN``.
+
+    :param matrix:
+       A factor matrix (combinations × load cases), dense or sparse
+    :param numpy.ndarray results:
+       The results of the simple cases, the first axis being the load cases
+       (e.g. bar forces of shape (cases, bars, points, 6))
+    :param out:
+       An array to store the results (optional). If a path is given, the
+       results are stored in a ``numpy.memmap`` created at that path.
+    :param int block: The number of combinations computed at once
+    :return:
+       An array of shape (combinations, ...) with the results of the
+       combinations
+    """
+    matrix = sci_sparse.csr_matrix(matrix)
+    results = np.asarray(results, dtype=float)
+    if matrix.shape[1] != results.shape[0]:
+        raise AutoRobotValueError(
+            "The matrix must have one column per load case in the results.")
+    shape = (matrix.shape[0],) + results.shape[1:]
+    if out is None:
+        out = np.empty(shape)
+    elif isinstance(out, (str, os.PathLike)):
+        out = np.memmap(out, dtype=float, mode='w+', shape=shape)
+    flat = results.reshape(results.shape[0], -1)
+    out_flat = out.reshape(shape[0], -1)
+    for start in range(0, shape[0], block):
+        out_flat[start:start + block] = matrix[start:start + block] @ flat
+    return out
+
+
+def envelope(matrix, results, block=256):
+    """Computes the envelope of linear combinations of simple case results.
+
+    The combinations are computed by blocks (see :py:func:`superpose`) and
+    folded into the envelope, so that the results of all the combinations
+    are never stored.
+
+    :param matrix:
+       A factor matrix (combinations × load cases), dense or sparse
+    :param numpy.ndarray results:
+       The results of the simple cases, the first axis being the load cases
+    :param int block: The number of combinations computed at once
+    :return:
+       A tuple ``(maxima, minima, imax, imin)`` of arrays with the shape of
+       one load case results. ``imax`` and ``imin`` are the indices of the
+       governing combinations (rows of the matrix), ``-1`` where all the
+       results are ``NaN``.
+    """
+    matrix = sci_sparse.csr_matrix(matrix)
+    results = np.asarray(results, dtype=float)
+    flat = results.reshape(results.shape[0], -1)
+    env = Envelope(concurrent=False, shape=flat.shape[1:])
+    for start in range(0, matrix.shape[0], block):
+        combined = matrix[start:start + block] @ flat
+        # Rows are numbered from 1 so that 0 means no governing row
+        env.update(combined, np.arange(start, start + len(combined)) + 1)
+    shape = results.shape[1:]
+    return (env.maxima.reshape(shape), env.minima.reshape(shape),
+            env.max_cases.reshape(shape) - 1, env.min_cases.reshape(shape) - 1)
@@ -9,6 +9,7 @@ from .constants import (
 from .extensions import (
     ExtendedLabel,
     ExtendedLabelServer,
+    compile_selection,
 )
 from .nodes import ExtendedNode
 from .errors import AutoRobotValueError
@@ -93,6 +94,21 @@ class ExtendedSupportServer(ExtendedLabelServer):
     _dtype = IRobotNodeSupportData
     _rtype = ExtendedSupportLabel
 
+    registry_tol = 1e-6
+    """
+    The tolerance used to round a support definition before looking it up
+    in the registry: relative for the stiffness values, absolute for the
+    angles (in radians).
+    """
+
+    fixing_directions = ('UX', 'UY', 'UZ', 'RX', 'RY', 'RZ')
+    elastic_values = ('KX', 'KY', 'KZ', 'HX', 'HY', 'HZ')
+
+    @property
+    def objects(self):
+        """The server of the nodes the labels are assigned to."""
+        return self.app.nodes
+
     def create(self, name, dof, elasticity=None,
                alpha=0., beta=0., gamma=0., node=None, orient_node=None,
                unit_force=1e3, unit_angle=np.pi / 180):
@@ -123,44 +139,175 @@ class ExtendedSupportServer(ExtendedLabelServer):
            The factor to apply to angle values (default is π / 180 so
            that input is in degree)
         """
-        dof = {
-            'I_NSFD_UX': bool(int(dof[0])),
-            'I_NSFD_UY': bool(int(dof[1])),
-            'I_NSFD_UZ': bool(int(dof[2])),
-            'I_NSFD_RX': bool(int(dof[3])),
-            'I_NSFD_RY': bool(int(dof[4])),
-            'I_NSFD_RZ': bool(int(dof[5])),
-        }
+        fixed, springs, angles = self._values(
+            dof, elasticity, alpha, beta, gamma, node, orient_node,
+            unit_force, unit_angle
+        )
+        self._store(name, fixed, springs, angles)
+        return self.get(name)
 
-        label = self._ctype(self.Create(self._ltype, name))
-        data = self._dtype(label.Data)
+    def intern(self, dof, elasticity=None,
+               alpha=0., beta=0., gamma=0., node=None, orient_node=None,
+               prefix='S', unit_force=1e3, unit_angle=np.pi / 180):
+        """Returns the name of a support label matching a definition.
 
-        for prop, val in dof.items():
-            data.SetFixed(
-                getattr(IRobotNodeSupportFixingDirection, prop), bool(val)
-            )
+        The definition is looked up in the :py:attr:`registry` and a new
+        label is only created when no existing label matches it.
+
+        :param str prefix:
+           The prefix for the name of a new label (the name is suffixed with
+           a number)
+
+        The other arguments are the same as for :py:meth:`create`.
+        """
+        fixed, springs, angles = self._values(
+            dof, elasticity, alpha, beta, gamma, node, orient_node,
+            unit_force, unit_angle
+        )
+        name = self.lookup(self.definition_key(fixed, springs, angles))
+        if name is None:
+            name = self.free_name(prefix)
+            self._store(name, fixed, springs, angles)
+        return name
+
+    def assign(self, s, dof, elasticity=None,
+               alpha=0., beta=0., gamma=0., prefix='S',
+               unit_force=1e3, unit_angle=np.pi / 180):
+        """Sets a support matching a definition for a selection of nodes.
+
+        :param str s: A valid selection string
+        :return: The name of the support label
+
+        The other arguments are the same as for :py:meth:`intern`.
+        """
+        name = self.intern(dof, elasticity, alpha, beta, gamma,
+                           prefix=prefix, unit_force=unit_force,
+                           unit_angle=unit_angle)
+        self.set(s, name)
+        return name
+
+    def create_oriented_many(self, nodes, orient_nodes, dof, elasticity=None,
+                             gamma=0., prefix='S', unit_force=1e3,
+                             unit_angle=np.pi / 180):
+        """Sets supports oriented towards points for many nodes at once.
+
+        The coordinates of the distinct nodes are read in a single pass
+        over one selection (see :py:meth:`.ExtendedNodeServer.table`) and
+        the orientation angles are computed for all the nodes at once. Nodes
+        with identical orientations share the same (interned) label, and
+        the labels are assigned with one selection per label.
+
+        :param nodes: An iterable of node numbers
+        :param orient_nodes:
+           An iterable of node numbers defining the orientation of each
+           support, or a 2d array of the orientation points' coordinates
+           (one row per node)
+        :param str dof: The degree of freedom at the supports
+        :param tuple elasticity: The elasticity of the supports
+        :param float gamma: The third orientation angle
+        :param str prefix: The prefix for the name of new labels
+        :param float unit_force: The factor to apply to elastic force
+        :param float unit_angle: The factor to apply to angle values
+        :return: An array with the support label name of each node
+        """
+        nodes = np.fromiter((int(n) for n in nodes), dtype=int)
+        orient_nodes = np.asarray(orient_nodes)
+        is_coords = orient_nodes.ndim == 2 and orient_nodes.shape[1] == 3
+        if not is_coords:
+            orient_nodes = np.fromiter(
+                (int(n) for n in orient_nodes), dtype=int)
+        if len(orient_nodes) != len(nodes):
+            raise AutoRobotValueError(
+                "There must be one orientation per node.")
+        if not nodes.size:
+            return np.array([], dtype=str)
+
+        numbers = nodes if is_coords else np.r_[nodes, orient_nodes]
+        table = self.app.nodes.table(compile_selection(numbers))
+        order = np.argsort(table[:, 0])
+        ids, coords = table[order, 0].astype(int), table[order, 1:]
+        pos = np.searchsorted(ids, numbers).clip(max=ids.size - 1)
+        if not np.array_equal(ids[pos], numbers):
+            raise AutoRobotValueError(
+                f"Couldn't read nodes {np.setdiff1d(numbers, ids)}.")
+        points = coords[pos]
+        start = points[:nodes.size]
+        end = orient_nodes if is_coords else points[nodes.size:]
+
+        v = end - start
+        v_norm = v / (np.linalg.norm(v, axis=1)[:, None] + 1e-16)
+        angles = np.column_stack([
+            np.arctan2(v_norm[:, 1], v_norm[:, 0]),
+            np.arccos(v_norm[:, 2].clip(-1., 1.)),
+            np.full(nodes.size, gamma * unit_angle),
+        ])
+
+        fixed, springs, _ = self._values(
+            dof, elasticity, 0., 0., 0., None, None, unit_force, unit_angle)
+        keys = np.rint(angles / self.registry_tol).astype(np.int64)
+        _, first, inverse = np.unique(
+            keys, axis=0, return_index=True, return_inverse=True)
+
+        label_names = []
+        for i in first:
+            key = self.definition_key(fixed, springs, angles[i])
+            name = self.lookup(key)
+            if name is None:
+                name = self.free_name(prefix)
+                self._store(name, fixed, springs,
+                            [float(a) for a in angles[i]])
+            label_names.append(name)
+
+        names = np.array(label_names)[inverse.ravel()]
+        self.set_groups(nodes, names)
+        return names
+
+    @classmethod
+    def definition_key(cls, fixed, springs, angles):
+        """Returns a hashable key for a support definition.
+
+        :param fixed: The six fixed (truthy) or free (falsy) directions
+        :param springs: The six stiffness values (in Robot units)
+        :param angles: The three orientation angles (in radians)
+        """
+        digits = max(0, int(round(-np.log10(cls.registry_tol))))
+        return (
+            ''.join(str(int(bool(f))) for f in fixed),
+            # Stiffness values span many orders of magnitude
+            tuple(f'{float(v) + 0.:.{digits}e}' for v in springs),
+            tuple(int(round(a / cls.registry_tol)) for a in angles),
+        )
+
+    def definition(self, label):
+        """Returns the definition key of a support label.
+
+        :param obj label: A support label (see :py:meth:`get`)
+        """
+        data = label.data
+        return self.definition_key(
+            [getattr(data, d) for d in self.fixing_directions],
+            [getattr(data, k) for k in self.elastic_values],
+            [data.Alpha, data.Beta, data.Gamma],
+        )
+
+    def _values(self, dof, elasticity, alpha, beta, gamma, node, orient_node,
+                unit_force, unit_angle):
+        """Converts support arguments to values in Robot units."""
+        fixed = [bool(int(d)) for d in dof[:6]]
 
         if elasticity is not None:
-            params = {
-                'KX': elasticity[0] * unit_force,
-                'KY': elasticity[1] * unit_force,
-                'KZ': elasticity[2] * unit_force,
-                'HX': elasticity[3] * unit_force / unit_angle,
-                'HY': elasticity[4] * unit_force / unit_angle,
-                'HZ': elasticity[5] * unit_force / unit_angle,
-            }
-            for prop, val in params.items():
-                setattr(data, prop, val)
+            springs = (
+                [k * unit_force for k in elasticity[:3]] +
+                [h * unit_force / unit_angle for h in elasticity[3:6]]
+            )
         else:
-            for prop in ['KX', 'KY', 'KZ', 'HX', 'HY', 'HZ']:
-                setattr(data, prop, 0.)
+            springs = [0.] * 6
 
         if orient_node is None:
-            data.Alpha = alpha * unit_angle
-            data.Beta = beta * unit_angle
-            data.Gamma = gamma * unit_angle
+            angles = [alpha * unit_angle, beta * unit_angle,
+                      gamma * unit_angle]
         else:
-            if not all((isinstance(orient_node, np.ndarray)
+            if not all((isinstance(n, np.ndarray)
                         for n in (node, orient_node))):
                 try:
                     node, orient_node = (
@@ -178,12 +325,29 @@ class ExtendedSupportServer(ExtendedLabelServer):
             v = orient_node - node
             v_norm = v / (np.linalg.norm(v) + 1e-16)
 
-            data.Alpha = np.arctan2(v_norm[1], v_norm[0])
-            data.Beta = np.arccos(v_norm[2])
-            data.Gamma = 0.
+            angles = [np.arctan2(v_norm[1], v_norm[0]),
+                      np.arccos(v_norm[2]), 0.]
+
+        return fixed, springs, angles
+
+    def _store(self, name, fixed, springs, angles):
+        """Creates and stores a support label from values in Robot units."""
+        label = self._ctype(self.Create(self._ltype, name))
+        data = self._dtype(label.Data)
+
+        for d, val in zip(self.fixing_directions, fixed):
+            data.SetFixed(
+                getattr(IRobotNodeSupportFixingDirection, f'I_NSFD_{d}'),
+                bool(val)
+            )
+        for prop, val in zip(self.elastic_values, springs):
+            setattr(data, prop, val)
+        data.Alpha, data.Beta, data.Gamma = angles
 
         self.StoreWithName(label, name)
-        return self.get(name)
+        # A label stored again under its name loses its former definition
+        self.unregister(name)
+        self.register(self.definition_key(fixed, springs, angles), name)
 
     def set(self, s, name):
         """Sets a support for a selection of nodes.
@@ -195,3 +359,4 @@ class ExtendedSupportServer(ExtendedLabelServer):
         sel.FromText(str(s))
         with self.app.nodes as nodes:
             nodes.SetLabel(sel, self._ltype, str(name))
+        self.track(sel, name)
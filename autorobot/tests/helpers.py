@@ -0,0 +1,25 @@
+import numpy as np
+
+
+def build_cantilever(rb, count, calculate=True):
+    """Builds a cantilever made of `count` bars with two load cases.
+
+    The project is calculated unless `calculate` is ``False``, e.g. when
+    the caller calculates it afterwards.
+    """
+    rb.nodes.from_array(np.c_[np.linspace(0., 10., count + 1),
+                              np.zeros((count + 1, 2))])
+    for i in range(count):
+        rb.bars.create(i + 1, i + 2)
+    rb.sections.load('UB 305x165x40')
+    rb.materials.load('S355')
+    rb.bars.set_section('all', 'UB 305x165x40')
+    rb.bars.set_material('all', 'S355')
+    rb.supports.create('Fixed', '111111')
+    rb.nodes.set_support(1, 'Fixed')
+    rb.cases.create_case(1, 'dead', 'PERM', 'LINEAR').add_bar_udl(
+        'all', fz=-2.)
+    rb.cases.create_case(2, 'tip load', 'IMPOSED', 'LINEAR').add_nodal_force(
+        count + 1, fz=-10.)
+    if calculate:
+        rb.Project.CalcEngine.Calculate()
@@ -1,4 +1,7 @@
+import asyncio
+import logging
 import os
+import threading
 import time
 import unittest
 from unittest import TestCase
@@ -7,6 +10,10 @@ import numpy as np
 from numpy.testing import assert_array_almost_equal
 
 import autorobot as ar
+from autorobot.executor import ComExecutor, ComProxy
+from autorobot.recycle import RecyclePolicy
+
+logger = logging.getLogger(__name__)
 
 
 class TestAppOperations(TestCase):
@@ -52,23 +59,17 @@ class TestAppOperations(TestCase):
 
             for pt in ar.RProjType.custom_index.values():
                 with self.subTest(msg='new', proj_type=pt):
-                    time.sleep(2)
                     rb.new(pt)
                     self.assertEqual(rb.Project.Type, pt)
                     rb.close()
-                # Wait for Robot to avoid throwing a server error
-                time.sleep(.5)
 
             for pt in ('BUILDING', 'FRAME_2D', 'FRAME_3D', 'SHELL',
                        'TRUSS_2D', 'TRUSS_3D'):
                 with self.subTest(msg='new (synomyms)', proj_type=pt):
-                    time.sleep(2)
                     rb.new(pt)
                     self.assertEqual(
                         rb.Project.Type, ar.synonyms.synonyms[pt])
                     rb.close()
-                    # Wait for Robot to avoid throwing a server error
-                    time.sleep(.5)
 
             with self.subTest(msg="save_As"):
                 rb.new('SHELL')
@@ -84,7 +85,6 @@ class TestAppOperations(TestCase):
 
             rb = ar.initialize(visible=False, interactive=False)
             with self.subTest(msg="open"):
-                time.sleep(2)
                 rb.open(path)
                 self.assertEqual(rb.Project.FileName, path)
             rb.nodes.create(0., 0., 0.)
@@ -92,7 +92,6 @@ class TestAppOperations(TestCase):
             rb.quit(save=False)
 
             rb = ar.initialize(visible=False, interactive=False)
-            time.sleep(2)
             rb.open(path)
             with self.subTest(msg="save"):
                 assert_array_almost_equal(
@@ -101,7 +100,6 @@ class TestAppOperations(TestCase):
             rb.quit(save=True)
 
             rb = ar.initialize(visible=False, interactive=False)
-            time.sleep(2)
             rb.open(path)
             with self.subTest(msg="quit save"):
                 assert_array_almost_equal(
@@ -109,6 +107,40 @@ class TestAppOperations(TestCase):
             rb.close()
             rb.quit(save=False)
 
+    def test_quit_reopen(self):
+        """Times quit and reopen cycles."""
+
+        with TemporaryDirectory() as d:
+            path = os.path.join(d, 'test_quit.rtd')
+            rb = ar.initialize(visible=False, interactive=False)
+            rb.new('SHELL')
+            rb.nodes.create(0., 0., 0.)
+            rb.save_as(path)
+            timings = []
+            for i in range(3):
+                start = time.perf_counter()
+                with self.subTest(msg='quit', cycle=i):
+                    self.assertTrue(rb.quit(save=False))
+                quit_time = time.perf_counter() - start
+                with self.subTest(msg='unlocked', cycle=i):
+                    with open(path, 'r+b'):
+                        pass
+                start = time.perf_counter()
+                rb = ar.initialize(visible=False, interactive=False)
+                rb.open(path)
+                timings.append((quit_time, time.perf_counter() - start))
+                with self.subTest(msg='reopen', cycle=i):
+                    assert_array_almost_equal(
+                        rb.nodes.get(1).as_array(), np.zeros((3,)))
+            rb.quit(save=False)
+        for i, (quit_time, reopen_time) in enumerate(timings):
+            logger.info("Cycle %d: quit %.3fs, reopen %.3fs",
+                        i, quit_time, reopen_time)
+        quit_times, reopen_times = np.array(timings).T
+        logger.info("Quit %.3fs (max %.3fs), reopen %.3fs (max %.3fs)",
+                    quit_times.mean(), quit_times.max(),
+                    reopen_times.mean(), reopen_times.max())
+
     def test_show_hide(self):
         rb = ar.initialize(visible=False, interactive=False)
         with self.subTest(msg='show'):
@@ -123,5 +155,157 @@ class TestAppOperations(TestCase):
         rb.quit(save=False)
 
 
+class TestComExecutor(TestCase):
+
+    def setUp(self):
+        self.executor = ComExecutor()
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_thread(self):
+        idents = [self.executor.call(threading.get_ident) for _ in range(3)]
+        self.assertEqual(idents, [self.executor._ident] * 3)
+        self.assertNotEqual(self.executor._ident, threading.get_ident())
+        self.assertTrue(self.executor.call(lambda: self.executor.on_thread))
+        self.assertFalse(self.executor.on_thread)
+
+    def test_order(self):
+        calls = []
+        futures = [self.executor.submit(calls.append, i) for i in range(20)]
+        for future in futures:
+            future.result()
+        self.assertEqual(calls, list(range(20)))
+
+    def test_nested(self):
+        self.assertEqual(
+            self.executor.call(lambda: self.executor.call(lambda: 1)), 1)
+
+    def test_exception(self):
+        with self.assertRaises(ZeroDivisionError):
+            self.executor.call(lambda: 1 / 0)
+
+    def test_wrap(self):
+        class Thing:
+            value = 1
+
+            def ident(self):
+                return threading.get_ident()
+
+            def idents(self):
+                yield from (threading.get_ident(), self)
+
+        thing = self.executor.call(Thing)
+        proxy = self.executor.wrap(thing)
+        self.assertIsInstance(proxy, ComProxy)
+        self.assertEqual(proxy.ident(), self.executor._ident)
+        ident, item = proxy.idents()
+        self.assertEqual(ident, self.executor._ident)
+        self.assertIsInstance(item, ComProxy)
+        proxy.value = 2
+        self.assertEqual(thing.value, 2)
+        self.assertEqual(proxy.value, 2)
+        values = self.executor.wrap([1, 'a', np.eye(2), {'b': thing}])
+        self.assertEqual(values[:2], [1, 'a'])
+        self.assertIsInstance(values[2], np.ndarray)
+        self.assertIsInstance(values[3]['b'], ComProxy)
+        self.assertIs(self.executor.call(self.executor.wrap, thing), thing)
+
+    def test_shutdown(self):
+        self.executor.shutdown()
+        with self.assertRaises(RuntimeError):
+            self.executor.submit(print)
+
+
+class TestThreadedApp(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rb = ar.initialize(visible=False, interactive=False, threaded=True)
+        cls.rb.new(ar.RProjType.SHELL)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.rb.quit(save=False)
+
+    def test_table_async(self):
+        self.rb.call(lambda: self.rb.nodes.from_array(np.eye(3)))
+
+        async def read():
+            table, _ = await asyncio.gather(
+                self.rb.nodes.table_async('all'), asyncio.sleep(.1))
+            return table
+
+        table = asyncio.run(read())
+        assert_array_almost_equal(
+            table, self.rb.call(lambda: self.rb.nodes.table('all')))
+        self.assertEqual(len(table), 3)
+
+    def test_proxy(self):
+        nodes = self.rb.nodes
+        self.assertIsInstance(nodes, ComProxy)
+        self.assertIsInstance(self.rb.Project, ComProxy)
+        self.assertEqual(self.rb.Project.Type, ar.RProjType.SHELL)
+        assert_array_almost_equal(
+            nodes.table('all'),
+            self.rb.call(lambda: self.rb.nodes.table('all')))
+
+    def test_call(self):
+        self.assertTrue(self.rb.call(lambda: self.rb.executor.on_thread))
+        self.assertEqual(
+            self.rb.call(lambda: self.rb.Project.Type), ar.RProjType.SHELL)
+
+    def test_calculate(self):
+        self.rb.call(lambda: self.rb.nodes.from_array(np.eye(3)))
+        calc = self.rb.calculate()
+        stats = calc.result(timeout=600)
+        self.assertEqual(stats['nodes'], self.rb.call(
+            lambda: self.rb.selections.CreateFull(
+                ar.constants.ROType.NODE).Count))
+        self.assertIs(self.rb.calc_history[-1], stats)
+
+
+class TestRecycle(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rb = ar.initialize(visible=False, interactive=False)
+        cls.rb.new(ar.RProjType.SHELL)
+        cls.rb.nodes.from_array(np.eye(3))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.rb.recycle_policy = None
+        cls.rb.quit(save=False)
+
+    def test_release(self):
+        node = self.rb.nodes.get(1)
+        node.release()
+        with self.assertRaises(AttributeError):
+            node.X
+        node.release()
+        with self.rb.nodes.get(2) as node:
+            self.assertEqual(node.Y, 1.)
+        self.assertIsNone(node._inst)
+
+    def test_checkpoint(self):
+        self.rb.recycle_policy = RecyclePolicy(operations=10 ** 6)
+        self.assertFalse(self.rb.checkpoint())
+        self.rb.recycle_policy = RecyclePolicy(operations=1)
+        process_id = self.rb.process_id
+        self.assertTrue(self.rb.checkpoint())
+        self.assertEqual(self.rb.recycle_policy.restarts, 1)
+        self.assertIs(ar.app.app, self.rb)
+        if process_id is not None:
+            self.assertNotEqual(self.rb.process_id, process_id)
+        self.assertTrue(self.rb.Project.FileName.endswith('.rtd'))
+        assert_array_almost_equal(
+            self.rb.nodes.table('all')[:, 1:], np.eye(3))
+        self.rb.recycle_policy = RecyclePolicy(memory=1, check=1)
+        self.rb.nodes.table('all')
+        # The memory is only known if a new Robot process was started
+        self.assertEqual(self.rb.checkpoint(), self.rb.memory is not None)
+
+
 if __name__ == '__main__':
     unittest.main()
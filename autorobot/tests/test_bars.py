@@ -1,9 +1,8 @@
 import unittest
-import time
 from itertools import combinations
 import numpy as np
 from numpy.random import random
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_array_equal, assert_array_almost_equal
 
 import autorobot as ar
 
@@ -13,7 +12,6 @@ class TestExtendedBar(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.rb = ar.initialize(visible=False, interactive=False)
-        time.sleep(2)
         cls.rb.new(ar.RProjType.SHELL)
 
     @classmethod
@@ -70,7 +68,6 @@ class TestBarServers(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.rb = ar.initialize(visible=False, interactive=False)
-        time.sleep(2)
         cls.rb.new(ar.RProjType.SHELL)
 
     @classmethod
@@ -178,6 +175,59 @@ class TestBarServers(unittest.TestCase):
                      for i, t in enumerate(combinations(ns, 2))])
         assert_array_equal(t, a.astype(int))
 
+    def test_lengths(self):
+        a = random((4, 3))
+        ns = [self.rb.nodes.create(*p, obj=False) for p in a]
+        self.rb.bars.create(ns[0], ns[1])
+        self.rb.bars.create(ns[2], ns[3])
+        assert_array_almost_equal(
+            self.rb.bars.lengths('all'),
+            np.linalg.norm(a[1::2] - a[::2], axis=1)
+        )
+
+    def test_label_table(self):
+        self.rb.sections.create('Rnd10', 10)
+        self.rb.releases.create('UX-UZ', '011111', '110111')
+        bars = []
+        for i in range(3):
+            n1 = self.rb.nodes.create(*random((3,)))
+            n2 = self.rb.nodes.create(*random((3,)))
+            bars.append(self.rb.bars.create(n1, n2))
+        self.rb.bars.set_section(f'{bars[0].Number} {bars[1].Number}',
+                                 'Rnd10')
+        self.rb.bars.set_release(bars[1].Number, 'UX-UZ')
+        table, names = self.rb.bars.label_table('all')
+        assert_array_equal(table['bar'], [b.Number for b in bars])
+        assert_array_equal(
+            names['section'][table['section']], ['Rnd10', 'Rnd10', ''])
+        assert_array_equal(
+            names['release'][table['release']], ['', 'UX-UZ', ''])
+        self.assertEqual(names['section'][0], '')
+        for b, row in zip(bars, table):
+            material = b.material
+            self.assertEqual(
+                names['material'][row['material']],
+                material.Name if material else ''
+            )
+
+    def test_property_table(self):
+        self.rb.sections.load('UB 305x165x40')
+        self.rb.materials.load('S355')
+        bars = []
+        for i in range(3):
+            n1 = self.rb.nodes.create(*random((3,)))
+            n2 = self.rb.nodes.create(*random((3,)))
+            bars.append(self.rb.bars.create(n1, n2, obj=False))
+        self.rb.bars.set_section(f'{bars[0]} {bars[1]}', 'UB 305x165x40')
+        self.rb.bars.set_material(bars[0], 'S355')
+        table = self.rb.bars.property_table('all')
+        assert_array_equal(table['bar'], bars)
+        section = self.rb.sections.get('UB 305x165x40')
+        assert_array_almost_equal(table['IY'][:2], section.IY)
+        self.assertTrue(np.isnan(table['IY'][2]))
+        self.assertAlmostEqual(
+            table['fy'][0], self.rb.materials.get('S355').RE)
+
     def test_set_section(self):
         self.rb.sections.create('Rnd10', 10)
         n1 = self.rb.nodes.create(*random((3,)))
@@ -1,6 +1,7 @@
 import unittest
-import time
+import numpy as np
 from numpy.random import random
+from numpy.testing import assert_array_almost_equal
 
 import autorobot as ar
 
@@ -10,7 +11,6 @@ class TestExtendedSimpleCase(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.rb = ar.initialize(visible=False, interactive=False)
-        time.sleep(2)
         cls.rb.new(ar.RProjType.SHELL)
 
     @classmethod
@@ -36,6 +36,42 @@ class TestExtendedSimpleCase(unittest.TestCase):
         )
         self.rb.cases.delete('all')
 
+    def test_iter_loads(self):
+        n1 = self.rb.nodes.create(*random((3,)))
+        n2 = self.rb.nodes.create(*random((3,)))
+        bar = self.rb.bars.create(n1, n2)
+        case = self.rb.cases.create_case(1, 'case 1', 'PERM', 'LINEAR')
+        case.add_self_weight(desc='sw')
+        case.add_bar_udl(bar.Number, fx=random(), desc='udl')
+        it = case.iter_loads()
+        self.assertEqual(next(it)['Description'], 'sw')
+        self.assertListEqual(case.loads, list(case.iter_loads()))
+        load = list(case.iter_loads(details=True))[1]
+        self.assertEqual(load['Index'], 2)
+        self.assertEqual(load['Objects'], str(bar.Number))
+        self.rb.cases.delete('all')
+
+    def test_loads_table(self):
+        n1 = self.rb.nodes.create(*random((3,)))
+        n2 = self.rb.nodes.create(*random((3,)))
+        bar = self.rb.bars.create(n1, n2)
+        case = self.rb.cases.create_case(1, 'case 1', 'PERM', 'LINEAR')
+        fx = random((3,))
+        case.add_self_weight(desc='sw')
+        for f in fx:
+            case.add_bar_udl(bar.Number, fx=f, unit=1., desc='udl')
+        tables = case.loads_table()
+        self.assertEqual(len(tables), 2)
+        udl = tables[ar.constants.RLoadType.BAR_UDL]
+        self.assertListEqual(list(udl['Index']), [2, 3, 4])
+        self.assertListEqual(list(udl['Description']), ['udl'] * 3)
+        self.assertListEqual(list(udl['Objects']), [str(bar.Number)] * 3)
+        for a, b in zip(udl['FX'], fx):
+            self.assertAlmostEqual(a, b)
+        dead = tables[ar.constants.RLoadType.DEAD]
+        self.assertEqual(dead['COEFF'][0], 1.)
+        self.rb.cases.delete('all')
+
     def test_get_record_value(self):
         n1 = self.rb.nodes.create(*random((3,)))
         n2 = self.rb.nodes.create(*random((3,)))
@@ -221,6 +257,96 @@ class TestExtendedSimpleCase(unittest.TestCase):
         self.assertEqual(rec.Description, 'pl')
         self.rb.cases.delete('all')
 
+    def test_add_bar_udl_many(self):
+        bars = []
+        for i in range(4):
+            n1 = self.rb.nodes.create(*random((3,)))
+            n2 = self.rb.nodes.create(*random((3,)))
+            bars.append(self.rb.bars.create(n1, n2, obj=False))
+        case = self.rb.cases.create_case(1, 'case 1', 'PERM', 'LINEAR')
+        fz = [-1., -2., -1., -2.]
+        count = case.add_bar_udl_many(bars, fz=fz, unit=1., desc='udl')
+        self.assertEqual(count, 2)
+        self.assertEqual(case.Records.Count, 2)
+        for i in (1, 2):
+            rec = case.get(i)
+            value = case.get_record_value(rec, ar.constants.RBarUDLValues.FZ)
+            self.assertEqual(
+                rec.Objects.ToText().strip(),
+                ar.compile_selection(
+                    [b for b, f in zip(bars, fz) if f == value])
+            )
+            self.assertEqual(rec.Description, 'udl')
+        self.rb.cases.delete('all')
+
+    def test_add_bar_pl_many(self):
+        bars = []
+        for i in range(3):
+            n1 = self.rb.nodes.create(*random((3,)))
+            n2 = self.rb.nodes.create(*random((3,)))
+            bars.append(self.rb.bars.create(n1, n2, obj=False))
+        case = self.rb.cases.create_case(1, 'case 1', 'PERM', 'LINEAR')
+        count = case.add_bar_pl_many(bars, x=.5, fx=10., is_relative=True,
+                                     unit=1., desc='pl')
+        self.assertEqual(count, 1)
+        rec = case.get(1)
+        self.assertEqual(
+            rec.Objects.ToText().strip(), ar.compile_selection(bars))
+        self.assertEqual(
+            case.get_record_value(rec, ar.constants.RBarPLValues.FX), 10.)
+        self.assertEqual(
+            case.get_record_value(rec, ar.constants.RBarPLValues.IS_REL), 1.)
+        self.rb.cases.delete('all')
+
+    def test_add_nodal_force(self):
+        n = self.rb.nodes.create(*random((3,)))
+        case = self.rb.cases.create_case(1, 'case 1', 'PERM', 'LINEAR')
+        fx, fy, fz, cx, cy, cz = random((6,))
+        case.add_nodal_force(n.Number, fx=fx, fy=fy, fz=fz,
+                             cx=cx, cy=cy, cz=cz, unit=10., desc='nodal')
+        rec = case.get(1)
+        self.assertEqual(rec.Objects.ToText().strip(), str(n.Number))
+        for k, v in zip(('FX', 'FY', 'FZ', 'CX', 'CY', 'CZ'),
+                        (fx, fy, fz, cx, cy, cz)):
+            self.assertAlmostEqual(
+                case.get_record_value(rec, ar.constants.RNodalValues[k]),
+                v * 10.
+            )
+        self.assertEqual(rec.Description, 'nodal')
+        self.rb.cases.delete('all')
+
+    def test_add_nodal_force_many(self):
+        nodes = [self.rb.nodes.create(*random((3,)), obj=False)
+                 for i in range(5)]
+        case = self.rb.cases.create_case(1, 'case 1', 'PERM', 'LINEAR')
+        forces = np.zeros((5, 6))
+        forces[:3, 2] = -1.
+        forces[3:, 0] = 2.
+        count = case.add_nodal_force_many(nodes, *forces.T, unit=1.)
+        self.assertEqual(count, 2)
+        loads = case.loads_table()[ar.constants.RLoadType.NODAL]
+        self.assertSetEqual(
+            set(loads['Objects']),
+            {ar.compile_selection(nodes[:3]), ar.compile_selection(nodes[3:])}
+        )
+        self.assertAlmostEqual(loads['FZ'].sum(), -1.)
+        self.rb.cases.delete('all')
+
+    def test_applied_forces(self):
+        n1 = self.rb.nodes.create(0., 0., 0., obj=False)
+        n2 = self.rb.nodes.create(2., 0., 0., obj=False)
+        bar = self.rb.bars.create(n1, n2, obj=False)
+        case = self.rb.cases.create_case(1, 'case 1', 'PERM', 'LINEAR')
+        case.add_nodal_force(f'{n1} {n2}', fz=-1.)
+        case.add_bar_udl(bar, fx=3., fz=-2.)
+        case.add_bar_pl(bar, x=.5, fy=5., is_relative=True)
+        assert_array_almost_equal(
+            case.applied_forces(), [6e3, 5e3, -6e3])
+        case.add_self_weight()
+        with self.assertRaises(ar.errors.AutoRobotValueError):
+            case.applied_forces()
+        self.rb.cases.delete('all')
+
     def test_delete(self):
         n1 = self.rb.nodes.create(*random((3,)))
         n2 = self.rb.nodes.create(*random((3,)))
@@ -265,7 +391,6 @@ class TestCaseServer(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.rb = ar.initialize(visible=False, interactive=False)
-        time.sleep(2)
         cls.rb.new(ar.RProjType.SHELL)
 
     @classmethod
@@ -319,6 +444,43 @@ class TestCaseServer(unittest.TestCase):
                     None, 'Synonyms', ar.RCaseNature.SNOW, a)
                 self.assertEqual(c.Name, 'Synonyms')
 
+    def test_create_cases(self):
+        with self.subTest(msg='create_cases'):
+            cases = self.rb.cases.create_cases([
+                (1, 'Dead', 'PERM', 'LINEAR'),
+                (None, 'Live', ar.RCaseNature.IMPOSED, 'LINEAR'),
+                (5, 'Wind', 'WIND', ar.RAnalysisType.NON_LIN),
+            ])
+            self.assertListEqual(sorted(cases), [1, 5, 6])
+            for n, case in cases.items():
+                self.assertIsInstance(case, ar.cases.ExtendedSimpleCase)
+                self.assertEqual(case.Number, n)
+            self.assertEqual(cases[6].Name, 'Live')
+            self.assertEqual(self.rb.cases.get(5).Name, 'Wind')
+
+        with self.subTest(msg='create_cases (overwrite)'):
+            self.assertRaises(
+                ar.errors.AutoRobotIdError,
+                self.rb.cases.create_cases, [(1, 'Dead', 'PERM', 'LINEAR')]
+            )
+            cases = self.rb.cases.create_cases(
+                [(1, 'Overwrite', 'PERM', 'LINEAR')], overwrite=True)
+            self.assertEqual(self.rb.cases.get(1).Name, 'Overwrite')
+
+        with self.subTest(msg='create_cases (duplicates)'):
+            self.assertRaises(
+                ar.errors.AutoRobotIdError,
+                self.rb.cases.create_cases,
+                [(10, 'A', 'PERM', 'LINEAR'), (10, 'B', 'PERM', 'LINEAR')]
+            )
+
+        with self.subTest(msg='create_cases (existing numbers)'):
+            cases = self.rb.cases.create_cases(
+                [(None, 'Snow', 'SNOW', 'LINEAR')])
+            self.assertListEqual(list(cases), [7])
+            self.assertListEqual(
+                list(self.rb.cases.select('all', obj=False)), [1, 5, 6, 7])
+
     def test_create_combination(self):
         cs = []
         for i in range(5):
@@ -382,6 +544,46 @@ class TestCaseServer(unittest.TestCase):
                     ar.RCombType.SLS, ar.RCaseNature.PERM, a)
                 self.assertEqual(comb.Name, 'Synonyms')
 
+    def test_combination_matrix(self):
+        for i in range(3):
+            self.rb.cases.create_case(
+                i + 1, f'case {i + 1}', 'PERM', 'LINEAR')
+        self.rb.cases.create_combination(
+            4, 'comb 4', {1: 1.35, 3: 1.5}, 'ULS', 'PERM', 'COMB_LINEAR')
+        self.rb.cases.create_combination(
+            5, 'comb 5', {2: 1.}, 'SLS', 'PERM', 'COMB_LINEAR')
+        with self.subTest(msg='dense'):
+            m, combs, cases = self.rb.cases.combination_matrix()
+            self.assertListEqual(list(combs), [4, 5])
+            self.assertListEqual(list(cases), [1, 2, 3])
+            assert_array_almost_equal(m, [[1.35, 0., 1.5], [0., 1., 0.]])
+        with self.subTest(msg='sparse'):
+            m, combs, cases = self.rb.cases.combination_matrix(
+                '5', sparse=True)
+            self.assertListEqual(list(combs), [5])
+            assert_array_almost_equal(m.toarray(), [[0., 1., 0.]])
+
+    def test_set_combination_matrix(self):
+        for i in range(3):
+            self.rb.cases.create_case(
+                i + 1, f'case {i + 1}', 'PERM', 'LINEAR')
+        self.rb.cases.create_combination(
+            4, 'comb 4', {1: 1.35, 3: 1.5}, 'ULS', 'PERM', 'COMB_LINEAR')
+        self.rb.cases.create_combination(
+            5, 'comb 5', {2: 1.}, 'SLS', 'PERM', 'COMB_LINEAR')
+        m, combs, cases = self.rb.cases.combination_matrix()
+        m[1, 0] = .5
+        changed = self.rb.cases.set_combination_matrix(m, combs, cases)
+        self.assertListEqual(list(changed), [5])
+        new, _, _ = self.rb.cases.combination_matrix()
+        assert_array_almost_equal(new, m)
+        self.assertEqual(
+            len(self.rb.cases.set_combination_matrix(m, combs, cases)), 0)
+        self.assertEqual(len(self.rb.cases.set_combination_matrix(
+            m[::-1], combs[::-1], cases)), 0)
+        with self.assertRaises(ar.errors.AutoRobotValueError):
+            self.rb.cases.set_combination_matrix(m, [4, 6], cases)
+
     def test_get(self):
         self.rb.cases.create_case(1, 'Case', 'PERM', 'LINEAR')
         self.rb.cases.create_combination(2, 'Comb', {}, 'SLS', 'PERM',
@@ -405,6 +607,9 @@ class TestCaseServer(unittest.TestCase):
                 [c.Number for c in self.rb.cases.select('3to9by3')],
                 [3, 6, 9]
             )
+        with self.subTest(msg='select numbers'):
+            self.assertListEqual(
+                list(self.rb.cases.select('3to9by3', obj=False)), [3, 6, 9])
         with self.subTest(msg='select all'):
             self.assertEqual(
                 len(list(self.rb.cases.select('all'))),
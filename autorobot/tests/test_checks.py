@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+from numpy.random import random
+from numpy.testing import assert_array_almost_equal
+
+from autorobot.checks import failing, utilisation
+
+
+class TestChecks(unittest.TestCase):
+
+    def setUp(self):
+        self.forces = random((2, 3, 4, 6)) - .5
+        self.props = np.zeros(3, dtype=[
+            (f, float) for f in ('bar', 'AX', 'AY', 'AZ', 'WY', 'WZ', 'fy')])
+        self.props['bar'] = [1, 2, 5]
+        for field in ('AX', 'AY', 'AZ', 'WY', 'WZ'):
+            self.props[field] = random(3)
+        self.props['fy'] = 1.
+
+    def test_utilisation(self):
+        ratios = utilisation(self.forces, self.props, gamma_m=1.1)
+        self.assertEqual(ratios.shape, (2, 3, 4, 2))
+        for b, p in enumerate(self.props):
+            f = np.abs(self.forces[:, b])
+            assert_array_almost_equal(
+                ratios[:, b, :, 0],
+                (f[..., 0] / p['AX'] + f[..., 4] / p['WY']
+                 + f[..., 5] / p['WZ']) * 1.1
+            )
+            assert_array_almost_equal(
+                ratios[:, b, :, 1],
+                np.maximum(f[..., 1] / p['AY'], f[..., 2] / p['AZ'])
+                * np.sqrt(3.) * 1.1
+            )
+
+    def test_utilisation_nan(self):
+        self.props['AX'][1] = np.nan
+        ratios = utilisation(self.forces, self.props)
+        self.assertTrue(np.all(np.isnan(ratios[:, 1, :, 0])))
+
+    def test_failing(self):
+        ratios = np.zeros((2, 3, 4, 2))
+        self.assertEqual(failing(ratios, [1, 2, 5]), '')
+        ratios[1, 0, 3, 1] = 1.2
+        ratios[0, 2, 0, 0] = 2.
+        self.assertEqual(failing(ratios, [1, 2, 5]), '1 5')
+        self.assertEqual(failing(ratios, [1, 2, 5], limit=1.5), '5')
+
+
+if __name__ == '__main__':
+    unittest.main()
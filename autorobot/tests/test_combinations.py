@@ -0,0 +1,105 @@
+import unittest
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+
+import autorobot as ar
+from autorobot.combinations import (
+    factor_matrix,
+    partial_factors,
+    prune,
+    psi_factors,
+    rules,
+)
+
+
+class TestFactorMatrix(unittest.TestCase):
+
+    natures = ['PERM', 'PERM', 'IMPOSED', 'WIND', 'WIND', 'ACC']
+
+    def test_shape(self):
+        for rule in rules:
+            with self.subTest(rule=rule):
+                m = factor_matrix(self.natures, rule)
+                self.assertEqual(m.shape[1], len(self.natures))
+                self.assertEqual(len(np.unique(m, axis=0)), len(m))
+
+    def test_permanent(self):
+        m = factor_matrix(self.natures, '6.10')
+        assert_array_almost_equal(m[:, 0], m[:, 1])
+        self.assertSetEqual(
+            set(m[:, 0]), {partial_factors['G_sup'], partial_factors['G_inf']})
+        self.assertTrue(np.all(m[:, -1] == 0.))
+
+    def test_exclusive(self):
+        for rule in rules:
+            with self.subTest(rule=rule):
+                m = factor_matrix(self.natures, rule)
+                self.assertFalse(np.any((m[:, 3] != 0) & (m[:, 4] != 0)))
+        m = factor_matrix(self.natures, '6.10', groups=[0, 0, 1, 2, 3, 4])
+        self.assertTrue(np.any((m[:, 3] != 0) & (m[:, 4] != 0)))
+
+    def test_leading(self):
+        g_q = partial_factors['Q']
+        psi_0 = psi_factors[ar.RCaseNature.IMPOSED][0]
+        m = factor_matrix(['PERM', 'IMPOSED', 'SNOW'], '6.10')
+        rows = {tuple(np.round(r, 6)) for r in m}
+        self.assertIn((1.35, g_q, round(g_q * psi_factors[
+            ar.RCaseNature.SNOW][0], 6)), rows)
+        self.assertIn((1.35, round(g_q * psi_0, 6), g_q), rows)
+        self.assertIn((1., 0., g_q), rows)
+
+    def test_unknown_rule(self):
+        with self.assertRaises(ar.errors.AutoRobotValueError):
+            factor_matrix(self.natures, '6.11')
+
+    def test_prune(self):
+        m = np.array([[1., 0.], [0., 0.], [1., 0.], [0., 1.]])
+        assert_array_almost_equal(prune(m), [[1., 0.], [0., 1.]])
+
+
+class TestGenerateCombinations(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rb = ar.initialize(visible=False, interactive=False)
+        cls.rb.new(ar.RProjType.SHELL)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.rb.quit(save=False)
+
+    def tearDown(self):
+        self.rb.structure.Clear()
+
+    def test_create_combinations(self):
+        for i, n in enumerate(('PERM', 'IMPOSED', 'WIND')):
+            self.rb.cases.create_case(i + 1, f'case {i + 1}', n, 'LINEAR')
+        m = np.array([[1.35, 1.5, 0.], [1., 0., 1.5]])
+        nums = self.rb.cases.create_combinations(
+            m, [1, 2, 3], 'ULS', 'PERM', 'COMB_LINEAR')
+        self.assertListEqual(list(nums), [4, 5])
+        comb = self.rb.cases.get(5)
+        self.assertEqual(comb.CaseFactors.Count, 2)
+        with self.assertRaises(ar.errors.AutoRobotIdError):
+            self.rb.cases.create_combinations(
+                m, [1, 2, 3], 'ULS', 'PERM', 'COMB_LINEAR', num=5)
+        nums = self.rb.cases.create_combinations(
+            m[::-1], [1, 2, 3], 'ULS', 'PERM', 'COMB_LINEAR', num=5,
+            overwrite=True)
+        self.assertListEqual(list(nums), [5, 6])
+        self.assertEqual(self.rb.cases.get(5).CaseFactors.Count, 2)
+        self.assertEqual(self.rb.cases.get(4).CaseFactors.Count, 2)
+
+    def test_generate_combinations(self):
+        for i, n in enumerate(('PERM', 'IMPOSED', 'WIND', 'WIND')):
+            self.rb.cases.create_case(i + 1, f'case {i + 1}', n, 'LINEAR')
+        nums = self.rb.cases.generate_combinations('6.10')
+        m = factor_matrix(['PERM', 'IMPOSED', 'WIND', 'WIND'], '6.10')
+        self.assertEqual(len(nums), len(m))
+        comb = self.rb.cases.get(nums[0])
+        self.assertEqual(comb.Name, '6.10 1')
+        self.assertEqual(comb.CombinationType, ar.RCombType.ULS)
+
+
+if __name__ == '__main__':
+    unittest.main()
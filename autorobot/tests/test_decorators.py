@@ -55,3 +55,13 @@ class test_abstract_attributes(unittest.TestCase):
             _test = None
 
         self.assertTrue(hasattr(Child(), '_test'))
+
+    def test_label_server_definition(self):
+        attributes = {
+            '_otype': object, '_ctype': object, '_ltype': 0,
+            '_dtype': object, '_rtype': object, 'objects': None,
+        }
+        with self.assertRaises(NotImplementedError):
+            type('Server', (ar.extensions.ExtendedLabelServer,), attributes)
+        type('Server', (ar.extensions.ExtendedLabelServer,),
+             dict(attributes, definition=lambda self, label: ()))
@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+
+import autorobot as ar
+from autorobot.design import AutoSizer
+from autorobot.tests.helpers import build_cantilever
+
+
+CANDIDATES = [
+    'UB 203x133x25',
+    'UB 254x146x31',
+    'UB 305x165x40',
+    'UB 356x171x51',
+    'UB 406x178x60',
+    'UB 457x191x74',
+    'UB 533x210x92',
+]
+
+
+class TestAutoSizer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rb = ar.initialize(visible=False, interactive=False)
+        cls.rb.new(ar.RProjType.SHELL)
+        build_cantilever(cls.rb, 10)
+        ratios, _, _, _ = cls.rb.results.utilisation(points=3)
+        # The root bars need a heavier section, the tip bars a lighter one
+        cls.limit = ratios[..., 0].max() / 2
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.rb.quit(save=False)
+
+    def test_run(self):
+        sizer = AutoSizer(self.rb, CANDIDATES, points=3, limit=self.limit)
+        self.assertTrue(sizer.run())
+        self.assertEqual(sizer.failing, '')
+        self.assertEqual(sizer.history[-1]['changed'], 0)
+        self.assertGreater(sizer.history[0]['changed'], 0)
+        for record in sizer.history:
+            self.assertLessEqual(record['label_writes'], len(CANDIDATES))
+        # The sections decrease from the support to the tip
+        self.assertTrue(np.all(np.diff(sizer.index) <= 0))
+        self.assertNotEqual(sizer.sections[0], sizer.sections[-1])
+        table, names = self.rb.bars.label_table('all')
+        self.assertEqual(
+            list(np.array(names['section'])[table['section']]),
+            list(sizer.sections)
+        )
+        ratios, _, _, failing = self.rb.results.utilisation(
+            points=3, limit=self.limit)
+        self.assertEqual(failing, '')
+        # A second run starts from the sized bars and converges at once
+        again = AutoSizer(self.rb, CANDIDATES, points=3, limit=self.limit)
+        self.assertTrue(again.run())
+        self.assertEqual(len(again.history), 1)
+
+    def test_failing(self):
+        sizer = AutoSizer(self.rb, CANDIDATES[:2], bars='1to3', points=3,
+                          limit=self.limit / 100, max_iter=3)
+        sizer.run()
+        self.assertEqual(sizer.failing, '1to3')
+        self.assertTrue(np.all(sizer.sections == CANDIDATES[1]))
+
+    def test_missing(self):
+        with self.assertRaises(ar.errors.AutoRobotValueError):
+            AutoSizer(self.rb, ['UB 1x1x1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import numpy as np
+from numpy.random import randn
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from autorobot.envelopes import Envelope
+from autorobot.errors import AutoRobotValueError
+from autorobot.results import bar_force_ids
+
+
+class TestEnvelope(unittest.TestCase):
+
+    def setUp(self):
+        self.results = randn(8, 5, 3, 6)
+        self.cases = np.arange(1, 9) * 10
+
+    def test_update(self):
+        env = Envelope(bar_force_ids).update(self.results, self.cases)
+        assert_array_almost_equal(env.maxima, self.results.max(axis=0))
+        assert_array_almost_equal(env.minima, self.results.min(axis=0))
+        assert_array_equal(
+            env.max_cases, self.cases[self.results.argmax(axis=0)])
+        assert_array_equal(
+            env.min_cases, self.cases[self.results.argmin(axis=0)])
+
+    def test_incremental(self):
+        env = Envelope(bar_force_ids).update(self.results, self.cases)
+        chunked = Envelope(bar_force_ids)
+        for start in range(0, 8, 3):
+            chunked.update(self.results[start:start + 3],
+                           self.cases[start:start + 3])
+        for attr in ('maxima', 'minima', 'max_cases', 'min_cases',
+                     'max_concurrent', 'min_concurrent'):
+            with self.subTest(msg=attr):
+                assert_array_equal(getattr(chunked, attr), getattr(env, attr))
+
+    def test_concurrent(self):
+        env = Envelope(bar_force_ids).update(self.results, self.cases)
+        governing = self.results.argmax(axis=0)[..., 4]
+        expected = np.take_along_axis(
+            self.results[..., 0], governing[None], 0)[0]
+        assert_array_almost_equal(env.concurrent('MY', 'FX'), expected)
+        assert_array_almost_equal(env.concurrent(4, 0), expected)
+        assert_array_almost_equal(
+            env.concurrent('MY', 'MY', 'min'), env.minima[..., 4])
+        with self.assertRaises(AutoRobotValueError):
+            env.concurrent('N', 'FX')
+        with self.assertRaises(AutoRobotValueError):
+            Envelope(concurrent=False).update(
+                self.results, self.cases).concurrent(4, 0)
+
+    def test_nan(self):
+        self.results[:, 0, 0, 0] = np.nan
+        self.results[2, 1, 0, 0] = np.nan
+        env = Envelope().update(self.results, self.cases)
+        self.assertTrue(np.isnan(env.maxima[0, 0, 0]))
+        self.assertEqual(env.max_cases[0, 0, 0], 0)
+        self.assertFalse(np.isnan(env.maxima[1, 0, 0]))
+
+    def test_merge(self):
+        env = Envelope(bar_force_ids).update(self.results, self.cases)
+        first = Envelope(bar_force_ids).update(
+            self.results[:4], self.cases[:4])
+        second = Envelope(bar_force_ids).update(
+            self.results[4:], self.cases[4:])
+        merged = first.merge(second)
+        assert_array_equal(merged.maxima, env.maxima)
+        assert_array_equal(merged.min_cases, env.min_cases)
+        assert_array_equal(merged.max_concurrent, env.max_concurrent)
+        with self.assertRaises(AutoRobotValueError):
+            merged.merge(Envelope(concurrent=False).update(
+                self.results, self.cases))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,4 @@
 import unittest
-import time
 from numpy.random import random
 
 import autorobot as ar
@@ -10,7 +9,6 @@ class TestExtendedMaterialLabel(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.rb = ar.initialize(visible=False, interactive=False)
-        time.sleep(2)
         cls.rb.new(ar.RProjType.SHELL)
         cls.rb.materials.load('S275')
         cls.steel_s275 = cls.rb.materials.get('S275')
@@ -67,7 +65,6 @@ class TestMaterialServer(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.rb = ar.initialize(visible=False, interactive=False)
-        time.sleep(2)
         cls.rb.new(ar.RProjType.SHELL)
 
     @classmethod
@@ -98,6 +95,30 @@ class TestMaterialServer(unittest.TestCase):
             ar.RobotOM.IRobotLabelType.I_LT_MATERIAL, 'STEEL'))
         self.rb.materials.delete('STEEL')
 
+    def test_load_many(self):
+        self.rb.materials.load('S275')
+        loaded = self.rb.materials.load_many(['S235', 'S275', 'S235'])
+        self.assertListEqual(loaded, ['S235'])
+        self.assertTrue(self.rb.materials.exist('S235'))
+        self.assertListEqual(self.rb.materials.load_many(['S235']), [])
+        self.assertListEqual(self.rb.materials.load_many(['Unknown']), [])
+        self.assertFalse(self.rb.materials.exist('Unknown'))
+
+    def test_catalogue(self):
+        table = self.rb.materials.catalogue(['S235', 'S275'])
+        self.assertListEqual(list(table['name']), ['S235', 'S275'])
+        for row in table:
+            label = self.rb.materials.load(row['name'])
+            self.assertAlmostEqual(row['E'], label.E)
+            self.assertAlmostEqual(row['G'], label.G)
+            self.assertAlmostEqual(row['NU'], label.NU)
+            self.assertAlmostEqual(row['RO'], label.RO)
+            self.assertAlmostEqual(row['RE'], label.RE)
+        self.assertEqual(
+            len(self.rb.materials.catalogue()),
+            len(self.rb.materials.get_db_names())
+        )
+
     def test_set(self):
         self.rb.materials.load('STEEL')
         n1 = self.rb.nodes.create(*random((3,)))
@@ -1,5 +1,4 @@
 import unittest
-import time
 import numpy as np
 from numpy.random import random
 from numpy.testing import assert_array_equal, assert_array_almost_equal
@@ -12,7 +11,6 @@ class TestExtendedNode(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.rb = ar.initialize(visible=False, interactive=False)
-        time.sleep(2)
         cls.rb.new(ar.RProjType.SHELL)
 
     @classmethod
@@ -73,7 +71,6 @@ class TestNodeServer(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.rb = ar.initialize(visible=False, interactive=False)
-        time.sleep(2)
         cls.rb.new(ar.RProjType.SHELL)
 
     @classmethod
@@ -0,0 +1,66 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import numpy as np
+
+import autorobot as ar
+from autorobot.pipeline import Pipeline
+from autorobot.tests.helpers import build_cantilever
+
+
+def generate(count):
+    return {'count': count, 'x': np.linspace(0., 10., count + 1)}
+
+
+def load(rb, model):
+    build_cantilever(rb, model['count'], calculate=False)
+
+
+def extract(rb, model):
+    forces, _, _ = rb.results.bar_forces(points=3)
+    return forces
+
+
+def reduce(forces):
+    return np.nanmax(np.abs(forces[..., 4]))
+
+
+class TestPipeline(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rb = ar.initialize(visible=False, interactive=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.rb.quit(save=False)
+
+    def test_run(self):
+        with TemporaryDirectory() as tmp:
+            pipe = Pipeline(self.rb, load, extract, generate, reduce,
+                            directory=tmp)
+            results = pipe.run([{'count': n} for n in (2, 4, 8)])
+            self.assertEqual(len(results), 3)
+            # The root moment doesn't depend on the number of bars
+            self.assertAlmostEqual(results[0], results[2])
+            self.assertTrue((Path(tmp) / '2.rtd').exists())
+            self.rb.close()
+        for stage in ('generate', 'robot', 'reduce'):
+            self.assertEqual(pipe.stats[stage]['count'], 3)
+            self.assertGreaterEqual(pipe.stats[stage]['utilisation'], 0.)
+            self.assertLessEqual(pipe.stats[stage]['utilisation'], 1.)
+
+    def test_raw(self):
+        pipe = Pipeline(self.rb, load, extract, generate)
+        forces, = pipe.run([{'count': 3}])
+        self.assertEqual(forces.shape, (2, 3, 3, 6))
+        self.assertEqual(pipe.stats['reduce']['count'], 0)
+
+    def test_generate_error(self):
+        pipe = Pipeline(self.rb, load, extract, generate)
+        with self.assertRaises(TypeError):
+            pipe.run([{'count': 2}, {'bars': 2}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,4 @@
 import unittest
-import time
 from numpy.random import random
 
 import autorobot as ar
@@ -10,7 +9,6 @@ class TestExtendedRelease(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.rb = ar.initialize(visible=False, interactive=False)
-        time.sleep(2)
         cls.rb.new(ar.RProjType.SHELL)
 
     @classmethod
@@ -40,7 +38,6 @@ class TestExtendedReleaseServer(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.rb = ar.initialize(visible=False, interactive=False)
-        time.sleep(2)
         cls.rb.new(ar.RProjType.SHELL)
         n1 = cls.rb.nodes.create(*random((3,)))
         n2 = cls.rb.nodes.create(*random((3,)))
@@ -66,6 +63,27 @@ class TestExtendedReleaseServer(unittest.TestCase):
         self.assertTrue(int(label.end.RZ))
         self.rb.releases.delete('test_create')
 
+    def test_intern(self):
+        name = self.rb.releases.intern('000111', '000011', 'test_intern')
+        self.assertTrue(self.rb.releases.exist(name))
+        count = len(self.rb.releases.get_names())
+        self.assertEqual(
+            self.rb.releases.intern('000111', '000011', 'test_intern'), name)
+        self.assertEqual(len(self.rb.releases.get_names()), count)
+        self.assertNotEqual(
+            self.rb.releases.intern('000011', '000111', 'test_intern'), name)
+        self.rb.releases.create(name, '000001', '000001')
+        self.assertNotEqual(
+            self.rb.releases.intern('000111', '000011', 'test_intern'), name)
+        self.assertEqual(
+            self.rb.releases.intern('000001', '000001', 'test_intern'), name)
+        for n in self.rb.releases.get_names(lambda s: 'test_intern' in s):
+            self.rb.releases.delete(n)
+
+    def test_assign(self):
+        name = self.rb.releases.assign(self.b.Number, '000110', '000110')
+        self.assertEqual(self.b.release.Name, name)
+
     def test_set(self):
         self.rb.releases.create('test_set', '000011', '110000')
         self.rb.releases.set(self.b.Number, 'test_set')
@@ -0,0 +1,280 @@
+import logging
+import unittest
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import numpy as np
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+import autorobot as ar
+from autorobot.results import bar_force_ids, densify
+from autorobot.tests.helpers import build_cantilever
+
+logger = logging.getLogger(__name__)
+
+
+def bar_forces_loop(rb, bars, cases, points):
+    """Reads bar forces one value at a time (reference implementation)."""
+    forces = rb.structure.Results.Bars.Forces
+    positions = np.linspace(0., 1., points)
+    return np.array([[[
+        [getattr(forces.Value(b, c, x), k) for k in bar_force_ids]
+        for x in positions] for b in bars] for c in cases])
+
+
+class TestDensify(unittest.TestCase):
+
+    def test_densify(self):
+        keys = np.array([[2, 5], [1, 5], [2, 3]])
+        values = np.array([[1., 2.], [3., 4.], [5., 6.]])
+        array, (first, second) = densify(keys, values)
+        assert_array_equal(first, [1, 2])
+        assert_array_equal(second, [3, 5])
+        self.assertEqual(array.shape, (2, 2, 2))
+        assert_array_equal(array[1, 1], [1., 2.])
+        assert_array_equal(array[0, 1], [3., 4.])
+        self.assertTrue(np.all(np.isnan(array[0, 0])))
+
+
+class TestExtendedResultServer(unittest.TestCase):
+
+    count = 50
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rb = ar.initialize(visible=False, interactive=False)
+        cls.rb.new(ar.RProjType.SHELL)
+        build_cantilever(cls.rb, cls.count)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.rb.quit(save=False)
+
+    def test_bar_forces(self):
+        forces, cases, bars = self.rb.results.bar_forces(points=3)
+        self.assertEqual(forces.shape, (2, self.count, 3, 6))
+        assert_array_equal(cases, [1, 2])
+        assert_array_equal(bars, np.arange(1, self.count + 1))
+        # Bending moment at the fixed end under the tip load
+        self.assertAlmostEqual(abs(forces[1, 0, 0, 4]), 10e3 * 10.)
+
+    def test_bar_forces_selection(self):
+        forces, _, _ = self.rb.results.bar_forces(points=3)
+        sub, cases, bars = self.rb.results.bar_forces([2, 3, 5], '2')
+        assert_array_equal(cases, [2])
+        assert_array_equal(bars, [2, 3, 5])
+        assert_array_almost_equal(sub, forces[1:, [1, 2, 4]])
+
+    def test_bar_forces_against_loop(self):
+        bars, cases, points = np.arange(1, self.count + 1), [1, 2], 5
+        start = time.perf_counter()
+        forces, _, _ = self.rb.results.bar_forces(bars, cases, points)
+        bulk = time.perf_counter() - start
+        start = time.perf_counter()
+        expected = bar_forces_loop(self.rb, bars, cases, points)
+        loop = time.perf_counter() - start
+        assert_array_almost_equal(forces, expected)
+        logger.info("Bar forces: bulk %.3fs, loop %.3fs", bulk, loop)
+
+    def test_displacements(self):
+        disp, cases, nodes = self.rb.results.displacements()
+        self.assertEqual(disp.shape, (2, self.count + 1, 6))
+        assert_array_equal(cases, [1, 2])
+        assert_array_equal(nodes, np.arange(1, self.count + 2))
+        assert_array_almost_equal(disp[:, 0], 0.)
+        self.assertTrue(np.all(disp[:, -1, 2] < 0.))
+        sub, _, nodes = self.rb.results.displacements([1, 3], [2])
+        assert_array_equal(nodes, [1, 3])
+        assert_array_almost_equal(sub, disp[1:, [0, 2]])
+
+    def test_reactions(self):
+        reactions, cases, nodes = self.rb.results.reactions()
+        self.assertEqual(reactions.shape, (2, 1, 6))
+        assert_array_equal(nodes, [1])
+        assert_array_almost_equal(reactions[:, 0, 2], [20e3, 10e3])
+
+    def test_reaction_sums(self):
+        sums, cases = self.rb.results.reaction_sums()
+        assert_array_equal(cases, [1, 2])
+        assert_array_almost_equal(sums[:, 2], [20e3, 10e3])
+        # Moments about the origin (the support)
+        reactions, _, _ = self.rb.results.reactions()
+        assert_array_almost_equal(sums[:, 3:], reactions[:, 0, 3:])
+
+    def test_equilibrium(self):
+        residuals, cases = self.rb.results.equilibrium()
+        assert_array_equal(cases, [1, 2])
+        assert_array_almost_equal(residuals, 0., decimal=3)
+
+    def test_iter_results(self):
+        forces, _, _ = self.rb.results.bar_forces()
+        memory = 2 * 3 * self.rb.results.row_bytes * 7
+        chunks = list(self.rb.results.iter_results(
+            'bar_forces', memory=memory))
+        self.assertEqual(len(chunks), int(np.ceil(self.count / 7)))
+        self.assertTrue(all(len(bars) <= 7 for _, _, bars in chunks))
+        assert_array_almost_equal(
+            np.concatenate([c for c, _, _ in chunks], axis=1), forces)
+        self.assertEqual(sum(len(bars) for _, _, bars in chunks), self.count)
+        self.assertTrue(all(len(cases) == 2 for _, cases, _ in chunks))
+        disp, _, _ = self.rb.results.displacements()
+        chunks = list(self.rb.results.iter_results(
+            'displacements', by='cases', memory=1))
+        self.assertListEqual([list(c) for _, c, _ in chunks], [[1], [2]])
+        self.assertTrue(
+            all(len(nodes) == self.count + 1 for _, _, nodes in chunks))
+        assert_array_almost_equal(
+            np.concatenate([c for c, _, _ in chunks], axis=0), disp)
+
+    def test_reduce_results(self):
+        forces, _, _ = self.rb.results.bar_forces()
+        memory = 2 * 3 * self.rb.results.row_bytes * 7
+        for reduction, expected in (
+                ('max', forces.max(axis=0)),
+                ('min', forces.min(axis=0)),
+                ('absmax', np.abs(forces).max(axis=0))):
+            with self.subTest(msg=reduction):
+                reduced, bars = self.rb.results.reduce_results(
+                    'bar_forces', reduction, memory=memory)
+                assert_array_equal(bars, np.arange(1, self.count + 1))
+                assert_array_almost_equal(reduced, expected)
+        reduced, cases = self.rb.results.reduce_results(
+            'bar_forces', 'max', over='objects', memory=memory)
+        assert_array_equal(cases, [1, 2])
+        assert_array_almost_equal(reduced, forces.max(axis=1))
+
+    def test_envelope(self):
+        forces, cases, _ = self.rb.results.bar_forces()
+        env, bars = self.rb.results.envelope('bar_forces', memory=1)
+        assert_array_equal(bars, np.arange(1, self.count + 1))
+        assert_array_almost_equal(env.maxima, forces.max(axis=0))
+        assert_array_equal(env.min_cases, cases[forces.argmin(axis=0)])
+        governing = forces.argmax(axis=0)[..., 4]
+        assert_array_almost_equal(
+            env.concurrent('MY', 'FX'),
+            np.take_along_axis(forces[..., 0], governing[None], 0)[0]
+        )
+
+    def test_utilisation(self):
+        ratios, cases, bars, failing = self.rb.results.utilisation(points=3)
+        self.assertEqual(ratios.shape, (2, self.count, 3, 2))
+        props = self.rb.bars.property_table('1')[0]
+        forces, _, _ = self.rb.results.bar_forces(points=3)
+        my = abs(forces[1, 0, 0, 4])
+        self.assertAlmostEqual(
+            ratios[1, 0, 0, 0],
+            (abs(forces[1, 0, 0, 0]) / props['AX'] + my / props['WY']
+             + abs(forces[1, 0, 0, 5]) / props['WZ']) / props['fy']
+        )
+        self.assertEqual(failing, '')
+        _, _, _, failing = self.rb.results.utilisation(
+            points=3, limit=ratios[..., 0].max() / 2)
+        self.assertTrue(failing.startswith('1'))
+        _, _, _, same = self.rb.results.utilisation(
+            forces=(forces, cases, bars), limit=ratios[..., 0].max() / 2)
+        self.assertEqual(same, failing)
+
+    def test_calculate(self):
+        with self.assertWarns(RuntimeWarning):
+            calc = self.rb.calculate()
+        self.assertTrue(calc.done())
+        stats = calc.result()
+        self.assertEqual(stats['nodes'], self.count + 1)
+        self.assertEqual(stats['bars'], self.count)
+        self.assertEqual(stats['cases'], 2)
+        self.assertGreater(stats['elapsed'], 0.)
+        self.assertIs(self.rb.calc_history[-1], stats)
+        forces, _, _ = self.rb.results.bar_forces(points=3)
+        self.assertFalse(np.any(np.isnan(forces)))
+
+
+class TestResultCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rb = ar.initialize(visible=False, interactive=False)
+        cls.rb.new(ar.RProjType.SHELL)
+        build_cantilever(cls.rb, 10)
+        cls.tmp = TemporaryDirectory()
+        cls.rb.save_as(Path(cls.tmp.name) / 'cantilever.rtd')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.rb.quit(save=False)
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        self.rb.results.disk_cache.clear()
+
+    def test_path(self):
+        self.assertEqual(
+            self.rb.results.disk_cache.path,
+            Path(self.tmp.name) / 'cantilever.results'
+        )
+
+    def test_cached(self):
+        cache = self.rb.results.disk_cache
+        forces, cases, bars = self.rb.results.cached('bar_forces', 'all')
+        self.assertDictEqual(
+            cache.stats, {'hits': 0, 'misses': 1, 'stores': 1})
+        cached, cached_cases, cached_bars = self.rb.results.cached(
+            'bar_forces', 'all')
+        self.assertDictEqual(
+            cache.stats, {'hits': 1, 'misses': 1, 'stores': 1})
+        assert_array_equal(cached, forces)
+        assert_array_equal(cached_cases, cases)
+        assert_array_equal(cached_bars, bars)
+        self.rb.results.cached('bar_forces', 'all', points=5)
+        self.assertEqual(cache.stats['misses'], 2)
+
+    def test_fingerprint(self):
+        cache = self.rb.results.disk_cache
+        fingerprint = cache.fingerprint()
+        self.assertEqual(cache.fingerprint(), fingerprint)
+        case = self.rb.cases.get(2)
+        case.add_nodal_force(5, fx=1.)
+        self.assertNotEqual(cache.fingerprint(), fingerprint)
+        case.delete(case.Records.Count)
+        self.assertEqual(cache.fingerprint(), fingerprint)
+        self.rb.cases.create_combination(
+            3, 'comb', {1: 1.35, 2: 1.5}, 'ULS', 'PERM', 'COMB_LINEAR')
+        combined = cache.fingerprint()
+        self.assertNotEqual(combined, fingerprint)
+        self.rb.cases.set_combination_matrix([[1., 1.5]], [3], [1, 2])
+        self.assertNotEqual(cache.fingerprint(), combined)
+        self.rb.cases.delete('3')
+        self.assertEqual(cache.fingerprint(), fingerprint)
+        label = self.rb.materials.get('S355')
+        young = label.data.E
+        label.data.E = 2. * young
+        self.rb.materials.Store(label)
+        self.assertNotEqual(cache.fingerprint(), fingerprint)
+        label.data.E = young
+        self.rb.materials.Store(label)
+        self.assertEqual(cache.fingerprint(), fingerprint)
+
+    def test_stamp(self):
+        cache = self.rb.results.disk_cache
+        self.rb.calculate(wait=True).result()
+        stamp = cache.stamp
+        self.assertEqual(stamp, self.rb.calc_history[-1]['time'])
+        self.rb.results.cached('reactions')
+        self.rb.calculate(wait=True).result()
+        self.assertNotEqual(cache.stamp, stamp)
+        self.rb.results.cached('reactions')
+        self.assertDictEqual(
+            cache.stats, {'hits': 0, 'misses': 2, 'stores': 2})
+
+    def test_reopen(self):
+        path = self.rb.Project.FileName
+        self.rb.calculate(wait=True).result()
+        self.rb.save()
+        self.rb.results.cached('reactions')
+        self.rb.close()
+        self.rb.open(path)
+        self.rb.results.cached('reactions')
+        self.assertEqual(self.rb.results.disk_cache.stats['hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
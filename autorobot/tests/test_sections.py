@@ -1,5 +1,4 @@
 import unittest
-import time
 from random import sample
 import numpy as np
 from numpy.random import random
@@ -12,7 +11,6 @@ class TestExtendedSection(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.rb = ar.initialize(visible=False, interactive=False)
-        time.sleep(2)
         cls.rb.new(ar.RProjType.SHELL)
 
     @classmethod
@@ -46,7 +44,6 @@ class TestSectionServer(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.rb = ar.initialize(visible=False, interactive=False)
-        time.sleep(2)
         cls.rb.new(ar.RProjType.SHELL)
         n1 = cls.rb.nodes.create(*random((3,)))
         n2 = cls.rb.nodes.create(*random((3,)))
@@ -149,6 +146,74 @@ class TestSectionServer(unittest.TestCase):
                 b.GetLabel(ar.RobotOM.IRobotLabelType.I_LT_BAR_SECTION))
             self.assertEqual(label.Name, 'Rnd10')
 
+    def test_usage(self):
+        self.rb.sections.create('Rnd20', 20.)
+        self.rb.sections.create('Rnd30', 30.)
+        self.rb.sections.set(self.b.Number, 'Rnd20')
+        with self.subTest(msg='scan'):
+            self.assertIn(self.b.Number, self.rb.sections.users('Rnd20'))
+            self.assertEqual(len(self.rb.sections.users('Rnd30')), 0)
+        n1 = self.rb.nodes.create(*random((3,)))
+        n2 = self.rb.nodes.create(*random((3,)))
+        b = self.rb.bars.create(n1, n2)
+        with self.subTest(msg='set'):
+            self.rb.sections.set(f'{self.b.Number} {b.Number}', 'Rnd30')
+            self.assertEqual(len(self.rb.sections.users('Rnd20')), 0)
+            self.assertIn(self.b.Number, self.rb.sections.users('Rnd30'))
+            self.assertIn(b.Number, self.rb.sections.users('Rnd30'))
+        with self.subTest(msg='bar setter'):
+            b.section = 'Rnd20'
+            self.assertListEqual(
+                list(self.rb.sections.users('Rnd20')), [b.Number])
+        with self.subTest(msg='delete bar'):
+            self.rb.bars.delete(b.Number)
+            self.assertEqual(len(self.rb.sections.users('Rnd20')), 0)
+        with self.subTest(msg='delete node'):
+            b = self.rb.bars.create(n1, n2)
+            self.rb.sections.set(b.Number, 'Rnd30')
+            self.assertIn(b.Number, self.rb.sections.users('Rnd30'))
+            self.rb.nodes.delete(n1.Number)
+            self.assertNotIn(b.Number, self.rb.sections.users('Rnd30'))
+            self.assertIn(self.b.Number, self.rb.sections.users('Rnd30'))
+        with self.subTest(msg='unused'):
+            self.assertIn('Rnd20', self.rb.sections.unused())
+            self.assertNotIn('Rnd30', self.rb.sections.unused())
+
+    def test_prune(self):
+        self.rb.sections.create('Rnd40', 40.)
+        self.rb.sections.create('Rnd50', 50.)
+        self.rb.sections.set(self.b.Number, 'Rnd50')
+        pruned = self.rb.sections.prune(lambda s: s in ('Rnd40', 'Rnd50'))
+        self.assertListEqual(pruned, ['Rnd40'])
+        self.assertFalse(self.rb.sections.exist('Rnd40'))
+        self.assertTrue(self.rb.sections.exist('Rnd50'))
+
+    def test_section_properties(self):
+        label = self.rb.sections.load('UB 305x165x40')
+        table = self.rb.sections.properties(['UB 305x165x40', 'Unknown'])
+        self.assertListEqual(
+            list(table['name']), ['UB 305x165x40', 'Unknown'])
+        self.assertAlmostEqual(table['IY'][0], label.IY)
+        self.assertAlmostEqual(table['IZ'][0], label.IZ)
+        self.assertTrue(np.isnan(table['IY'][1]))
+        self.rb.sections.create('UB 305x165x40', 100.)
+        table = self.rb.sections.properties(['UB 305x165x40'])
+        self.assertAlmostEqual(
+            table['IY'][0], self.rb.sections.get('UB 305x165x40').IY)
+        self.rb.sections.delete('UB 305x165x40')
+
+    def test_catalogue(self):
+        names = ['UB 305x165x40', 'HP 12x63', 'Unknown']
+        table = self.rb.sections.catalogue(names)
+        self.assertListEqual(list(table['name']), names)
+        self.assertFalse(self.rb.sections.exist('UB 305x165x40'))
+        for row in table[:2]:
+            label = self.rb.sections.load(row['name'])
+            self.assertAlmostEqual(row['IY'], label.IY)
+            self.assertAlmostEqual(row['WEIGHT'], label.weight)
+            self.rb.sections.delete(row['name'])
+        self.assertTrue(np.isnan(table['AX'][2]))
+
     def test_db_list(self):
         with self.subTest(msg='no filter'):
             self.assertIn('AISC', self.rb.sections.db_list())
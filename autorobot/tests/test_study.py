@@ -0,0 +1,66 @@
+import time
+import unittest
+from tempfile import TemporaryDirectory
+import numpy as np
+
+from autorobot.app import _robot_processes
+from autorobot.study import Study
+from autorobot.tests.helpers import build_cantilever
+
+
+def build(rb, count, fail=False, hang=0.):
+    """Builds a cantilever (module level function for spawned workers)."""
+    if fail:
+        raise ValueError("Invalid parameters.")
+    time.sleep(hang)
+    rb.new('SHELL')
+    build_cantilever(rb, count, calculate=False)
+
+
+def extract(rb, count, fail=False, hang=0.):
+    """Extracts the forces of a cantilever."""
+    forces, cases, bars = rb.results.bar_forces(points=3)
+    return {'forces': forces, 'cases': cases, 'bars': bars,
+            'root': forces[:, 0, 0]}
+
+
+class TestStudy(unittest.TestCase):
+
+    def test_run(self):
+        with TemporaryDirectory() as tmp:
+            study = Study(build, extract, tmp, workers=2, retries=1)
+            params = [{'count': n} for n in (2, 4, 6)] + [
+                {'count': 1, 'fail': True}]
+            files = study.run(params)
+            self.assertEqual(files[3], None)
+            self.assertIn("Invalid parameters.", study.failures[3])
+            # The workers are kept when a task raises an exception
+            self.assertEqual(study.restarts, 0)
+            self.assertEqual(sorted(study.durations), [0, 1, 2])
+            for index, n in enumerate((2, 4, 6)):
+                results = study.load(index)
+                self.assertEqual(results['forces'].shape, (2, n, 3, 6))
+                np.testing.assert_array_equal(results['cases'], [1, 2])
+            # The root forces don't depend on the number of bars
+            env = study.envelope('root', concurrent=False)
+            self.assertEqual(env.maxima.shape, (6,))
+            np.testing.assert_array_almost_equal(
+                env.maxima, study.load(0)['root'].max(axis=0))
+            self.assertTrue(np.all(np.isin(env.max_cases, [1, 2, 3])))
+
+    def test_timeout(self):
+        running = _robot_processes()
+        with TemporaryDirectory() as tmp:
+            study = Study(build, extract, tmp, workers=1, timeout=30.,
+                          retries=0)
+            files = study.run([{'count': 2, 'hang': 600.}, {'count': 2}])
+            self.assertEqual(files[0], None)
+            self.assertEqual(study.failures[0], "Timeout.")
+            self.assertEqual(study.restarts, 1)
+            self.assertEqual(sorted(study.durations), [1])
+        # The Robot process of the replaced worker was killed
+        self.assertEqual(_robot_processes(), running)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import numpy as np
+from numpy.random import random
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+from scipy import sparse as sci_sparse
+
+import autorobot as ar
+from autorobot.superposition import align, envelope, superpose
+from autorobot.tests.helpers import build_cantilever
+
+
+class TestSuperpose(unittest.TestCase):
+
+    def setUp(self):
+        self.matrix = np.array([
+            [1.35, 1.5, 0., 0.],
+            [1., 0., 1.5, 0.],
+            [1., .7, .9, 0.],
+        ])
+        self.results = random((4, 5, 3, 6))
+
+    def test_superpose(self):
+        combined = superpose(self.matrix, self.results, block=2)
+        self.assertEqual(combined.shape, (3, 5, 3, 6))
+        assert_array_almost_equal(
+            combined, np.tensordot(self.matrix, self.results, axes=1))
+        assert_array_almost_equal(
+            superpose(sci_sparse.csr_matrix(self.matrix), self.results),
+            combined
+        )
+
+    def test_superpose_nan(self):
+        self.results[3] = np.nan
+        combined = superpose(self.matrix, self.results)
+        self.assertFalse(np.any(np.isnan(combined)))
+
+    def test_superpose_memmap(self):
+        with TemporaryDirectory() as tmp:
+            combined = superpose(
+                self.matrix, self.results, out=Path(tmp) / 'comb.dat')
+            self.assertIsInstance(combined, np.memmap)
+            assert_array_almost_equal(
+                combined, np.tensordot(self.matrix, self.results, axes=1))
+            del combined
+
+    def test_envelope(self):
+        combined = np.tensordot(self.matrix, self.results, axes=1)
+        maxima, minima, imax, imin = envelope(
+            self.matrix, self.results, block=2)
+        assert_array_almost_equal(maxima, combined.max(axis=0))
+        assert_array_almost_equal(minima, combined.min(axis=0))
+        assert_array_equal(imax, combined.argmax(axis=0))
+        assert_array_equal(imin, combined.argmin(axis=0))
+
+    def test_align(self):
+        aligned = align(self.matrix, [1, 2, 3, 4], [3, 2, 1])
+        assert_array_equal(aligned.toarray(), self.matrix[:, [2, 1, 0]])
+        with self.assertRaises(ar.errors.AutoRobotValueError):
+            align(self.matrix, [1, 2, 3, 4], [1, 2])
+
+
+class TestCombinationResults(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rb = ar.initialize(visible=False, interactive=False)
+        cls.rb.new(ar.RProjType.SHELL)
+        build_cantilever(cls.rb, 10, calculate=False)
+        cls.matrix = np.array([[1.35, 1.5], [1., 0.], [1., -.5]])
+        cls.combs = cls.rb.cases.create_combinations(
+            cls.matrix, [1, 2], 'ULS', 'PERM', 'COMB_LINEAR')
+        cls.rb.Project.CalcEngine.Calculate()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.rb.quit(save=False)
+
+    def test_combination_matrix(self):
+        matrix, combs, cases = self.rb.cases.combination_matrix()
+        assert_array_equal(combs, self.combs)
+        assert_array_equal(cases, [1, 2])
+        assert_array_almost_equal(matrix, self.matrix)
+
+    def test_superpose(self):
+        combined, combs, bars = self.rb.results.superpose('bar_forces')
+        self.assertEqual(len(combs), len(self.matrix))
+        assert_array_equal(combs, self.combs)
+        expected, _, _ = self.rb.results.bar_forces('all', self.combs)
+        assert_array_almost_equal(combined, expected, decimal=3)
+        combined, combs, _ = self.rb.results.superpose(
+            'bar_forces', combs=self.combs[1:])
+        assert_array_equal(combs, self.combs[1:])
+        assert_array_almost_equal(combined, expected[1:], decimal=3)
+
+    def test_combination_envelope(self):
+        maxima, minima, max_combs, min_combs, bars = (
+            self.rb.results.combination_envelope('displacements'))
+        expected, _, _ = self.rb.results.displacements('all', self.combs)
+        assert_array_almost_equal(maxima, expected.max(axis=0))
+        assert_array_almost_equal(minima, expected.min(axis=0))
+        uz = expected[..., 2]
+        assert_array_equal(
+            min_combs[1:, 2], np.asarray(self.combs)[uz.argmin(axis=0)[1:]])
+
+
+if __name__ == '__main__':
+    unittest.main()
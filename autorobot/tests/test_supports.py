@@ -1,5 +1,4 @@
 import unittest
-import time
 import numpy as np
 from numpy.random import random
 
@@ -11,7 +10,6 @@ class TestExtendedSupport(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.rb = ar.initialize(visible=False, interactive=False)
-        time.sleep(2)
         cls.rb.new(ar.RProjType.SHELL)
 
     @classmethod
@@ -54,7 +52,6 @@ class TestSupportServer(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.rb = ar.initialize(visible=False, interactive=False)
-        time.sleep(2)
         cls.rb.new(ar.RProjType.SHELL)
         cls.n1 = cls.rb.nodes.create(*random((3,)))
         cls.n2 = cls.rb.nodes.create(*random((3,)))
@@ -134,6 +131,111 @@ class TestSupportServer(unittest.TestCase):
             self.assertAlmostEqual(label.data.Gamma, gamma)
             self.rb.supports.delete('nodes')
 
+        with self.subTest(msg='arrays'):
+            label = self.rb.supports.create(
+                'arrays', '111111', node=self.n1.as_array(),
+                orient_node=self.n2.as_array())
+            self.assertAlmostEqual(label.data.Alpha, alpha)
+            self.assertAlmostEqual(label.data.Beta, beta)
+            self.rb.supports.delete('arrays')
+
+    def test_create_oriented_many(self):
+        n3 = self.rb.nodes.create(*random((3,)))
+        nodes = [self.n1.Number, self.n2.Number]
+        with self.subTest(msg='nodes'):
+            names = self.rb.supports.create_oriented_many(
+                nodes, [n3.Number, n3.Number], '111000')
+            self.assertEqual(len(names), 2)
+            for n, name in zip(nodes, names):
+                node = self.rb.nodes.get(n)
+                label = self.rb.supports.get(name)
+                v = n3.as_array() - node.as_array()
+                v_norm = v / np.linalg.norm(v)
+                self.assertAlmostEqual(
+                    label.data.Alpha, np.arctan2(v_norm[1], v_norm[0]))
+                self.assertAlmostEqual(
+                    label.data.Beta, np.arccos(v_norm[2]))
+                self.assertEqual(
+                    ar.RobotOM.IRobotLabel(node.GetLabel(
+                        ar.RobotOM.IRobotLabelType.I_LT_SUPPORT)).Name,
+                    name
+                )
+        with self.subTest(msg='shared labels'):
+            points = np.stack([self.n1.as_array(), self.n2.as_array()])
+            points[:, 2] += 1.
+            names = self.rb.supports.create_oriented_many(
+                nodes, points, '111000')
+            self.assertEqual(names[0], names[1])
+        with self.subTest(msg='mismatch'):
+            self.assertRaises(
+                ar.errors.AutoRobotValueError,
+                self.rb.supports.create_oriented_many,
+                nodes, [n3.Number], '111000'
+            )
+        self.rb.nodes.delete(n3.Number)
+
+    def test_intern(self):
+        with self.subTest(msg='miss'):
+            name = self.rb.supports.intern('111000', prefix='test_intern')
+            self.assertTrue(self.rb.supports.exist(name))
+            self.assertTrue(name.startswith('test_intern'))
+        with self.subTest(msg='hit'):
+            count = len(self.rb.supports.get_names())
+            other = self.rb.supports.intern('111000', prefix='test_intern')
+            self.assertEqual(name, other)
+            self.assertEqual(len(self.rb.supports.get_names()), count)
+        with self.subTest(msg='tolerance'):
+            self.assertEqual(
+                self.rb.supports.intern('111000', alpha=1e-9), name)
+            self.assertNotEqual(
+                self.rb.supports.intern('111000', alpha=1.), name)
+        with self.subTest(msg='created'):
+            self.rb.supports.create('test_intern_created', '000111')
+            self.assertEqual(
+                self.rb.supports.intern('000111'), 'test_intern_created')
+        with self.subTest(msg='stiffness tolerance'):
+            spring = self.rb.supports.intern(
+                '110000', elasticity=(0., 0., 1e6), prefix='test_intern')
+            self.assertEqual(self.rb.supports.intern(
+                '110000', elasticity=(0., 0., 1e6 + 1e-3),
+                prefix='test_intern'), spring)
+            self.assertNotEqual(self.rb.supports.intern(
+                '110000', elasticity=(0., 0., 1.01e6),
+                prefix='test_intern'), spring)
+        with self.subTest(msg='redefined'):
+            self.rb.supports.create('test_intern_created', '000011')
+            self.assertNotEqual(
+                self.rb.supports.intern('000111', prefix='test_intern'),
+                'test_intern_created')
+            self.assertEqual(
+                self.rb.supports.intern('000011'), 'test_intern_created')
+        with self.subTest(msg='deleted'):
+            self.rb.supports.delete(name)
+            other = self.rb.supports.intern('111000', prefix='test_intern')
+            self.assertTrue(self.rb.supports.exist(other))
+        for n in self.rb.supports.get_names(lambda s: 'test_intern' in s):
+            self.rb.supports.delete(n)
+
+    def test_assign(self):
+        name = self.rb.supports.assign(
+            ar.compile_selection([self.n1.Number, self.n2.Number]), '110110')
+        for n in self.rb.nodes.select('all'):
+            label = ar.RobotOM.IRobotLabel(
+                n.GetLabel(ar.RobotOM.IRobotLabelType.I_LT_SUPPORT))
+            self.assertEqual(label.Name, name)
+        self.assertEqual(self.rb.supports.assign('all', '110110'), name)
+
+    def test_set_groups(self):
+        a = self.rb.supports.intern('100000')
+        b = self.rb.supports.intern('010000')
+        self.rb.supports.set_groups(
+            [self.n1.Number, self.n2.Number], [a, b])
+        for n, name in zip((self.n1, self.n2), (a, b)):
+            label = ar.RobotOM.IRobotLabel(
+                self.rb.nodes.get(n.Number).GetLabel(
+                    ar.RobotOM.IRobotLabelType.I_LT_SUPPORT))
+            self.assertEqual(label.Name, name)
+
     def test_set(self):
         self.rb.supports.create('test_set', '111111')
         self.rb.supports.set('all', 'test_set')